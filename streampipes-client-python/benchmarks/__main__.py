@@ -0,0 +1,84 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Command line interface of the benchmark suite.
+
+Examples
+--------
+```
+python -m benchmarks --quick
+python -m benchmarks --save benchmarks/results
+python -m benchmarks --compare benchmarks/results/<baseline>.json --threshold 0.2
+```
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+
+from benchmarks import bench_data_lake, bench_functions, bench_resource_container  # noqa: F401
+from benchmarks.runner import (
+    compare_results,
+    load_results,
+    results_to_dict,
+    run_benchmarks,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--quick", action="store_true", help="run small sizes only once, e.g., as a smoke test")
+    parser.add_argument("--repeats", type=int, default=5, help="number of runs per benchmark and size")
+    parser.add_argument("--save", metavar="DIR", help="write the results as JSON report to this directory")
+    parser.add_argument("--compare", metavar="REPORT", help="compare the results against a previous JSON report")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="relative slowdown considered a regression (default: 0.2)"
+    )
+    args = parser.parse_args()
+
+    # keep the output readable, the client would log every created function handler otherwise
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run_benchmarks(name_filter=args.filter, quick=args.quick, repeats=args.repeats)
+
+    if args.save:
+        report = results_to_dict(results)
+        os.makedirs(args.save, exist_ok=True)
+        path = os.path.join(
+            args.save, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['commit'] or 'unknown'}.json"
+        )
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    if args.compare:
+        lines, regressions = compare_results(load_results(args.compare), results, args.threshold)
+        print(f"\nComparison against {args.compare}:")
+        print("\n".join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Benchmarks for parsing data lake query results and converting them to pandas.
+"""
+
+import json
+from typing import Any, Callable
+
+from benchmarks.runner import benchmark
+from streampipes.model.resource.query_result import QueryResult
+
+SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000,)
+
+
+def _query_response(size: int) -> str:
+    """Creates the canned JSON response of a data lake query with the given number of rows."""
+    headers = ["time", "density", "temperature", "pressure", "running", "sensor"]
+    rows = [
+        [1670000000000 + i, 10.0 + i % 7, 20.0 + i % 13, 1000 + i % 100, i % 2 == 0, f"sensor{i % 10}"]
+        for i in range(size)
+    ]
+    return json.dumps(
+        {
+            "total": size,
+            "headers": headers,
+            "spQueryStatus": "OK",
+            "allDataSeries": [{"total": size, "headers": headers, "rows": rows, "tags": None}],
+        }
+    )
+
+
+@benchmark("data_lake.parse_query_result", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def parse_query_result(size: int) -> Callable[[], Any]:
+    response = _query_response(size)
+    return lambda: QueryResult(**json.loads(response))
+
+
+@benchmark("data_lake.to_pandas", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def to_pandas(size: int) -> Callable[[], Any]:
+    query_result = QueryResult(**json.loads(_query_response(size)))
+    return query_result.to_pandas
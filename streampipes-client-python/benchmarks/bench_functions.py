@@ -0,0 +1,293 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Benchmarks for processing live data with StreamPipes Functions.
+
+The NATS client is replaced by an in-memory stand-in and the StreamPipes API by canned responses.
+Every benchmark checks that all events have been processed, so that it does not measure a failure.
+"""
+
+import asyncio
+import json
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+from benchmarks.runner import benchmark
+from streampipes.client import StreamPipesClient
+from streampipes.client.config import StreamPipesClientConfig
+from streampipes.client.credential_provider import StreamPipesApiKeyCredentials
+from streampipes.functions.broker import InMemoryPublisher, NatsConsumer
+from streampipes.functions.broker.in_memory.in_memory_hub import InMemoryHub
+from streampipes.functions.broker.output_collector import OutputCollector
+from streampipes.functions.function_handler import FunctionHandler
+from streampipes.functions.registration import Registration
+from streampipes.functions.streampipes_function import StreamPipesFunction
+from streampipes.functions.utils.data_stream_generator import (
+    RuntimeType,
+    SupportedBroker,
+    create_data_stream,
+)
+from streampipes.functions.utils.event_decoder import EventDecoder, EventFormat
+from streampipes.functions.utils.field_projection import FieldProjection
+from streampipes.functions.utils.function_context import FunctionContext
+from streampipes.model.resource import FunctionDefinition
+
+SIZES = (10_000, 100_000)
+QUICK_SIZES = (1_000,)
+
+INPUT_STREAM = create_data_stream(
+    "benchmark",
+    attributes={
+        "density": RuntimeType.FLOAT.value,
+        "temperature": RuntimeType.FLOAT.value,
+        "timestamp": RuntimeType.LONG.value,
+    },
+    stream_id="urn:streampipes.apache.org:eventstream:benchmark",
+)
+
+
+class Message:
+    """Stand-in for a message received from NATS."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+
+class MessageIterator:
+    """Stand-in for the message iterator of a NATS subscription."""
+
+    def __init__(self, messages: List[Message]) -> None:
+        self.messages = iter(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        try:
+            return next(self.messages)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class Subscription:
+    """Stand-in for a NATS subscription."""
+
+    pending_msgs = 0
+
+    def __init__(self, messages: List[Message]) -> None:
+        self.messages = MessageIterator(messages)
+
+
+class NatsClient:
+    """Stand-in for a NATS client that delivers the given messages and counts the published ones."""
+
+    def __init__(self, messages: List[Message]) -> None:
+        self.received = messages
+        self.published = 0
+
+    async def subscribe(self, subject: str, **kwargs: Any) -> Subscription:
+        return Subscription(self.received)
+
+    async def publish(self, subject: str, payload: bytes) -> None:
+        self.published += 1
+
+    async def flush(self, timeout: float) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class CountingFunction(StreamPipesFunction):
+    """Function that counts the received events and optionally forwards them to its output stream."""
+
+    def requiredStreamIds(self) -> List[str]:
+        return [INPUT_STREAM.element_id]
+
+    def onServiceStarted(self, context: FunctionContext) -> None:
+        self.count = 0
+
+    def onEvent(self, event: Dict[str, Any], streamId: str) -> None:
+        self.count += 1
+        for stream_id in self.output_collectors:
+            self.add_output(stream_id, {"density": event["density"]})
+
+    def onServiceStopped(self) -> None:
+        pass
+
+
+def _messages(size: int) -> List[Message]:
+    return [
+        Message(json.dumps({"density": 10.0 + i % 7, "temperature": 20.0, "timestamp": 1670000000000 + i}).encode())
+        for i in range(size)
+    ]
+
+
+def _patch_api_and_brokers(stack: ExitStack, messages: List[Message]) -> List[NatsClient]:
+    """Replaces the StreamPipes API by canned responses and the NATS server by in-memory stand-ins.
+
+    Returns the NATS clients created by the consumers and publishers.
+    """
+    patches: Dict[str, Dict[str, Any]] = {
+        "streampipes.client.client.StreamPipesClient._get_server_version": dict(return_value="0.x.y"),
+        "streampipes.endpoint.api.DataStreamEndpoint.get": dict(return_value=INPUT_STREAM),
+        "streampipes.endpoint.api.DataStreamEndpoint.post": {},
+        "streampipes.endpoint.api.FunctionEndpoint.register": {},
+        "streampipes.endpoint.api.FunctionEndpoint.deregister": {},
+    }
+    for target, kwargs in patches.items():
+        stack.enter_context(patch(target, **kwargs))
+
+    clients: List[NatsClient] = []
+
+    async def connect(*args: Any, **kwargs: Any) -> NatsClient:
+        clients.append(NatsClient(messages))
+        return clients[-1]
+
+    stack.enter_context(patch("streampipes.functions.broker.nats.nats_consumer.connect", connect))
+    stack.enter_context(patch("streampipes.functions.broker.nats.nats_publisher.connect", connect))
+    return clients
+
+
+def _client() -> StreamPipesClient:
+    return StreamPipesClient(
+        client_config=StreamPipesClientConfig(
+            credential_provider=StreamPipesApiKeyCredentials(username="benchmark", api_key="key"),
+            host_address="localhost",
+        )
+    )
+
+
+def _function_handler_run(size: int, with_output: bool) -> Callable[[], Any]:
+    messages = _messages(size)
+
+    def run() -> None:
+        with ExitStack() as stack:
+            clients = _patch_api_and_brokers(stack, messages)
+            function_definition = FunctionDefinition()
+            if with_output:
+                function_definition.add_output_data_stream(
+                    create_data_stream("output", attributes={"density": RuntimeType.FLOAT.value})
+                )
+            function = CountingFunction(function_definition)
+            FunctionHandler(Registration().register(function), _client()).initializeFunctions()
+            assert function.count == size, f"{function.count} of {size} events processed"
+            published = sum(client.published for client in clients)
+            expected = size if with_output else 0
+            assert published == expected, f"{published} of {expected} events published"
+
+    return run
+
+
+@benchmark("functions.decode_and_dispatch", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def decode_and_dispatch(size: int) -> Callable[[], Any]:
+    return _function_handler_run(size, with_output=False)
+
+
+@benchmark("functions.decode_dispatch_and_publish", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def decode_dispatch_and_publish(size: int) -> Callable[[], Any]:
+    return _function_handler_run(size, with_output=True)
+
+
+def _output_collector_run(size: int, broker: SupportedBroker) -> Callable[[], Any]:
+    events = [{"density": 10.0 + i % 7, "timestamp": 1670000000000 + i} for i in range(size)]
+    output_stream = create_data_stream("output", attributes={"density": RuntimeType.FLOAT.value}, broker=broker)
+
+    async def publish(hub: InMemoryHub, clients: List[NatsClient]) -> int:
+        topic = output_stream.event_grounding.transport_protocols[0].topic_definition.actual_topic_name
+        queue = hub.subscribe(topic)
+        output_collector = OutputCollector(output_stream)
+        for event in events:
+            output_collector.collect(event)
+        # wait until all scheduled publish tasks are done
+        while len(asyncio.all_tasks()) > 1:
+            await asyncio.sleep(0)
+        return queue.qsize() if broker == SupportedBroker.IN_MEMORY else sum(client.published for client in clients)
+
+    def run() -> None:
+        with ExitStack() as stack:
+            clients = _patch_api_and_brokers(stack, [])
+            hub = InMemoryHub()
+            stack.enter_context(patch.object(InMemoryPublisher, "hub", hub))
+            published = asyncio.run(publish(hub, clients))
+            assert published == size, f"{published} of {size} events published"
+
+    return run
+
+
+@benchmark("functions.output_collector_nats", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def output_collector_nats(size: int) -> Callable[[], Any]:
+    return _output_collector_run(size, SupportedBroker.NATS)
+
+
+@benchmark("functions.output_collector_in_memory", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def output_collector_in_memory(size: int) -> Callable[[], Any]:
+    return _output_collector_run(size, SupportedBroker.IN_MEMORY)
+
+
+def _decode_wide_events_run(size: int, projected: bool) -> Callable[[], Any]:
+    attributes = {f"property{i}": RuntimeType.FLOAT.value for i in range(120)}
+    attributes["timestamp"] = RuntimeType.LONG.value
+    wide_stream = create_data_stream("wide", attributes=attributes)
+    messages = [
+        Message(json.dumps({**{name: float(i) for name in attributes}, "timestamp": 1670000000000 + i}).encode())
+        for i in range(size)
+    ]
+    consumer = NatsConsumer()
+    if projected:
+        consumer.projection = FieldProjection(["timestamp", "property7", "property42"], wide_stream.event_schema)
+
+    def run() -> None:
+        for message in messages:
+            consumer.decode_message(message)
+
+    return run
+
+
+@benchmark("functions.decode_wide_events", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def decode_wide_events(size: int) -> Callable[[], Any]:
+    return _decode_wide_events_run(size, projected=False)
+
+
+@benchmark("functions.decode_wide_events_projected", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def decode_wide_events_projected(size: int) -> Callable[[], Any]:
+    return _decode_wide_events_run(size, projected=True)
+
+
+def _decode_typed_events_run(size: int, event_format: EventFormat) -> Callable[[], Any]:
+    events = [json.loads(message.data) for message in _messages(size)]
+    decoder = EventDecoder(INPUT_STREAM.event_schema, event_format)  # type: ignore[arg-type]
+
+    def run() -> None:
+        decode = decoder.decode
+        for event in events:
+            decode(event)
+
+    return run
+
+
+@benchmark("functions.decode_typed_records", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def decode_typed_records(size: int) -> Callable[[], Any]:
+    return _decode_typed_events_run(size, EventFormat.RECORD)
+
+
+@benchmark("functions.decode_typed_views", sizes=SIZES, quick_sizes=QUICK_SIZES)
+def decode_typed_views(size: int) -> Callable[[], Any]:
+    return _decode_typed_events_run(size, EventFormat.VIEW)
@@ -0,0 +1,43 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Benchmarks for parsing large responses of the `all()` method of the API endpoints.
+"""
+
+import json
+from typing import Any, Callable
+
+from benchmarks.runner import benchmark
+from streampipes.functions.utils.data_stream_generator import (
+    RuntimeType,
+    create_data_stream,
+)
+from streampipes.model.container import DataStreams
+
+
+@benchmark("resource_container.data_streams_from_json", sizes=(1_000, 10_000), quick_sizes=(100,))
+def data_streams_from_json(size: int) -> Callable[[], Any]:
+    data_stream = create_data_stream(
+        "benchmark",
+        attributes={
+            "density": RuntimeType.FLOAT.value,
+            "temperature": RuntimeType.FLOAT.value,
+            "sensor": RuntimeType.STRING.value,
+        },
+    ).to_dict()
+    response = json.dumps([{**data_stream, "elementId": f"{data_stream['elementId']}{i}"} for i in range(size)])
+    return lambda: DataStreams.from_json(response)
@@ -0,0 +1,279 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Registry, runner and result handling of the benchmark suite.
+"""
+
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "Benchmark",
+    "BenchmarkResult",
+    "benchmark",
+    "compare_results",
+    "run_benchmarks",
+    "BENCHMARKS",
+]
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark.
+
+    Parameters
+    ----------
+    name: str
+        Unique name of the benchmark.
+    setup: Callable[[int], Callable[[], Any]]
+        Prepares the benchmark for the given number of items and returns the callable to be measured.
+    sizes: Sequence[int]
+        Numbers of items the benchmark is run with.
+    quick_sizes: Sequence[int]
+        Numbers of items the benchmark is run with in quick mode.
+    """
+
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    sizes: Sequence[int]
+    quick_sizes: Sequence[int]
+
+
+@dataclass
+class BenchmarkResult:
+    """Result of a benchmark run for a number of items.
+
+    Parameters
+    ----------
+    name: str
+        Name of the benchmark.
+    size: int
+        Number of items processed per run.
+    best: float
+        Fastest run in seconds.
+    median: float
+        Median run in seconds.
+    repeats: int
+        Number of runs.
+    """
+
+    name: str
+    size: int
+    best: float
+    median: float
+    repeats: int
+
+    @property
+    def key(self) -> str:
+        """Identifier of the result to compare it across runs of the suite."""
+        return f"{self.name}[{self.size}]"
+
+    @property
+    def items_per_second(self) -> float:
+        """Throughput of the fastest run."""
+        return self.size / self.best if self.best > 0 else float("inf")
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(
+    name: str, sizes: Sequence[int], quick_sizes: Optional[Sequence[int]] = None
+) -> Callable[[Callable[[int], Callable[[], Any]]], Callable[[int], Callable[[], Any]]]:
+    """Registers a benchmark.
+
+    The decorated function gets the number of items, prepares everything that should not be measured
+    and returns the callable to be measured. The function is called again before every run.
+
+    Parameters
+    ----------
+    name: str
+        Unique name of the benchmark.
+    sizes: Sequence[int]
+        Numbers of items the benchmark is run with.
+    quick_sizes: Optional[Sequence[int]]
+        Numbers of items the benchmark is run with in quick mode, defaults to the smallest size.
+
+    Returns
+    -------
+    decorator: Callable
+        Decorator registering the benchmark.
+    """
+
+    def decorator(setup: Callable[[int], Callable[[], Any]]) -> Callable[[int], Callable[[], Any]]:
+        BENCHMARKS.append(Benchmark(name, setup, sizes, quick_sizes or sizes[:1]))
+        return setup
+
+    return decorator
+
+
+class _ErrorCollector(logging.Handler):
+    """Collects the errors logged by asyncio, e.g., exceptions of tasks that are not awaited."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.ERROR)
+        self.errors: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Stores the message of a logged error."""
+        self.errors.append(record.getMessage() if record.exc_info is None else self.format(record))
+
+
+def run_benchmarks(
+    name_filter: str = "", quick: bool = False, repeats: int = 5, log: Callable[[str], Any] = print
+) -> List[BenchmarkResult]:
+    """Runs the registered benchmarks.
+
+    Parameters
+    ----------
+    name_filter: str
+        Only benchmarks whose name contains this string are run.
+    quick: bool
+        Runs the benchmarks with the small quick sizes and only a single repeat.
+    repeats: int
+        Number of runs per benchmark and size.
+    log: Callable[[str], Any]
+        Function the progress is reported to.
+
+    Returns
+    -------
+    results: List[BenchmarkResult]
+        The results of all runs.
+
+    Raises
+    ------
+    RuntimeError
+        If a task of a benchmark failed in the background, so that the timings would measure the failure.
+    """
+    results = []
+    repeats = 1 if quick else repeats
+    for bench in BENCHMARKS:
+        if name_filter not in bench.name:
+            continue
+        for size in bench.quick_sizes if quick else bench.sizes:
+            timings = []
+            for _ in range(repeats):
+                run = bench.setup(size)
+                errors = _ErrorCollector()
+                logging.getLogger("asyncio").addHandler(errors)
+                gc.collect()
+                gc.disable()
+                try:
+                    start = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - start)
+                finally:
+                    gc.enable()
+                    # exceptions of unawaited tasks are only logged once the tasks are garbage collected
+                    gc.collect()
+                    logging.getLogger("asyncio").removeHandler(errors)
+                if errors.errors:
+                    raise RuntimeError(f"Benchmark {bench.name}[{size}] failed:\n" + "\n".join(errors.errors))
+            result = BenchmarkResult(bench.name, size, min(timings), statistics.median(timings), repeats)
+            log(f"{result.key:<55} {result.best * 1000:>11.2f} ms {result.items_per_second:>14,.0f} items/s")
+            results.append(result)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def results_to_dict(results: List[BenchmarkResult]) -> Dict[str, Any]:
+    """Converts results into a serializable report including information about the environment.
+
+    Parameters
+    ----------
+    results: List[BenchmarkResult]
+        The results of a run of the suite.
+
+    Returns
+    -------
+    report: Dict[str, Any]
+        The report of the run.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    """Loads the results of a report written by the suite.
+
+    Parameters
+    ----------
+    path: str
+        Path of the report.
+
+    Returns
+    -------
+    results: List[BenchmarkResult]
+        The results contained in the report.
+    """
+    with open(path) as f:
+        return [BenchmarkResult(**result) for result in json.load(f)["results"]]
+
+
+def compare_results(
+    baseline: List[BenchmarkResult], results: List[BenchmarkResult], threshold: float
+) -> Tuple[List[str], List[str]]:
+    """Compares results against a baseline.
+
+    Parameters
+    ----------
+    baseline: List[BenchmarkResult]
+        The results of the baseline.
+    results: List[BenchmarkResult]
+        The results to be compared.
+    threshold: float
+        Relative slowdown of the fastest run that is considered a regression, e.g. `0.2` for 20%.
+
+    Returns
+    -------
+    comparison: Tuple[List[str], List[str]]
+        A line per compared result and the keys of the results that regressed.
+    """
+    baseline_by_key = {result.key: result for result in baseline}
+    lines, regressions = [], []
+    for result in results:
+        reference = baseline_by_key.get(result.key)
+        if reference is None:
+            continue
+        change = result.best / reference.best - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(result.key)
+        lines.append(f"{result.key:<55} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+    return lines, regressions
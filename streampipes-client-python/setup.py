@@ -46,7 +46,17 @@ base_packages = [
     "typing-extensions~=4.5",
 ]
 
-dev_packages = base_packages + [
+# Optional requirements to consume and publish MQTT data streams.
+mqtt_packages = [
+    "paho-mqtt~=1.6",
+]
+
+# Optional requirements to replay Parquet files with the ReplayRunner.
+parquet_packages = [
+    "pyarrow>=10.0",
+]
+
+dev_packages = base_packages + mqtt_packages + parquet_packages + [
     "autoflake==2.2.0",
     "black==23.3.0",
     "blacken-docs==1.15.0",
@@ -99,7 +109,7 @@ setuptools.setup(
     python_requires=REQUIRES_PYTHON,
     url=URL,
     project_urls=PROJECT_URLS,
-    packages=setuptools.find_packages(exclude=("*tests*",)),
+    packages=setuptools.find_packages(exclude=("*tests*", "benchmarks*")),
     package_data={
         "streampipes": [
             "py.typed",
@@ -112,6 +122,8 @@ setuptools.setup(
         "dev": dev_packages,
         "test": dev_packages,
         "docs": docs_packages,
+        "mqtt": mqtt_packages,
+        "parquet": parquet_packages,
         "all": dev_packages + docs_packages,
     },
     license="Apache License 2.0",
@@ -33,6 +33,7 @@ from streampipes.endpoint import APIEndpoint
 from streampipes.endpoint.api import (
     DataLakeMeasureEndpoint,
     DataStreamEndpoint,
+    FunctionEndpoint,
     VersionEndpoint,
 )
 
@@ -63,6 +64,8 @@ class StreamPipesClient:
         Instance of the data lake measure endpoint
     dataStreamApi: DataStreamEndpoint
         Instance of the data stream endpoint
+    functionApi: FunctionEndpoint
+        Instance of the function endpoint
 
     Examples
     --------
@@ -130,6 +133,7 @@ class StreamPipesClient:
         # name of the endpoint needs to be consistent with the Java client
         self.dataLakeMeasureApi = DataLakeMeasureEndpoint(parent_client=self)
         self.dataStreamApi = DataStreamEndpoint(parent_client=self)
+        self.functionApi = FunctionEndpoint(parent_client=self)
         self.versionApi = VersionEndpoint(parent_client=self)
 
         self.server_version = self._get_server_version()
@@ -17,10 +17,12 @@
 
 from .data_lake_measure import DataLakeMeasureEndpoint
 from .data_stream import DataStreamEndpoint
+from .function import FunctionEndpoint
 from .version import VersionEndpoint
 
 __all__ = [
     "DataLakeMeasureEndpoint",
     "DataStreamEndpoint",
+    "FunctionEndpoint",
     "VersionEndpoint",
 ]
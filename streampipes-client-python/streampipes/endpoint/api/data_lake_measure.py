@@ -19,19 +19,26 @@
 Specific implementation of the StreamPipes API's data lake measure endpoints.
 This endpoint allows to consume data stored in StreamPipes' data lake.
 """
-from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Tuple, Type
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Literal, Optional, Set, Tuple, Type
 
+import pandas as pd
 from pydantic import BaseModel, Extra, Field, StrictInt, ValidationError, validator
 from streampipes.endpoint.endpoint import APIEndpoint
+from streampipes.model.common import EventSchema
 from streampipes.model.container import DataLakeMeasures
 from streampipes.model.container.resource_container import ResourceContainer
+from streampipes.model.resource.data_lake_measure import DataLakeMeasure
 from streampipes.model.resource.query_result import QueryResult
 
 __all__ = [
     "DataLakeMeasureEndpoint",
 ]
 
+logger = logging.getLogger(__name__)
+
 
 class StreamPipesQueryValidationError(Exception):
     """A custom exception to be raised when the validation of query parameter
@@ -272,10 +279,31 @@ class DataLakeMeasureEndpoint(APIEndpoint):
     2  2023-02-24T16:19:41.493Z  46.735321
     ```
 
+    The timestamps are parsed into `datetime64[ns, UTC]` and repeated string values (e.g., `sensorId`)
+    are stored as categoricals. By passing the event schema of the data lake measure,
+    all other columns are converted to the compact dtype of their runtime type (e.g., `float32`):
+    ```python
+    measure = client.dataLakeMeasureApi.get_measure("flow-rate")
+    flow_rate_pd = client.dataLakeMeasureApi.get(identifier="flow-rate").to_pandas(event_schema=measure.event_schema)
+    ```
+
     This is only a subset of the available query parameters,
     find them at [MeasurementGetQueryConfig][streampipes.endpoint.api.data_lake_measure.MeasurementGetQueryConfig].
+
+    To continuously receive the records that are newly added to a data lake measure,
+    `follow()` polls only for data that is younger than the last record seen:
+    ```python
+    for increment in client.dataLakeMeasureApi.follow(identifier="flow-rate"):
+        print(len(increment))
+    ```
     """
 
+    def __init__(self, parent_client: "StreamPipesClient"):  # type: ignore # noqa: F821
+        super().__init__(parent_client=parent_client)
+
+        # last seen timestamp, the keys of the records seen at this timestamp and their number per followed measure
+        self._follow_state: Dict[str, Tuple[pd.Timestamp, Set[Tuple[Any, ...]], int]] = {}
+
     @staticmethod
     def _validate_query_params(query_params: Dict[str, Any]) -> MeasurementGetQueryConfig:
         """Validates given query params.
@@ -331,6 +359,31 @@ class DataLakeMeasureEndpoint(APIEndpoint):
 
         return "api", "v4", "datalake", "measurements"
 
+    def get_measure(self, measure_name: str) -> DataLakeMeasure:
+        """Looks up the meta information of a data lake measure by its name, e.g. to obtain its event schema.
+
+        Parameters
+        ----------
+        measure_name: str
+            The name of the data lake measure.
+
+        Returns
+        -------
+        measure: DataLakeMeasure
+            The data lake measure with the given name.
+
+        Raises
+        ------
+        KeyError
+            If no data lake measure with the given name exists.
+        """
+        measures = self.all()
+        for position in range(len(measures)):
+            measure = measures[position]
+            if isinstance(measure, DataLakeMeasure) and measure.measure_name == measure_name:
+                return measure
+        raise KeyError(f'The data lake measure "{measure_name}" does not exist')
+
     def get(self, identifier: str, **kwargs: Optional[Dict[str, Any]]) -> QueryResult:
         """Queries the specified data lake measure from the API.
 
@@ -366,3 +419,138 @@ class DataLakeMeasureEndpoint(APIEndpoint):
 
         response = self._make_request(request_method=self._parent_client.request_session.get, url=url)
         return self._resource_cls(**response.json())
+
+    def follow(
+        self,
+        identifier: str,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 60.0,
+        event_schema: Optional[EventSchema] = None,
+        **kwargs: Optional[Dict[str, Any]],
+    ) -> Iterator[pd.DataFrame]:
+        """Continuously yields the records that are newly added to the specified data lake measure.
+
+        The endpoint remembers the last seen timestamp per measure and only queries younger data
+        by passing it as `start_date`. Records that share the last seen timestamp are skipped via `offset`,
+        so that more records with the same timestamp than `limit` are paged through as well.
+        Additionally, records at the last seen timestamp are deduplicated by their values (treating missing values
+        as equal), so every record is yielded exactly once, even when following the same measure repeatedly.
+        The poll interval adapts to the data rate: it is doubled (up to `max_poll_interval`)
+        whenever no new data is available and reset to `poll_interval` as soon as new data arrives.
+        If a query returns `limit` records, the next one is sent immediately.
+
+        Parameters
+        ----------
+        identifier: str
+            The identifier of the data lake measure to be followed.
+        poll_interval: float
+            Minimal time in seconds between two queries.
+        max_poll_interval: float
+            Maximal time in seconds between two queries.
+        event_schema: Optional[EventSchema]
+            Event schema of the data lake measure that is used to assign compact dtypes
+            (see [QueryResult][streampipes.model.resource.query_result.QueryResult.to_pandas]).
+        **kwargs: Dict[str, Any]
+            Additional query parameters as defined by the
+            [MeasurementGetQueryConfig][streampipes.endpoint.api.data_lake_measure.MeasurementGetQueryConfig].
+            `start_date` is only used if the measure has not been followed before,
+            otherwise only records that are younger than the current time are returned initially.
+
+        Yields
+        ------
+        increment: pd.DataFrame
+            Pandas df containing the records added since the previous increment
+
+        Examples
+        --------
+        see directly at [DataLakeMeasureEndpoint][streampipes.endpoint.api.data_lake_measure.DataLakeMeasureEndpoint].
+        """
+
+        start_date: Optional[datetime] = kwargs.pop("start_date", None)  # type: ignore
+        kwargs.pop("order", None)
+        kwargs.pop("offset", None)
+        limit = kwargs.get("limit") or MeasurementGetQueryConfig.__fields__["limit"].default
+
+        if identifier not in self._follow_state:
+            if start_date is None:
+                start_date = datetime.now(tz=timezone.utc)
+            # naive datetime objects are interpreted as local time (consistent with `get()`)
+            self._follow_state[identifier] = (pd.Timestamp(start_date.astimezone(timezone.utc)), set(), 0)
+
+        current_interval = poll_interval
+        while True:
+            last_timestamp, seen_records, num_seen = self._follow_state[identifier]
+
+            # the records at the last seen timestamp are the first ones of the result
+            if num_seen > 0:
+                kwargs["offset"] = num_seen  # type: ignore
+            query_result = self.get(
+                identifier=identifier,
+                start_date=last_timestamp.to_pydatetime(),  # type: ignore
+                order="ASC",  # type: ignore
+                **kwargs,
+            )
+            df = query_result.to_pandas(event_schema=event_schema) if query_result.all_data_series else None
+
+            if df is not None and len(df) > 0:
+                num_records = len(df)
+
+                # filter records that have already been returned with a previous increment,
+                # e.g. if records were added at the last seen timestamp in the meantime
+                records = self._record_keys(df)
+                timestamps = list(df["timestamp"])
+                is_new = [
+                    timestamp > last_timestamp or record not in seen_records
+                    for timestamp, record in zip(timestamps, records)
+                ]
+
+                # the cursor advances over all returned records, so that the next query continues behind them
+                newest_timestamp = max(timestamps)
+                newest_records = {
+                    record for timestamp, record in zip(timestamps, records) if timestamp == newest_timestamp
+                }
+                if newest_timestamp == last_timestamp:
+                    self._follow_state[identifier] = (
+                        last_timestamp,
+                        seen_records | newest_records,
+                        num_seen + num_records,
+                    )
+                else:
+                    num_newest = sum(timestamp == newest_timestamp for timestamp in timestamps)
+                    self._follow_state[identifier] = (newest_timestamp, newest_records, num_newest)
+
+                df = df[is_new].reset_index(drop=True)
+                if len(df) > 0:
+                    logger.debug(f"Received {len(df)} new records for data lake measure {identifier}.")
+                    current_interval = poll_interval
+                    yield df
+                else:
+                    current_interval = min(2 * current_interval, max_poll_interval)
+
+                # more data might be available if the query result was cut at the limit
+                if num_records >= limit:  # type: ignore
+                    continue
+            else:
+                current_interval = min(2 * current_interval, max_poll_interval)
+
+            time.sleep(current_interval)
+
+    @staticmethod
+    def _record_keys(df: pd.DataFrame) -> List[Tuple[Any, ...]]:
+        """Helper function to build hashable keys of the records of a data frame.
+
+        Missing values are represented as `None`, so that records with missing values compare equal
+        (`NaN` is never equal to itself).
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            The records to build the keys for.
+
+        Returns
+        -------
+        keys: List[Tuple[Any, ...]]
+            The key of every record in the order of the data frame.
+        """
+        values = df.astype(object).where(df.notna(), None)
+        return list(values.itertuples(index=False, name=None))
@@ -0,0 +1,192 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Specific implementation of the StreamPipes API's function endpoints.
+"""
+
+__all__ = [
+    "FunctionEndpoint",
+]
+
+import json
+from typing import Any, Dict, List, Tuple, Type
+
+from streampipes.endpoint.endpoint import APIEndpoint
+from streampipes.model.container import FunctionDefinitions
+from streampipes.model.container.resource_container import ResourceContainer
+from streampipes.model.resource.function_definition import FunctionDefinition
+from streampipes.model.resource.resource import Resource
+
+
+class FunctionEndpoint(APIEndpoint):
+    """Implementation of the Functions endpoint.
+
+    This endpoint allows to register StreamPipes Functions at the StreamPipes backend (see `register()` method),
+    so that they are listed next to the functions of the Java extensions services.
+    Furthermore, it allows to query the active functions (see `all()` method)
+    and the metrics and logs the backend has collected for them.
+
+    Parameters
+    ----------
+    parent_client: StreamPipesClient
+        The instance of [StreamPipesClient][streampipes.client.StreamPipesClient] the endpoint is attached to.
+
+    Examples
+    --------
+
+    ```python
+    from streampipes.client import StreamPipesClient
+    from streampipes.client.config import StreamPipesClientConfig
+    from streampipes.client.credential_provider import StreamPipesApiKeyCredentials
+
+    client_config = StreamPipesClientConfig(
+        credential_provider=StreamPipesApiKeyCredentials(username="test-user", api_key="api-key"),
+        host_address="localhost",
+        port=8082,
+        https_disabled=True
+    )
+    client = StreamPipesClient.create(client_config=client_config)
+    ```
+
+    ```python
+    # let's get all active functions in StreamPipes
+    functions = client.functionApi.all()
+    len(functions)
+    ```
+    ```
+    1
+    ```
+    """
+
+    @property
+    def _container_cls(self) -> Type[ResourceContainer]:
+        """Defines the model container class the endpoint refers to.
+
+        Returns
+        -------
+        [FunctionDefinitions][streampipes.model.container.FunctionDefinitions]
+        """
+        return FunctionDefinitions
+
+    @property
+    def _relative_api_path(self) -> Tuple[str, ...]:
+        """Defines the relative api path to the Functions endpoint.
+
+        Each path within the URL is defined as an own string.
+
+        Returns
+        -------
+        api_path: Tuple[str, ...]
+            a tuple of strings of which every represents a path value of the endpoint's API URL.
+        """
+        return "api", "v2", "functions"
+
+    def post(self, resource: Resource) -> None:
+        """Registers a single function at the StreamPipes backend.
+
+        Parameters
+        ----------
+        resource: FunctionDefinition
+            The definition of the function to be registered.
+
+        Returns
+        -------
+        None
+        """
+        self.register([resource])  # type: ignore
+
+    def register(self, functions: List[FunctionDefinition]) -> None:
+        """Registers functions at the StreamPipes backend.
+
+        Only the metadata known by the backend is sent, i.e. the function id and the consumed data streams.
+
+        Parameters
+        ----------
+        functions: List[FunctionDefinition]
+            The definitions of the functions to be registered.
+
+        Returns
+        -------
+        None
+        """
+        self._make_request(
+            request_method=self._parent_client.request_session.post,
+            url=self.build_url(),
+            data=json.dumps(
+                [
+                    function_definition.dict(by_alias=True, include={"function_id", "consumed_streams"})
+                    for function_definition in functions
+                ]
+            ),
+            headers={"Content-type": "application/json"},
+        )
+
+    def deregister(self, function_id: str) -> None:
+        """Deregisters a function from the StreamPipes backend.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function to be deregistered.
+
+        Returns
+        -------
+        None
+        """
+        self._make_request(
+            request_method=self._parent_client.request_session.delete, url=f"{self.build_url()}/{function_id}"
+        )
+
+    def get_metrics(self, function_id: str) -> Dict[str, Any]:
+        """Queries the metrics the StreamPipes backend has collected for a function.
+
+        The backend only collects the metrics of functions running in the extensions services
+        registered in its service discovery, so the metrics of Python functions are not included.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function.
+
+        Returns
+        -------
+        metrics: Dict[str, Any]
+            The metrics of the function, i.e. the counters of the incoming messages per data stream
+            (`messagesIn`) and of the outgoing messages (`messagesOut`).
+        """
+        response = self._make_request(
+            request_method=self._parent_client.request_session.get, url=f"{self.build_url()}/{function_id}/metrics"
+        )
+        return response.json()
+
+    def get_logs(self, function_id: str) -> List[Dict[str, Any]]:
+        """Queries the logs the StreamPipes backend has collected for a function.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function.
+
+        Returns
+        -------
+        logs: List[Dict[str, Any]]
+            The log entries of the function.
+        """
+        response = self._make_request(
+            request_method=self._parent_client.request_session.get, url=f"{self.build_url()}/{function_id}/logs"
+        )
+        return response.json()
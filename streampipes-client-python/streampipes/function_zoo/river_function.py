@@ -21,6 +21,7 @@ from streampipes.functions.broker.broker_handler import get_broker_description
 from streampipes.functions.function_handler import FunctionHandler
 from streampipes.functions.registration import Registration
 from streampipes.functions.streampipes_function import StreamPipesFunction
+from streampipes.functions.utils.backfill import BackfillConfig
 from streampipes.functions.utils.data_stream_generator import (
     RuntimeType,
     create_data_stream,
@@ -167,6 +168,9 @@ class OnlineML:
         A function to be called when this StreamPipesFunction receives an event.
     on_stop: Callable[[Any], None]
         A function to be called when this StreamPipesFunction gets stopped.
+    backfill: Optional[Dict[str, BackfillConfig]]
+        Historic data of the data lake per stream id that is used to train the model
+        before switching over to the live data.
     """
 
     def __init__(
@@ -180,6 +184,7 @@ class OnlineML:
         on_start: Callable[[Any, FunctionContext], None] = lambda self, context: None,
         on_event: Callable[[Any, Dict[str, Any], str], None] = lambda self, event, streamId: None,
         on_stop: Callable[[Any], None] = lambda self: None,
+        backfill: Optional[Dict[str, BackfillConfig]] = None,
     ):
         self.client = client
 
@@ -198,6 +203,8 @@ class OnlineML:
         self.sp_function = RiverFunction(
             function_definition, stream_ids, model, supervised, target_label, on_start, on_event, on_stop
         )
+        for stream_id, config in (backfill or {}).items():
+            self.sp_function.add_backfill(stream_id, config)
 
     def start(self):
         """Registers the function and starts the training."""
@@ -20,6 +20,8 @@ from .publisher import Publisher
 
 # isort: split
 
+from .in_memory.in_memory_consumer import InMemoryConsumer
+from .in_memory.in_memory_publisher import InMemoryPublisher
 from .kafka.kafka_consumer import KafkaConsumer
 from .kafka.kafka_publisher import KafkaPublisher
 from .nats.nats_consumer import NatsConsumer
@@ -33,6 +35,8 @@ __all__ = [
     "Publisher",
     "SupportedBroker",
     "get_broker",
+    "InMemoryConsumer",
+    "InMemoryPublisher",
     "KafkaConsumer",
     "KafkaPublisher",
     "NatsConsumer",
@@ -47,6 +47,8 @@ class Broker(ABC):
             hostname = os.environ["BROKER-HOST"]
             if "Kafka" in transport_protocol.class_name and "KAFKA-PORT" in os.environ.keys():
                 port = int(os.environ["KAFKA-PORT"])
+            elif "Mqtt" in transport_protocol.class_name and "MQTT-PORT" in os.environ.keys():
+                port = int(os.environ["MQTT-PORT"])
         await self._make_connection(hostname, port)
 
     @abstractmethod
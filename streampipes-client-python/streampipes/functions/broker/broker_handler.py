@@ -18,6 +18,8 @@ from enum import Enum
 
 from streampipes.functions.broker import (
     Broker,
+    InMemoryConsumer,
+    InMemoryPublisher,
     KafkaConsumer,
     KafkaPublisher,
     NatsConsumer,
@@ -31,6 +33,8 @@ class SupportedBroker(Enum):
 
     NATS = "NatsTransportProtocol"
     KAFKA = "KafkaTransportProtocol"
+    MQTT = "MqttTransportProtocol"
+    IN_MEMORY = "InMemoryTransportProtocol"
 
 
 # TODO Exception should be removed once all brokers are implemented.
@@ -60,6 +64,8 @@ def get_broker(
     ------
     UnsupportedBrokerError
         Is raised when the given data stream belongs to a broker that is currently not supported by StreamPipes Python.
+    ImportError
+        Is raised for MQTT data streams if the optional `paho-mqtt` package is not installed.
     """
     broker_name = data_stream.event_grounding.transport_protocols[0].class_name
     if SupportedBroker.NATS.value in broker_name:
@@ -70,6 +76,21 @@ def get_broker(
         if is_publisher:
             return KafkaPublisher()
         return KafkaConsumer()
+    elif SupportedBroker.MQTT.value in broker_name:
+        try:
+            from streampipes.functions.broker.mqtt.mqtt_consumer import MqttConsumer
+            from streampipes.functions.broker.mqtt.mqtt_publisher import MqttPublisher
+        except ImportError as err:
+            raise ImportError(
+                "MQTT data streams require the package paho-mqtt (`pip install streampipes[mqtt]`)"
+            ) from err
+        if is_publisher:
+            return MqttPublisher()
+        return MqttConsumer()
+    elif SupportedBroker.IN_MEMORY.value in broker_name:
+        if is_publisher:
+            return InMemoryPublisher()
+        return InMemoryConsumer()
     else:
         raise UnsupportedBrokerError(broker_name)
 
@@ -14,10 +14,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import json
 from abc import abstractmethod
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Dict, Optional
 
 from streampipes.functions.broker import Broker
+from streampipes.functions.utils.field_projection import FieldProjection
 from streampipes.model.resource.data_stream import DataStream
 
 
@@ -25,8 +27,19 @@ class Consumer(Broker):
     """Abstract implementation a consumer for a broker.
 
     A consumer allows to subscribe to a data stream.
+
+    Attributes
+    ----------
+    projection: Optional[FieldProjection]
+        The properties of the events to be decoded, all properties are decoded if not set.
+    consumer_group: Optional[str]
+        Name of the group whose members share the messages of the data stream,
+        e.g. to scale a function out over several processes. Every consumer receives all messages if not set.
     """
 
+    projection: Optional[FieldProjection] = None
+    consumer_group: Optional[str] = None
+
     async def connect(self, data_stream: DataStream) -> None:
         """Connects to the broker running in StreamPipes and creates a subscription.
 
@@ -63,3 +76,58 @@ class Consumer(Broker):
             An async iterator for the messages.
         """
         raise NotImplementedError  # pragma: no cover
+
+    def decode_message(self, message: Any) -> Dict[str, Any]:
+        """Decodes a received message into an event.
+
+        Parameters
+        ----------
+        message: Any
+            A message returned by the iterator of `get_message()`.
+
+        Returns
+        -------
+        event: Dict[str, Any]
+            The event contained in the message.
+        """
+        if self.projection is not None:
+            return self.projection.decode(message.data.decode())
+        return json.loads(message.data.decode())
+
+    def acknowledge(self, message: Any) -> bool:
+        """Marks a message as completely processed, i.e. by all functions including their outputs.
+
+        Parameters
+        ----------
+        message: Any
+            A message returned by the iterator of `get_message()`.
+
+        Returns
+        -------
+        commit_due: bool
+            Whether the processed messages should be committed now via `commit()`.
+        """
+        return False
+
+    async def commit(self, asynchronous: bool = True) -> None:
+        """Commits the progress of the acknowledged messages to the broker, so that they are not received again.
+
+        Parameters
+        ----------
+        asynchronous: bool
+            Whether to wait for the broker to confirm the commit.
+
+        Returns
+        -------
+        None
+        """
+
+    def get_pending_messages(self) -> Optional[int]:
+        """Get the number of messages of the data stream that have not been received yet.
+
+        Returns
+        -------
+        pending_messages: Optional[int]
+            The number of pending messages or `None` if the broker does not provide it.
+        """
+        return None
@@ -0,0 +1,140 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+from streampipes.functions.broker import Consumer
+from streampipes.functions.broker.in_memory.in_memory_hub import InMemoryHub
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryMessageIterator:
+    """Iterates over the events of an in-memory subscription.
+
+    Parameters
+    ----------
+    queue: asyncio.Queue
+        The queue of the subscription.
+    """
+
+    def __init__(self, queue: asyncio.Queue) -> None:
+        self.queue = queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class InMemoryConsumer(Consumer):
+    """Implementation of an in-process consumer.
+
+    It receives the events of publishers running in the same process without any serialization.
+
+    Attributes
+    ----------
+    hub: Optional[InMemoryHub]
+        The hub shared with the publishers, which has to be set before the consumer connects.
+    """
+
+    hub: Optional[InMemoryHub] = None
+
+    async def _make_connection(self, hostname: str, port: int) -> None:
+        """Helper function to connect to a server.
+
+        There is no server involved for in-process communication.
+
+        Parameters
+        ----------
+
+        hostname: str
+            The hostname of the server, which the broker connects to.
+
+        port: int
+            The port number of the connection.
+
+        Returns
+        -------
+        None
+        """
+        logger.info("Connecting to the in-memory broker")
+
+    async def _create_subscription(self) -> None:
+        """Creates a subscription to a data stream.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        RuntimeError
+            If no hub is set.
+        """
+        if self.hub is None:
+            raise RuntimeError(f"No in-memory hub is set for the stream {self.stream_id}")
+        self.queue = self.hub.subscribe(self.topic_name)
+        logger.info(f"Subscribed to stream: {self.stream_id}")
+
+    async def disconnect(self) -> None:
+        """Closes the connection to the server.
+
+        Returns
+        -------
+        None
+        """
+        # the queue only exists once the subscription has been created
+        queue = getattr(self, "queue", None)
+        if self.hub is not None and queue is not None:
+            self.hub.unsubscribe(self.topic_name, queue)
+        logger.info(f"Stopped connection to stream: {self.stream_id}")
+
+    def get_message(self) -> AsyncIterator:
+        """Get the published messages of the subscription.
+
+        Returns
+        -------
+        iterator: AsyncIterator
+            An async iterator for the messages.
+        """
+        return InMemoryMessageIterator(self.queue)
+
+    def decode_message(self, message: Any) -> Dict[str, Any]:
+        """Returns the event of a received message.
+
+        Messages already are events, so only a shallow copy or projection is created,
+        which allows every function to modify its event.
+
+        Parameters
+        ----------
+        message: Any
+            The received message.
+
+        Returns
+        -------
+        event: Dict[str, Any]
+            The event contained in the message.
+        """
+        if self.projection is not None:
+            return self.projection.project(message)
+        return dict(message)
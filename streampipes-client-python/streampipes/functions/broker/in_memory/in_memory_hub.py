@@ -0,0 +1,149 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+from typing import Any, Dict, List, Optional
+
+__all__ = [
+    "InMemoryHub",
+]
+
+
+class InMemoryHub:
+    """Routes events between in-process publishers and consumers.
+
+    Every subscription of a topic has its own queue, which receives all events published to this topic.
+    Events are passed as Python objects, so no serialization is involved.
+    Events published to a topic without subscriptions are discarded.
+    Publishers and consumers only exchange events if they share the same hub,
+    which is usually provided by the function handler.
+
+    Parameters
+    ----------
+    max_queue_size: int
+        Maximal number of pending events per subscription, `0` means unbounded.
+        Publishers wait for free space if the queue of a subscription is full.
+    """
+
+    def __init__(self, max_queue_size: int = 0) -> None:
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[str, List[asyncio.Queue]] = {}
+
+    def subscribe(self, topic: str) -> asyncio.Queue:
+        """Creates a new subscription for a topic.
+
+        Parameters
+        ----------
+        topic: str
+            The topic to subscribe to.
+
+        Returns
+        -------
+        queue: asyncio.Queue
+            The queue receiving the events of the topic. `None` marks the end of the subscription.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscriptions.setdefault(topic, []).append(queue)
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue) -> None:
+        """Removes a subscription and ends the consumption of its queue.
+
+        Parameters
+        ----------
+        topic: str
+            The subscribed topic.
+        queue: asyncio.Queue
+            The queue of the subscription.
+
+        Returns
+        -------
+        None
+        """
+        queues = self._subscriptions.get(topic, [])
+        if queue in queues:
+            queues.remove(queue)
+            self._end(queue)
+        if not queues:
+            self._subscriptions.pop(topic, None)
+
+    def has_subscriptions(self, topic: str) -> bool:
+        """Checks whether a topic has subscriptions.
+
+        Parameters
+        ----------
+        topic: str
+            The topic to check.
+
+        Returns
+        -------
+        has_subscriptions: bool
+            `True` if at least one subscription exists for the topic.
+        """
+        return bool(self._subscriptions.get(topic))
+
+    async def publish(self, topic: str, event: Dict[str, Any]) -> None:
+        """Publishes an event to all subscriptions of a topic.
+
+        Parameters
+        ----------
+        topic: str
+            The topic to publish to.
+        event: Dict[str, Any]
+            The event to publish.
+
+        Returns
+        -------
+        None
+        """
+        for queue in self._subscriptions.get(topic, []):
+            await queue.put(event)
+
+    def close(self, topic: Optional[str] = None) -> None:
+        """Ends all subscriptions of a topic or of all topics if no topic is given.
+
+        Parameters
+        ----------
+        topic: Optional[str]
+            The topic to close.
+
+        Returns
+        -------
+        None
+        """
+        topics = [topic] if topic is not None else list(self._subscriptions.keys())
+        for t in topics:
+            for queue in self._subscriptions.pop(t, []):
+                self._end(queue)
+
+    @staticmethod
+    def _end(queue: asyncio.Queue) -> None:
+        """Marks the end of a subscription queue, even if the queue is full.
+
+        Parameters
+        ----------
+        queue: asyncio.Queue
+            The queue of the subscription.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            queue.put_nowait(None)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(None)
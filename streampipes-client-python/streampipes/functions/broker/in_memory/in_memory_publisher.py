@@ -0,0 +1,87 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+from typing import Any, Dict, Optional
+
+from streampipes.functions.broker import Publisher
+from streampipes.functions.broker.in_memory.in_memory_hub import InMemoryHub
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryPublisher(Publisher):
+    """Implementation of an in-process publisher.
+
+    It passes the events to consumers running in the same process without any serialization.
+
+    Attributes
+    ----------
+    hub: Optional[InMemoryHub]
+        The hub shared with the consumers, which has to be set before the first event is published.
+    """
+
+    hub: Optional[InMemoryHub] = None
+
+    async def _make_connection(self, hostname: str, port: int) -> None:
+        """Helper function to connect to a server.
+
+        There is no server involved for in-process communication.
+
+        Parameters
+        ----------
+
+        hostname: str
+            The hostname of the server, which the broker connects to.
+
+        port: int
+            The port number of the connection.
+
+        Returns
+        -------
+        None
+        """
+        logger.info("Connecting to the in-memory broker")
+
+    async def publish_event(self, event: Dict[str, Any]):
+        """Publish an event to a connected data stream.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The event to be published.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        RuntimeError
+            If no hub is set.
+        """
+        if self.hub is None:
+            raise RuntimeError(f"No in-memory hub is set for the stream {self.stream_id}")
+        await self.hub.publish(self.topic_name, event)
+
+    async def disconnect(self) -> None:
+        """Closes the connection to the server.
+
+        Returns
+        -------
+        None
+        """
+        logger.info(f"Stopped connection to stream: {self.stream_id}")
@@ -15,19 +15,72 @@
 # limitations under the License.
 #
 
+import json
 import logging
-from typing import AsyncIterator
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
 
 from confluent_kafka import Consumer as KafkaConnection  # type: ignore
+from confluent_kafka import KafkaException, TopicPartition  # type: ignore
 from streampipes.functions.broker import Consumer
 from streampipes.functions.broker.kafka.kafka_message_fetcher import KafkaMessageFetcher
+from streampipes.functions.broker.kafka.kafka_profile import KafkaProfile
 from streampipes.model.common import random_letters
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class AtLeastOnceConfig:
+    """Configuration of the at-least-once processing of Kafka messages.
+
+    Instead of committing the offsets automatically in the background, the offsets of the messages
+    are committed once the messages have been processed and the resulting output events have been published.
+    The offsets are committed asynchronously in batches, whichever limit is reached first triggers a commit.
+    After a restart or rebalance, messages processed since the last commit are received again.
+
+    Parameters
+    ----------
+    commit_interval: float
+        Maximal time in seconds between two commits while messages are received.
+    commit_batch_size: int
+        Maximal number of processed messages between two commits.
+    """
+
+    commit_interval: float = 5.0
+    commit_batch_size: int = 1000
+
+
 class KafkaConsumer(Consumer):
-    """Implementation of a consumer for Kafka"""
+    """Implementation of a consumer for Kafka
+
+    Without consumer group, the consumer joins a group of its own and receives all messages of the topic.
+    Members of a consumer group share the partitions of the topic, which are assigned with the
+    cooperative-sticky strategy, so that a rebalance only moves the partitions that change their owner.
+
+    Attributes
+    ----------
+    on_assign: Optional[Callable[[List[int]], None]]
+        Called with the partitions newly assigned to this consumer, e.g. to restore keyed state.
+    on_revoke: Optional[Callable[[List[int]], None]]
+        Called with the partitions taken away from this consumer, e.g. to hand off keyed state.
+    assigned_partitions: Set[int]
+        The partitions currently owned by this consumer.
+    at_least_once: Optional[AtLeastOnceConfig]
+        Commits the offsets of acknowledged messages only, the offsets are committed automatically if not set.
+    profile: Optional[KafkaProfile]
+        Tuning profile of the consumer, the profile selected by the environment variable `KAFKA-PROFILE` if not set.
+    """
+
+    STATISTICS_INTERVAL_MS = 5000
+
+    on_assign: Optional[Callable[[List[int]], None]] = None
+    on_revoke: Optional[Callable[[List[int]], None]] = None
+    at_least_once: Optional[AtLeastOnceConfig] = None
+    profile: Optional[KafkaProfile] = None
+    # consumer lag of the assigned partitions, cached from the statistics
+    _lag: Optional[int] = None
 
     async def _make_connection(self, hostname: str, port: int) -> None:
         """Helper function to connect to a server.
@@ -45,9 +98,33 @@ class KafkaConsumer(Consumer):
         -------
         None
         """
-        self.kafka_consumer = KafkaConnection(
-            {"bootstrap.servers": f"{hostname}:{port}", "group.id": random_letters(6), "auto.offset.reset": "latest"}
-        )
+        config: Dict[str, Any] = {"bootstrap.servers": f"{hostname}:{port}", "auto.offset.reset": "latest"}
+        profile = self.profile or KafkaProfile.from_env()
+        if profile is not None:
+            config.update(profile.get_consumer_config())
+        # the consumer lag is taken from the statistics, which Kafka emits within `poll()`
+        config["statistics.interval.ms"] = self.STATISTICS_INTERVAL_MS
+        config["stats_cb"] = self._on_statistics
+        if self.consumer_group is None:
+            config["group.id"] = random_letters(6)
+        else:
+            config["group.id"] = self.consumer_group
+            config["partition.assignment.strategy"] = "cooperative-sticky"
+        if self.at_least_once is not None:
+            if self.consumer_group is None:
+                logger.warning(
+                    f"The stream {self.stream_id} is consumed at least once without consumer group, "
+                    "the committed offsets are lost on restart."
+                )
+            config["enable.auto.commit"] = False
+            config["on_commit"] = self._on_commit
+        self.kafka_consumer = KafkaConnection(config)
+        self.assigned_partitions: Set[int] = set()
+        # next offset to be committed per partition
+        self._offsets: Dict[int, int] = {}
+        self._num_uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._lag = None
         logger.info(f"Connecting to Kafka at {hostname}:{port}")
 
     async def _create_subscription(self) -> None:
@@ -57,9 +134,129 @@ class KafkaConsumer(Consumer):
         -------
         None
         """
-        self.kafka_consumer.subscribe([self.topic_name])
+        self.kafka_consumer.subscribe(
+            [self.topic_name], on_assign=self._on_assign, on_revoke=self._on_revoke, on_lost=self._on_lost
+        )
         logger.info(f"Subscribing to stream: {self.stream_id}")
 
+    def _on_assign(self, consumer: Any, partitions: List[Any]) -> None:
+        """Helper function called by Kafka within `poll()` when partitions are assigned to the consumer.
+
+        Parameters
+        ----------
+        consumer: Any
+            The Kafka consumer.
+        partitions: List[Any]
+            The newly assigned topic partitions.
+
+        Returns
+        -------
+        None
+        """
+        assigned = sorted(partition.partition for partition in partitions)
+        self.assigned_partitions.update(assigned)
+        logger.info(f"Partitions {assigned} of stream {self.stream_id} assigned")
+        if assigned and self.on_assign is not None:
+            self.on_assign(assigned)
+
+    def _on_revoke(self, consumer: Any, partitions: List[Any]) -> None:
+        """Helper function called by Kafka within `poll()` when partitions are revoked from the consumer.
+
+        The offsets of the acknowledged messages of the revoked partitions are committed synchronously,
+        so that their new owner continues right after them.
+
+        Parameters
+        ----------
+        consumer: Any
+            The Kafka consumer.
+        partitions: List[Any]
+            The revoked topic partitions.
+
+        Returns
+        -------
+        None
+        """
+        revoked = sorted(partition.partition for partition in partitions)
+        offsets = [
+            TopicPartition(self.topic_name, partition, self._offsets.pop(partition))
+            for partition in revoked
+            if partition in self._offsets
+        ]
+        if offsets:
+            try:
+                self.kafka_consumer.commit(offsets=offsets, asynchronous=False)
+            except KafkaException as err:
+                logger.warning(f"Failed to commit the offsets of the revoked partitions {revoked}: {err}")
+        self._release(revoked, "revoked")
+
+    def _on_lost(self, consumer: Any, partitions: List[Any]) -> None:
+        """Helper function called by Kafka within `poll()` when partitions are lost by the consumer.
+
+        The partitions may already be owned by another consumer, so their offsets can not be committed anymore.
+
+        Parameters
+        ----------
+        consumer: Any
+            The Kafka consumer.
+        partitions: List[Any]
+            The lost topic partitions.
+
+        Returns
+        -------
+        None
+        """
+        lost = sorted(partition.partition for partition in partitions)
+        # uncommitted messages of lost partitions are received again by their new owner
+        for partition in lost:
+            self._offsets.pop(partition, None)
+        self._release(lost, "lost")
+
+    def _release(self, partitions: List[int], reason: str) -> None:
+        """Helper function to remove partitions from the assigned partitions and to notify about it.
+
+        Parameters
+        ----------
+        partitions: List[int]
+            The partitions taken away from the consumer.
+        reason: str
+            Whether the partitions have been revoked or lost.
+
+        Returns
+        -------
+        None
+        """
+        self.assigned_partitions.difference_update(partitions)
+        logger.info(f"Partitions {partitions} of stream {self.stream_id} {reason}")
+        if partitions and self.on_revoke is not None:
+            self.on_revoke(partitions)
+
+    def _on_statistics(self, statistics: str) -> None:
+        """Helper function called by Kafka within `poll()` with the statistics of the consumer.
+
+        The consumer lag of the assigned partitions is cached, so that it can be read from other threads
+        without querying the Kafka consumer.
+
+        Parameters
+        ----------
+        statistics: str
+            The statistics in JSON format.
+
+        Returns
+        -------
+        None
+        """
+        partitions = json.loads(statistics).get("topics", {}).get(self.topic_name, {}).get("partitions", {})
+        lag = None
+        for partition in self.assigned_partitions:
+            stats = partitions.get(str(partition))
+            if stats is None:
+                continue
+            # both offsets are negative as long as they are unknown
+            high, position = stats.get("hi_offset", -1), stats.get("app_offset", -1)
+            if high >= 0 and position >= 0:
+                lag = (lag or 0) + max(high - position, 0)
+        self._lag = lag
+
     async def disconnect(self) -> None:
         """Closes the connection to the server.
 
@@ -70,6 +267,73 @@ class KafkaConsumer(Consumer):
         self.kafka_consumer.close()
         logger.info(f"Stopped connection to stream: {self.stream_id}")
 
+    def acknowledge(self, message: Any) -> bool:
+        """Marks a message as completely processed, i.e. by all functions including their outputs.
+
+        Parameters
+        ----------
+        message: Any
+            A message returned by the iterator of `get_message()`.
+
+        Returns
+        -------
+        commit_due: bool
+            Whether the commit interval or batch size of the at-least-once processing is reached.
+        """
+        config = self.at_least_once
+        if config is None:
+            return False
+        partition = message.message.partition()
+        # messages received before their partition was revoked belong to the new owner
+        if partition not in self.assigned_partitions:
+            return False
+        self._offsets[partition] = message.message.offset() + 1
+        self._num_uncommitted += 1
+        return (
+            self._num_uncommitted >= config.commit_batch_size
+            or time.monotonic() - self._last_commit >= config.commit_interval
+        )
+
+    async def commit(self, asynchronous: bool = True) -> None:
+        """Commits the offsets of the acknowledged messages.
+
+        Parameters
+        ----------
+        asynchronous: bool
+            Whether to wait for the broker to confirm the commit.
+
+        Returns
+        -------
+        None
+        """
+        self._num_uncommitted = 0
+        self._last_commit = time.monotonic()
+        if not self._offsets:
+            return
+        offsets = [TopicPartition(self.topic_name, partition, offset) for partition, offset in self._offsets.items()]
+        self._offsets = {}
+        if asynchronous:
+            self.kafka_consumer.commit(offsets=offsets, asynchronous=True)
+        else:
+            self.kafka_consumer.commit(offsets=offsets, asynchronous=False)
+
+    def _on_commit(self, error: Any, partitions: List[Any]) -> None:
+        """Helper function called by Kafka with the result of a commit.
+
+        Parameters
+        ----------
+        error: Any
+            The error of the commit, `None` if the commit was successful.
+        partitions: List[Any]
+            The committed topic partitions.
+
+        Returns
+        -------
+        None
+        """
+        if error is not None:
+            logger.warning(f"The offsets of the stream {self.stream_id} could not be committed: {error}")
+
     def get_message(self) -> AsyncIterator:
         """Get the published messages of the subscription.
 
@@ -79,3 +343,15 @@ class KafkaConsumer(Consumer):
             An async iterator for the messages.
         """
         return KafkaMessageFetcher(self.kafka_consumer)
+
+    def get_pending_messages(self) -> Optional[int]:
+        """Get the consumer lag, i.e. the number of messages between the current position and the end of the topic.
+
+        The lag is updated from the statistics emitted by Kafka every `statistics.interval.ms` milliseconds.
+
+        Returns
+        -------
+        pending_messages: Optional[int]
+            The consumer lag summed over all assigned partitions or `None` if it is not known yet.
+        """
+        return self._lag
@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from typing import Any
+
 from confluent_kafka import Consumer  # type: ignore
 
 
@@ -24,10 +26,13 @@ class KafkaMessage:
     ----------
     data: bytes
         The received Kafka message as byte array
+    message: Any
+        The original Kafka message, which provides its partition and offset
     """
 
-    def __init__(self, data):
+    def __init__(self, data, message: Any = None):
         self.data = data
+        self.message = message
 
 
 class KafkaMessageFetcher:
@@ -49,4 +54,4 @@ class KafkaMessageFetcher:
         msg = None
         while not msg:
             msg = self.consumer.poll(0.1)
-        return KafkaMessage(msg.value())
+        return KafkaMessage(msg.value(), msg)
@@ -0,0 +1,157 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+__all__ = ["KafkaProfile"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class KafkaProfile:
+    """Tuning profile of the Kafka consumers and publishers.
+
+    Every setting corresponds to the librdkafka configuration property of the same name,
+    settings that are not set keep the default of librdkafka.
+    Besides the explicit settings, further properties can be passed via `consumer_config` and `producer_config`.
+
+    A profile can be selected for all Kafka data streams via the environment variable `KAFKA-PROFILE`
+    (`low-latency` or `high-throughput`) or passed to the
+    [FunctionHandler][streampipes.functions.function_handler.FunctionHandler] for all or individual data streams.
+
+    Parameters
+    ----------
+    fetch_min_bytes: Optional[int]
+        Minimal amount of data the broker responds with to a fetch request of a consumer.
+    fetch_wait_max_ms: Optional[int]
+        Maximal time the broker waits for `fetch_min_bytes` of data.
+    queued_max_messages_kbytes: Optional[int]
+        Maximal size of the messages prefetched by a consumer.
+    linger_ms: Optional[float]
+        Time a publisher waits for further messages to send them in a batch. If set to a positive value,
+        the publisher no longer waits for the delivery of every single event but flushes its batches in the background.
+    batch_num_messages: Optional[int]
+        Maximal number of messages a publisher sends in a batch.
+    compression_type: Optional[str]
+        Compression of the batches sent by a publisher, e.g. `lz4` or `zstd`.
+    enable_idempotence: Optional[bool]
+        Whether a publisher writes every message exactly once and in order, even if requests are retried.
+    consumer_config: Dict[str, Any]
+        Further configuration properties of the consumers.
+    producer_config: Dict[str, Any]
+        Further configuration properties of the publishers.
+    """
+
+    fetch_min_bytes: Optional[int] = None
+    fetch_wait_max_ms: Optional[int] = None
+    queued_max_messages_kbytes: Optional[int] = None
+    linger_ms: Optional[float] = None
+    batch_num_messages: Optional[int] = None
+    compression_type: Optional[str] = None
+    enable_idempotence: Optional[bool] = None
+    consumer_config: Dict[str, Any] = field(default_factory=dict)
+    producer_config: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def low_latency(cls) -> "KafkaProfile":
+        """Profile delivering every message as soon as possible at the expense of throughput.
+
+        Returns
+        -------
+        profile: KafkaProfile
+            The low-latency profile.
+        """
+        return cls(
+            fetch_min_bytes=1,
+            fetch_wait_max_ms=10,
+            queued_max_messages_kbytes=16384,
+            linger_ms=0,
+            compression_type="none",
+            enable_idempotence=False,
+        )
+
+    @classmethod
+    def high_throughput(cls) -> "KafkaProfile":
+        """Profile transferring messages in large compressed batches at the expense of latency.
+
+        Returns
+        -------
+        profile: KafkaProfile
+            The high-throughput profile.
+        """
+        return cls(
+            fetch_min_bytes=65536,
+            fetch_wait_max_ms=100,
+            queued_max_messages_kbytes=262144,
+            linger_ms=20,
+            batch_num_messages=10000,
+            compression_type="lz4",
+            enable_idempotence=True,
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["KafkaProfile"]:
+        """Get the preset selected by the environment variable `KAFKA-PROFILE`.
+
+        Returns
+        -------
+        profile: Optional[KafkaProfile]
+            The selected preset or `None` if no or an unknown preset is selected.
+        """
+        name = os.environ.get("KAFKA-PROFILE")
+        if name is None:
+            return None
+        presets = {"low-latency": cls.low_latency, "high-throughput": cls.high_throughput}
+        if name not in presets:
+            logger.warning(f'Unknown Kafka profile "{name}", supported are {list(presets)}')
+            return None
+        return presets[name]()
+
+    def get_consumer_config(self) -> Dict[str, Any]:
+        """Get the configuration properties of a consumer.
+
+        Returns
+        -------
+        config: Dict[str, Any]
+            The librdkafka configuration properties.
+        """
+        config = self._config(("fetch_min_bytes", "fetch_wait_max_ms", "queued_max_messages_kbytes"))
+        config.update(self.consumer_config)
+        return config
+
+    def get_producer_config(self) -> Dict[str, Any]:
+        """Get the configuration properties of a publisher.
+
+        Returns
+        -------
+        config: Dict[str, Any]
+            The librdkafka configuration properties.
+        """
+        config = self._config(("linger_ms", "batch_num_messages", "compression_type", "enable_idempotence"))
+        config.update(self.producer_config)
+        return config
+
+    def _config(self, settings: tuple) -> Dict[str, Any]:
+        """Helper function to get the configuration properties of the given settings that are set."""
+        return {
+            setting.replace("_", "."): getattr(self, setting)
+            for setting in settings
+            if getattr(self, setting) is not None
+        }
@@ -15,18 +15,35 @@
 # limitations under the License.
 #
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from confluent_kafka import Producer  # type: ignore
+from confluent_kafka import KafkaError, KafkaException, Producer  # type: ignore
 from streampipes.functions.broker import Publisher
+from streampipes.functions.broker.kafka.kafka_profile import KafkaProfile
 
 logger = logging.getLogger(__name__)
 
 
 class KafkaPublisher(Publisher):
-    """Implementation of a publisher for Kafka"""
+    """Implementation of a publisher for Kafka
+
+    By default, the publisher waits for the delivery of every event. If the profile lets the publisher
+    linger for further messages, the events are sent in batches in the background instead
+    and `flush()` waits for their delivery. Failed deliveries are raised by the next flush.
+
+    Attributes
+    ----------
+    profile: Optional[KafkaProfile]
+        Tuning profile of the publisher, the profile selected by the environment variable `KAFKA-PROFILE` if not set.
+    flush_timeout: float
+        Maximal time in seconds to wait for the delivery of the published events.
+    """
+
+    profile: Optional[KafkaProfile] = None
+    flush_timeout: float = 30.0
 
     async def _make_connection(self, hostname: str, port: int) -> None:
         """Helper function to connect to a server.
@@ -44,9 +61,91 @@ class KafkaPublisher(Publisher):
         -------
         None
         """
-        self.kafka_producer = Producer({"bootstrap.servers": f"{hostname}:{port}"})
+        self._bootstrap_servers = f"{hostname}:{port}"
+        self._create_producer(self.profile or KafkaProfile.from_env())
         logger.info(f"Connecting to Kafka at {hostname}:{port}")
 
+    def _create_producer(self, profile: Optional[KafkaProfile]) -> None:
+        """Helper function to create the Kafka producer according to a tuning profile.
+
+        Parameters
+        ----------
+        profile: Optional[KafkaProfile]
+            The tuning profile, the defaults of librdkafka are used if not set.
+
+        Returns
+        -------
+        None
+        """
+        config: Dict[str, Any] = {"bootstrap.servers": self._bootstrap_servers}
+        if profile is not None:
+            config.update(profile.get_producer_config())
+        self.kafka_producer = Producer(config)
+        self._flush_each_event = not config.get("linger.ms")
+        self._delivery_error: Optional[KafkaError] = None
+
+    def _on_delivery(self, error: Optional[KafkaError], message: Any) -> None:
+        """Helper function called by the producer with the delivery report of every event.
+
+        Parameters
+        ----------
+        error: Optional[KafkaError]
+            The error if the event could not be delivered.
+        message: Any
+            The published message.
+
+        Returns
+        -------
+        None
+        """
+        if error is not None and self._delivery_error is None:
+            self._delivery_error = error
+
+    def _check_delivery(self, remaining: int) -> None:
+        """Helper function to raise the delivery errors since the last check.
+
+        Parameters
+        ----------
+        remaining: int
+            The number of events that have not been delivered yet.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KafkaException
+            If an event could not be delivered or the delivery timed out.
+        """
+        error, self._delivery_error = self._delivery_error, None
+        if error is not None:
+            raise KafkaException(error)
+        if remaining > 0:
+            raise KafkaException(
+                KafkaError(
+                    KafkaError._MSG_TIMED_OUT,
+                    f"{remaining} events of stream {self.stream_id} not delivered within {self.flush_timeout} seconds",
+                )
+            )
+
+    def configure(self, profile: KafkaProfile) -> None:
+        """Applies a tuning profile to the publisher, which may already be connected.
+
+        Parameters
+        ----------
+        profile: KafkaProfile
+            The tuning profile.
+
+        Returns
+        -------
+        None
+        """
+        self.profile = profile
+        if hasattr(self, "kafka_producer"):
+            self._check_delivery(self.kafka_producer.flush(self.flush_timeout))
+            self._create_producer(profile)
+
     async def publish_event(self, event: Dict[str, Any]):
         """Publish an event to a connected data stream.
 
@@ -58,9 +157,37 @@ class KafkaPublisher(Publisher):
         Returns
         -------
         None
+
+        Raises
+        ------
+        KafkaException
+            If the event could not be delivered, when waiting for the delivery of every event.
+        """
+        self.kafka_producer.produce(
+            topic=self.topic_name, value=json.dumps(event).encode("utf-8"), on_delivery=self._on_delivery
+        )
+        if self._flush_each_event:
+            self._check_delivery(self.kafka_producer.flush(self.flush_timeout))
+        else:
+            # serve the delivery reports of the batches sent in the background
+            self.kafka_producer.poll(0)
+
+    async def flush(self) -> None:
+        """Waits until all published events have been delivered to Kafka.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KafkaException
+            If an event published since the last flush could not be delivered or the delivery timed out.
         """
-        self.kafka_producer.produce(topic=self.topic_name, value=json.dumps(event).encode("utf-8"))
-        self.kafka_producer.flush()
+        remaining = await asyncio.get_running_loop().run_in_executor(
+            None, self.kafka_producer.flush, self.flush_timeout
+        )
+        self._check_delivery(remaining)
 
     async def disconnect(self) -> None:
         """Closes the connection to the server.
@@ -69,4 +196,8 @@ class KafkaPublisher(Publisher):
         -------
         None
         """
+        try:
+            self._check_delivery(self.kafka_producer.flush(self.flush_timeout))
+        except KafkaException as err:
+            logger.error(f"Events of stream {self.stream_id} lost on disconnect: {err}")
         logger.info(f"Stopped connection to stream: {self.stream_id}")
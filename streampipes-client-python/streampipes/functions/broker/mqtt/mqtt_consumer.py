@@ -0,0 +1,228 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator, Deque, Dict, Optional, Tuple
+
+import paho.mqtt.client as mqtt  # type: ignore
+from streampipes.functions.broker import Consumer
+from streampipes.model.common import random_letters
+
+logger = logging.getLogger(__name__)
+
+
+class MqttConsumer(Consumer):
+    """Implementation of a consumer for MQTT
+
+    The network loop of the MQTT client runs in a background thread, which hands the received messages over
+    to the event loop in batches: the event loop is only woken up for the first message after it ran out of messages.
+    Once `max_buffered_messages` are waiting, the network loop pauses, so that messages with QoS 1 or 2
+    stay unacknowledged and the broker stops sending further ones. The pause is limited to `max_block_time`,
+    afterwards the message is buffered beyond the limit, so that the network loop keeps the connection alive.
+
+    Members of a consumer group share the messages via a shared subscription.
+
+    Attributes
+    ----------
+    qos: int
+        Quality of service of the subscription, i.e. `0` (at most once), `1` (at least once) or `2` (exactly once).
+    max_inflight_messages: int
+        Maximal number of QoS 1 and 2 messages that are being exchanged with the broker at once.
+    max_buffered_messages: int
+        Maximal number of received messages waiting to be processed.
+    max_block_time: float
+        Maximal time in seconds the network loop pauses while the buffer is full.
+        Needs to stay below the keepalive interval of 60 seconds.
+    """
+
+    qos: int = 1
+    max_inflight_messages: int = 20
+    max_buffered_messages: int = 10000
+    max_block_time: float = 5.0
+
+    async def _make_connection(self, hostname: str, port: int) -> None:
+        """Helper function to connect to a server.
+
+        Parameters
+        ----------
+
+        hostname: str
+            The hostname of the server, which the broker connects to.
+
+        port: int
+            The port number of the connection.
+
+        Returns
+        -------
+        None
+        """
+        self._loop = asyncio.get_running_loop()
+        # the received messages and whether they hold a unit of the buffer capacity
+        self._messages: Deque[Tuple[Any, bool]] = deque()
+        self._ready = asyncio.Event()
+        self._capacity = threading.Semaphore(self.max_buffered_messages)
+        self._closed = False
+        self._topic_filter: Optional[str] = None
+        self.mqtt_client = mqtt.Client(client_id=f"streampipes-{random_letters(12)}")
+        self.mqtt_client.max_inflight_messages_set(self.max_inflight_messages)
+        self.mqtt_client.on_message = self._on_message
+        self.mqtt_client.on_connect = self._on_connect
+        # connecting resolves the hostname and waits for the socket, which must not block the event loop
+        await self._loop.run_in_executor(None, self.mqtt_client.connect, hostname, port)
+        self.mqtt_client.loop_start()
+        logger.info(f"Connecting to MQTT at {hostname}:{port}")
+
+    async def _create_subscription(self) -> None:
+        """Creates a subscription to a data stream.
+
+        Returns
+        -------
+        None
+        """
+        self._topic_filter = self.topic_name
+        if self.consumer_group is not None:
+            self._topic_filter = f"$share/{self.consumer_group}/{self.topic_name}"
+        self.mqtt_client.subscribe(self._topic_filter, qos=self.qos)
+        logger.info(f"Subscribed to stream: {self.stream_id}")
+
+    def _on_connect(self, client: Any, userdata: Any, flags: Any, rc: int) -> None:
+        """Helper function called by the network loop once the client is (re)connected.
+
+        Parameters
+        ----------
+        client: Any
+            The MQTT client.
+        userdata: Any
+            The user data of the MQTT client.
+        flags: Any
+            The flags sent by the broker.
+        rc: int
+            The result of the connection attempt.
+
+        Returns
+        -------
+        None
+        """
+        if rc != mqtt.CONNACK_ACCEPTED:
+            logger.error(f"Connection of stream {self.stream_id} refused: {mqtt.connack_string(rc)}")
+        elif self._topic_filter is not None:
+            # subscriptions of a clean session are lost on reconnect
+            client.subscribe(self._topic_filter, qos=self.qos)
+
+    def _on_message(self, client: Any, userdata: Any, message: Any) -> None:
+        """Helper function called by the network loop for every received message.
+
+        Parameters
+        ----------
+        client: Any
+            The MQTT client.
+        userdata: Any
+            The user data of the MQTT client.
+        message: Any
+            The received message.
+
+        Returns
+        -------
+        None
+        """
+        if self._closed:
+            return
+        # pauses the network loop while the buffer is full
+        acquired = self._capacity.acquire(timeout=self.max_block_time)
+        if self._closed:
+            return
+        if not acquired:
+            logger.warning(
+                f"The buffer of stream {self.stream_id} is still full after {self.max_block_time} seconds, "
+                "buffering the message beyond the limit to keep the connection alive"
+            )
+        self._messages.append((message, acquired))
+        if len(self._messages) == 1:
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def _receive(self) -> AsyncGenerator:
+        """Helper function to continuously yield the received messages.
+
+        Yields
+        ------
+        message: Any
+            The next received message.
+        """
+        messages = self._messages
+        while True:
+            while messages:
+                message, acquired = messages.popleft()
+                if acquired:
+                    self._capacity.release()
+                yield message
+            self._ready.clear()
+            if not messages:
+                await self._ready.wait()
+
+    async def disconnect(self) -> None:
+        """Closes the connection to the server.
+
+        Returns
+        -------
+        None
+        """
+        # the network loop drops further messages, so it waits for buffer capacity at most once more
+        self._closed = True
+        self.mqtt_client.disconnect()
+        self._capacity.release()
+        self.mqtt_client.loop_stop()
+        logger.info(f"Stopped connection to stream: {self.stream_id}")
+
+    def get_message(self) -> AsyncIterator:
+        """Get the published messages of the subscription.
+
+        Returns
+        -------
+        iterator: AsyncIterator
+            An async iterator for the messages.
+        """
+        return self._receive()
+
+    def decode_message(self, message: Any) -> Dict[str, Any]:
+        """Decodes a received message into an event.
+
+        Parameters
+        ----------
+        message: Any
+            A message returned by the iterator of `get_message()`.
+
+        Returns
+        -------
+        event: Dict[str, Any]
+            The event contained in the message.
+        """
+        if self.projection is not None:
+            return self.projection.decode(message.payload.decode())
+        return json.loads(message.payload.decode())
+
+    def get_pending_messages(self) -> Optional[int]:
+        """Get the number of received messages that have not been processed yet.
+
+        Returns
+        -------
+        pending_messages: Optional[int]
+            The number of buffered messages.
+        """
+        return len(self._messages)
@@ -0,0 +1,167 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+import paho.mqtt.client as mqtt  # type: ignore
+from streampipes.functions.broker import Publisher
+from streampipes.model.common import random_letters
+
+logger = logging.getLogger(__name__)
+
+
+class MqttPublisher(Publisher):
+    """Implementation of a publisher for MQTT
+
+    Published events are queued by the MQTT client and sent by its network loop in a background thread.
+    A flush waits until the broker has confirmed all of them according to the quality of service.
+    Events with a quality of service of `1` or `2` published while the client is disconnected
+    are sent once it has reconnected.
+
+    Attributes
+    ----------
+    qos: int
+        Quality of service of the published events, i.e. `0` (at most once), `1` (at least once)
+        or `2` (exactly once).
+    max_inflight_messages: int
+        Maximal number of QoS 1 and 2 events that are being exchanged with the broker at once.
+        Further events are queued until the confirmations of the broker arrive.
+    max_queued_messages: int
+        Maximal number of events waiting to be sent, `0` for no limit. Events exceeding the limit are dropped.
+    flush_timeout: float
+        Maximal time in seconds to wait for the broker to confirm the published events when flushing.
+    """
+
+    qos: int = 1
+    max_inflight_messages: int = 20
+    max_queued_messages: int = 0
+    flush_timeout: float = 30.0
+
+    async def _make_connection(self, hostname: str, port: int) -> None:
+        """Helper function to connect to a server.
+
+        Parameters
+        ----------
+
+        hostname: str
+            The hostname of the server, which the broker connects to.
+
+        port: int
+            The port number of the connection.
+
+        Returns
+        -------
+        None
+        """
+        self.mqtt_client = mqtt.Client(client_id=f"streampipes-{random_letters(12)}")
+        self.mqtt_client.max_inflight_messages_set(self.max_inflight_messages)
+        self.mqtt_client.max_queued_messages_set(self.max_queued_messages)
+        # connecting resolves the hostname and waits for the socket, which must not block the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.mqtt_client.connect, hostname, port)
+        self.mqtt_client.loop_start()
+        # published events whose confirmation has not been awaited yet
+        self._unconfirmed: List[Any] = []
+        logger.info(f"Connecting to MQTT at {hostname}:{port}")
+
+    async def publish_event(self, event: Dict[str, Any]):
+        """Publish an event to a connected data stream.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The event to be published.
+
+        Returns
+        -------
+        None
+        """
+        info = self.mqtt_client.publish(self.topic_name, json.dumps(event).encode("utf-8"), qos=self.qos)
+        if info.rc == mqtt.MQTT_ERR_QUEUE_SIZE:
+            logger.warning(f"Event of stream {self.stream_id} dropped, too many events are waiting to be sent")
+            return
+        if info.rc == mqtt.MQTT_ERR_NO_CONN and self.qos > 0:
+            # the client keeps the event and sends it once it has reconnected, but it keeps the return code,
+            # which would let waiting for the confirmation fail immediately
+            info.rc = mqtt.MQTT_ERR_SUCCESS
+        elif info.rc != mqtt.MQTT_ERR_SUCCESS:
+            logger.warning(f"Event of stream {self.stream_id} dropped: {mqtt.error_string(info.rc)}")
+            return
+        self._unconfirmed.append(info)
+        if len(self._unconfirmed) >= 1000:
+            self._unconfirmed = [info for info in self._unconfirmed if not info.is_published()]
+
+    async def flush(self) -> None:
+        """Waits until the broker has confirmed all published events.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TimeoutError
+            If the broker has not confirmed all events published since the last flush within `flush_timeout`.
+        """
+        unconfirmed, self._unconfirmed = self._unconfirmed, []
+        if not unconfirmed:
+            return
+        remaining = await asyncio.get_running_loop().run_in_executor(
+            None, self._wait_for_publish, unconfirmed, self.flush_timeout
+        )
+        if remaining > 0:
+            raise TimeoutError(
+                f"{remaining} events of stream {self.stream_id} not confirmed within {self.flush_timeout} seconds"
+            )
+
+    @staticmethod
+    def _wait_for_publish(unconfirmed: List[Any], timeout: float) -> int:
+        """Helper function to wait for the confirmation of the published events in a separate thread.
+
+        Parameters
+        ----------
+        unconfirmed: List[Any]
+            The message infos of the published events.
+        timeout: float
+            Maximal time in seconds to wait for all confirmations.
+
+        Returns
+        -------
+        remaining: int
+            The number of events that have not been confirmed within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        for info in unconfirmed:
+            info.wait_for_publish(max(deadline - time.monotonic(), 0.0))
+        return sum(1 for info in unconfirmed if not info.is_published())
+
+    async def disconnect(self) -> None:
+        """Closes the connection to the server.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            await self.flush()
+        except TimeoutError as err:
+            logger.error(f"Events of stream {self.stream_id} lost on disconnect: {err}")
+        self.mqtt_client.disconnect()
+        self.mqtt_client.loop_stop()
+        logger.info(f"Stopped connection to stream: {self.stream_id}")
@@ -15,16 +15,126 @@
 # limitations under the License.
 #
 import logging
-from typing import AsyncIterator
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional
 
 from nats import connect
+from nats.aio.subscription import (
+    DEFAULT_SUB_PENDING_BYTES_LIMIT,
+    DEFAULT_SUB_PENDING_MSGS_LIMIT,
+)
+from nats.errors import SlowConsumerError
+from nats.errors import TimeoutError as NatsTimeoutError
+from nats.js.api import AckPolicy, ConsumerConfig, DeliverPolicy
 from streampipes.functions.broker import Consumer
+from streampipes.functions.broker.nats.nats_spill_buffer import SpillBuffer
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class JetStreamConfig:
+    """Configuration of the consumption of NATS data streams via JetStream.
+
+    Instead of a core NATS subscription, which drops messages while a function falls behind or is restarted,
+    the messages are pulled in batches from a JetStream consumer and acknowledged in bulk
+    once they have been processed and the resulting output events have been published.
+    Messages that are not acknowledged within `ack_wait` are delivered again.
+
+    Parameters
+    ----------
+    stream: Optional[str]
+        Name of the JetStream stream that stores the subject of the data stream, looked up by the subject if not set.
+    durable_name: Optional[str]
+        Name of the durable consumer, which keeps its position across restarts. Defaults to the consumer group,
+        otherwise an ephemeral consumer is created that starts with new messages.
+    batch_size: int
+        Maximal number of messages fetched per pull request.
+    fetch_timeout: float
+        Time in seconds a pull request waits for messages.
+    ack_wait: float
+        Time in seconds after which unacknowledged messages are delivered again.
+        Needs to cover the processing of the messages buffered by the function handler.
+    deliver_policy: Optional[DeliverPolicy]
+        Messages of the stream a newly created consumer starts with. Defaults to `DeliverPolicy.NEW`
+        for ephemeral consumers and to `DeliverPolicy.ALL` for durable consumers.
+    """
+
+    stream: Optional[str] = None
+    durable_name: Optional[str] = None
+    batch_size: int = 100
+    fetch_timeout: float = 1.0
+    ack_wait: float = 30.0
+    deliver_policy: Optional[DeliverPolicy] = None
+
+
+class OverflowPolicy(Enum):
+    """Behavior of a core NATS subscription once its pending messages exceed the limits.
+
+    Attributes
+    ----------
+    DROP
+        Newly received messages are dropped and reported as slow consumer.
+    UNBOUNDED
+        No messages are dropped by the client, the limits are disabled and the pending messages
+        are buffered in memory until the function catches up. This does not slow down the publishers,
+        the memory grows without bound while the function falls behind and the NATS server disconnects
+        the client once it exceeds the limits of the server. Use `JetStreamConfig` for consumption with
+        backpressure or `SPILL` to bound the memory.
+    SPILL
+        Messages exceeding the limits are written to a local file and processed in order afterwards.
+    """
+
+    DROP = "drop"
+    UNBOUNDED = "unbounded"
+    SPILL = "spill"
+
+
+@dataclass
+class SubscriptionLimits:
+    """Limits of the messages buffered by a core NATS subscription that have not been processed yet.
+
+    Parameters
+    ----------
+    pending_msgs_limit: int
+        Maximal number of pending messages.
+    pending_bytes_limit: int
+        Maximal size of the payloads of the pending messages.
+    overflow_policy: OverflowPolicy
+        Handling of messages received while the limits are reached.
+    spill_directory: Optional[str]
+        Directory of the spill file of the `SPILL` policy, the default directory for temporary files if not set.
+    """
+
+    pending_msgs_limit: int = DEFAULT_SUB_PENDING_MSGS_LIMIT
+    pending_bytes_limit: int = DEFAULT_SUB_PENDING_BYTES_LIMIT
+    overflow_policy: OverflowPolicy = OverflowPolicy.DROP
+    spill_directory: Optional[str] = None
+
+
 class NatsConsumer(Consumer):
-    """Implementation of a consumer for NATS"""
+    """Implementation of a consumer for NATS
+
+    Attributes
+    ----------
+    jetstream: Optional[JetStreamConfig]
+        Consumes the data stream via a JetStream pull consumer, a core NATS subscription is used if not set.
+    limits: Optional[SubscriptionLimits]
+        Limits of the pending messages of the core NATS subscription, the defaults of the NATS client if not set.
+    on_slow_consumer: Optional[Callable[[], None]]
+        Called for every message dropped because the pending messages exceed the limits, e.g. to count them.
+    dropped_messages: int
+        Number of messages dropped by the subscription.
+    spill_buffer: Optional[SpillBuffer]
+        Buffer of the received messages if the overflow policy is `SPILL`.
+    """
+
+    jetstream: Optional[JetStreamConfig] = None
+    limits: Optional[SubscriptionLimits] = None
+    on_slow_consumer: Optional[Callable[[], None]] = None
+    dropped_messages: int = 0
+    spill_buffer: Optional[SpillBuffer] = None
 
     async def _make_connection(self, hostname: str, port: int) -> None:
         """Helper function to connect to a server.
@@ -43,7 +153,12 @@ class NatsConsumer(Consumer):
         None
 
         """
-        self.nats_client = await connect([f"nats://{hostname}:{port}"])
+        self.nats_client = await connect([f"nats://{hostname}:{port}"], error_cb=self._on_error)
+        # acknowledged messages whose acks are not sent yet
+        self._unacked: List[Any] = []
+        self._num_unacked = 0
+        self._num_fetched = 0
+        self._num_acknowledged = 0
         logger.info(f"Connecting to NATS at {hostname}:{port}")
 
     async def _create_subscription(self) -> None:
@@ -54,9 +169,111 @@ class NatsConsumer(Consumer):
         None
 
         """
-        self.subscription = await self.nats_client.subscribe(self.topic_name)
+        if self.jetstream is not None:
+            await self._create_pull_subscription(self.jetstream)
+            return
+        limits = self.limits or SubscriptionLimits()
+        options: Dict[str, Any] = {}
+        if limits.overflow_policy == OverflowPolicy.UNBOUNDED:
+            logger.warning(
+                f"The pending messages of stream {self.stream_id} are not limited and may exhaust the memory, "
+                "use JetStream for consumption with backpressure"
+            )
+            options["pending_msgs_limit"] = 0
+            options["pending_bytes_limit"] = 0
+        elif limits.overflow_policy == OverflowPolicy.SPILL:
+            # the callback only moves the messages to the spill buffer, which enforces the limits
+            self.spill_buffer = SpillBuffer(
+                limits.pending_msgs_limit, limits.pending_bytes_limit, limits.spill_directory
+            )
+            options["cb"] = self.spill_buffer.put
+        else:
+            options["pending_msgs_limit"] = limits.pending_msgs_limit
+            options["pending_bytes_limit"] = limits.pending_bytes_limit
+        if self.consumer_group is not None:
+            # members of a queue group share the messages of the subject
+            options["queue"] = self.consumer_group
+        self.subscription = await self.nats_client.subscribe(self.topic_name, **options)
         logger.info(f"Subscribed to stream: {self.stream_id}")
 
+    async def _on_error(self, error: Exception) -> None:
+        """Helper function called by the NATS client on asynchronous errors.
+
+        Parameters
+        ----------
+        error: Exception
+            The error raised within the NATS client.
+
+        Returns
+        -------
+        None
+        """
+        if not isinstance(error, SlowConsumerError):
+            logger.error(f"Error of the NATS connection of stream {self.stream_id}: {error}")
+            return
+        self.dropped_messages += 1
+        # log the first drop and then every 10000th to not flood the log
+        if self.dropped_messages % 10000 == 1:
+            logger.warning(
+                f"The stream {self.stream_id} is consumed too slowly, "
+                f"{self.dropped_messages} messages dropped in total"
+            )
+        if self.on_slow_consumer is not None:
+            self.on_slow_consumer()
+
+    async def _create_pull_subscription(self, config: JetStreamConfig) -> None:
+        """Helper function to create a JetStream pull consumer for the data stream.
+
+        Members of a consumer group share a durable consumer and acknowledge every message explicitly.
+        A consumer of its own acknowledges all messages up to the last processed one at once.
+
+        Parameters
+        ----------
+        config: JetStreamConfig
+            The configuration of the JetStream consumer.
+
+        Returns
+        -------
+        None
+        """
+        durable_name = config.durable_name or self.consumer_group
+        self._ack_all = self.consumer_group is None
+        deliver_policy = config.deliver_policy
+        if deliver_policy is None:
+            # an ephemeral consumer would replay the whole retained stream on every start
+            deliver_policy = DeliverPolicy.ALL if durable_name is not None else DeliverPolicy.NEW
+        consumer_config = ConsumerConfig(
+            deliver_policy=deliver_policy,
+            ack_policy=AckPolicy.ALL if self._ack_all else AckPolicy.EXPLICIT,
+            ack_wait=config.ack_wait,
+        )
+        self.pull_subscription = await self.nats_client.jetstream().pull_subscribe(
+            self.topic_name, durable=durable_name, stream=config.stream, config=consumer_config
+        )
+        logger.info(f"Pulling stream {self.stream_id} from JetStream consumer {durable_name or '(ephemeral)'}")
+
+    async def _fetch(self, config: JetStreamConfig) -> AsyncGenerator:
+        """Helper function to continuously pull the messages from the JetStream consumer in batches.
+
+        Parameters
+        ----------
+        config: JetStreamConfig
+            The configuration of the JetStream consumer.
+
+        Yields
+        ------
+        message: Any
+            The next pulled message.
+        """
+        while True:
+            try:
+                messages = await self.pull_subscription.fetch(config.batch_size, timeout=config.fetch_timeout)
+            except NatsTimeoutError:
+                continue
+            self._num_fetched += len(messages)
+            for message in messages:
+                yield message
+
     async def disconnect(self) -> None:
         """Closes the connection to the server.
 
@@ -65,6 +282,8 @@ class NatsConsumer(Consumer):
         None
         """
         await self.nats_client.close()
+        if self.spill_buffer is not None:
+            self.spill_buffer.close()
         logger.info(f"Stopped connection to stream: {self.stream_id}")
 
     def get_message(self) -> AsyncIterator:
@@ -75,4 +294,71 @@ class NatsConsumer(Consumer):
         message_iterator: AsyncIterator
             An async iterator for the messages.
         """
+        if self.jetstream is not None:
+            return self._fetch(self.jetstream)
+        if self.spill_buffer is not None:
+            return self.spill_buffer
         return self.subscription.messages
+
+    def acknowledge(self, message: Any) -> bool:
+        """Marks a message as completely processed, i.e. by all functions including their outputs.
+
+        Parameters
+        ----------
+        message: Any
+            A message returned by the iterator of `get_message()`.
+
+        Returns
+        -------
+        ack_due: bool
+            Whether all fetched messages are processed or a batch of acks is pending.
+        """
+        config = self.jetstream
+        if config is None:
+            return False
+        if self._ack_all:
+            # acknowledging the last message acknowledges all previous ones as well
+            self._unacked = [message]
+        else:
+            self._unacked.append(message)
+        self._num_unacked += 1
+        self._num_acknowledged += 1
+        return self._num_acknowledged >= self._num_fetched or self._num_unacked >= config.batch_size
+
+    async def commit(self, asynchronous: bool = True) -> None:
+        """Sends the acks of the acknowledged messages to JetStream.
+
+        Parameters
+        ----------
+        asynchronous: bool
+            Whether to wait for JetStream to confirm the last ack.
+
+        Returns
+        -------
+        None
+        """
+        if not self._unacked:
+            return
+        *messages, last = self._unacked
+        self._unacked = []
+        self._num_unacked = 0
+        for message in messages:
+            await message.ack()
+        if asynchronous:
+            await last.ack()
+        else:
+            await last.ack_sync()
+
+    def get_pending_messages(self) -> Optional[int]:
+        """Get the number of messages buffered by the subscription that have not been received yet.
+
+        Returns
+        -------
+        pending_messages: Optional[int]
+            The number of pending messages of the subscription.
+        """
+        if self.jetstream is not None:
+            return self.pull_subscription.pending_msgs
+        if self.spill_buffer is not None:
+            return len(self.spill_buffer)
+        return self.subscription.pending_msgs
@@ -16,16 +16,66 @@
 #
 import json
 import logging
-from typing import Any, Dict
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 from nats import connect
+from nats.aio.client import DEFAULT_FLUSH_TIMEOUT
 from streampipes.functions.broker import Publisher
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class NatsPublisherConfig:
+    """Buffering and flushing of the events published to a NATS data stream.
+
+    Parameters
+    ----------
+    pending_size: Optional[int]
+        Size in bytes of the buffer of the NATS client, publishing waits for the buffer to be sent once it is full.
+        The default of the NATS client is used if not set.
+    flush_timeout: Optional[float]
+        Time in seconds to wait for the server when flushing, the default of the NATS client if not set.
+    flush_interval: Optional[float]
+        Maximal time in seconds between two flushes while events are published, no periodic flush if not set.
+    flush_size: Optional[int]
+        Maximal size in bytes of the events published between two flushes, no flush by size if not set.
+    """
+
+    pending_size: Optional[int] = None
+    flush_timeout: Optional[float] = None
+    flush_interval: Optional[float] = None
+    flush_size: Optional[int] = None
+
+
 class NatsPublisher(Publisher):
-    """Implementation of a publisher for NATS"""
+    """Implementation of a publisher for NATS
+
+    Published events are written to the buffer of the NATS client, which sends them to the server in the background.
+    A flush waits until the server has received all of them.
+    The settings can be applied to all or individual data streams by passing a
+    [NatsPublisherConfig][streampipes.functions.broker.nats.nats_publisher.NatsPublisherConfig]
+    to the [FunctionHandler][streampipes.functions.function_handler.FunctionHandler].
+
+    Attributes
+    ----------
+    pending_size: Optional[int]
+        Size in bytes of the buffer of the NATS client, publishing waits for the buffer to be sent once it is full.
+        Applied on connect, the default of the NATS client if not set.
+    flush_timeout: Optional[float]
+        Time in seconds to wait for the server when flushing, the default of the NATS client if not set.
+    flush_interval: Optional[float]
+        Maximal time in seconds between two flushes while events are published, no periodic flush if not set.
+    flush_size: Optional[int]
+        Maximal size in bytes of the events published between two flushes, no flush by size if not set.
+    """
+
+    pending_size: Optional[int] = None
+    flush_timeout: Optional[float] = None
+    flush_interval: Optional[float] = None
+    flush_size: Optional[int] = None
 
     async def _make_connection(self, hostname: str, port: int) -> None:
         """Helper function to connect to a server.
@@ -44,9 +94,43 @@ class NatsPublisher(Publisher):
         None
 
         """
-        self.nats_client = await connect([f"nats://{hostname}:{port}"])
+        self._address: Tuple[str, int] = (hostname, port)
+        self._outdated_connection = False
+        options: Dict[str, Any] = {}
+        if self.pending_size is not None:
+            options["pending_size"] = self.pending_size
+        if self.flush_timeout is not None:
+            options["flush_timeout"] = self.flush_timeout
+        self.nats_client = await connect([f"nats://{hostname}:{port}"], **options)
+        self._unflushed_size = 0
+        self._last_flush = time.monotonic()
         logger.info(f"Connecting to NATS at {hostname}:{port}")
 
+    def configure(self, config: NatsPublisherConfig) -> None:
+        """Applies the buffering and flushing settings to the publisher, which may already be connected.
+
+        If the publisher is connected and the settings of the connection change,
+        it reconnects before the next event is written.
+
+        Parameters
+        ----------
+        config: NatsPublisherConfig
+            The settings of the publisher.
+
+        Returns
+        -------
+        None
+        """
+        if hasattr(self, "nats_client") and (config.pending_size, config.flush_timeout) != (
+            self.pending_size,
+            self.flush_timeout,
+        ):
+            self._outdated_connection = True
+        self.pending_size = config.pending_size
+        self.flush_timeout = config.flush_timeout
+        self.flush_interval = config.flush_interval
+        self.flush_size = config.flush_size
+
     async def publish_event(self, event: Dict[str, Any]):
         """Publish an event to a connected data stream.
 
@@ -60,7 +144,71 @@ class NatsPublisher(Publisher):
         None
 
         """
-        await self.nats_client.publish(subject=self.topic_name, payload=json.dumps(event).encode("utf-8"))
+        await self._write(event)
+        await self._flush_if_due()
+
+    async def publish_events(self, events: List[Dict[str, Any]]) -> None:
+        """Publish a batch of events to a connected data stream.
+
+        All events are written to the buffer of the NATS client before the flush conditions are checked,
+        so a batch is flushed at most once.
+
+        Parameters
+        ----------
+        events: List[Dict[str, Any]]
+            The events to be published in order.
+
+        Returns
+        -------
+        None
+        """
+        for event in events:
+            await self._write(event)
+        await self._flush_if_due()
+
+    async def _write(self, event: Dict[str, Any]) -> None:
+        """Helper function to write an event to the buffer of the NATS client.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The event to be published.
+
+        Returns
+        -------
+        None
+        """
+        if self._outdated_connection:
+            # closing the connection sends the events that are still buffered
+            await self.nats_client.close()
+            await self._make_connection(*self._address)
+        payload = json.dumps(event).encode("utf-8")
+        await self.nats_client.publish(subject=self.topic_name, payload=payload)
+        self._unflushed_size += len(payload)
+
+    async def _flush_if_due(self) -> None:
+        """Helper function to flush once the flush size or the flush interval is reached.
+
+        Returns
+        -------
+        None
+        """
+        if (self.flush_size is not None and self._unflushed_size >= self.flush_size) or (
+            self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Waits until the server has received all published events.
+
+        Returns
+        -------
+        None
+        """
+        self._unflushed_size = 0
+        self._last_flush = time.monotonic()
+        # the timeout is passed to asyncio.wait_for, which accepts fractions of seconds
+        await self.nats_client.flush(timeout=self.flush_timeout or DEFAULT_FLUSH_TIMEOUT)  # type: ignore[arg-type]
 
     async def disconnect(self) -> None:
         """Closes the connection to the server.
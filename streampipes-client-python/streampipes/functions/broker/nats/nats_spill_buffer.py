@@ -0,0 +1,266 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import logging
+import struct
+import tempfile
+from collections import deque
+from typing import Any, Callable, Deque, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct(">I")
+
+# minimal size of the processed part of the spill file before it is compacted
+_COMPACT_BYTES = 1 << 20
+
+# size of the chunks the unread part of the spill file is moved in when it is compacted
+_COPY_CHUNK_BYTES = 1 << 16
+
+# minimal size of a payload that is written and read in a worker thread instead of the event loop
+_OFFLOAD_BYTES = 1 << 16
+
+T = TypeVar("T")
+
+
+class SpilledMessage:
+    """An internal representation of a NATS message that has been buffered by a `SpillBuffer`
+
+    Parameters
+    ----------
+    data: bytes
+        The payload of the message
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class SpillBuffer:
+    """Buffers the messages of a subscription in memory and spills them to a local file once the memory is full.
+
+    The messages are kept in order: once messages are spilled, all further messages are appended to the file
+    until it has been read completely, afterwards the file is truncated and the memory is used again.
+    While messages keep being spilled, the processed part of the file is removed once it is larger
+    than the part still to be read, so the file does not grow with the total number of spilled messages.
+    Large payloads and the compaction of the file are handled in a worker thread to keep the event loop responsive.
+
+    Parameters
+    ----------
+    max_messages: int
+        Maximal number of messages kept in memory, `0` for no limit.
+    max_bytes: int
+        Maximal size of the payloads kept in memory, `0` for no limit.
+    directory: Optional[str]
+        Directory of the spill file, the default directory for temporary files if not set.
+
+    Attributes
+    ----------
+    num_spilled: int
+        Number of messages currently stored in the spill file.
+    """
+
+    def __init__(self, max_messages: int, max_bytes: int, directory: Optional[str] = None):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._memory: Deque[bytes] = deque()
+        self._memory_size = 0
+        self._file: Any = None
+        self._read_position = 0
+        self.num_spilled = 0
+        self._ready = asyncio.Event()
+        # serializes the access to the spill file, whose operations may run in worker threads
+        self._file_lock = asyncio.Lock()
+
+    async def put(self, message: Any) -> None:
+        """Adds a received message to the buffer.
+
+        Suitable as callback of a NATS subscription.
+
+        Parameters
+        ----------
+        message: Any
+            The received message providing its payload as `data`.
+
+        Returns
+        -------
+        None
+        """
+        data = message.data
+        if self.num_spilled == 0 and not self._memory_full(len(data)):
+            self._memory.append(data)
+            self._memory_size += len(data)
+        else:
+            await self._spill(data)
+        self._ready.set()
+
+    def _memory_full(self, size: int) -> bool:
+        """Helper function to check whether a payload of the given size still fits into the memory.
+
+        Parameters
+        ----------
+        size: int
+            The size of the payload.
+
+        Returns
+        -------
+        full: bool
+            Whether the payload needs to be spilled.
+        """
+        return (0 < self.max_messages <= len(self._memory)) or (0 < self.max_bytes < self._memory_size + size)
+
+    async def _run_file_operation(self, size: int, operation: Callable[..., T], *args: Any) -> T:
+        """Helper function to run an operation on the spill file, in a worker thread if it handles much data.
+
+        Parameters
+        ----------
+        size: int
+            The number of bytes handled by the operation.
+        operation: Callable[..., T]
+            The operation.
+        args: Any
+            The arguments of the operation.
+
+        Returns
+        -------
+        result: T
+            The result of the operation.
+        """
+        if size < _OFFLOAD_BYTES:
+            return operation(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, operation, *args)
+
+    async def _spill(self, data: bytes) -> None:
+        """Helper function to append a payload to the spill file.
+
+        Parameters
+        ----------
+        data: bytes
+            The payload of the message.
+
+        Returns
+        -------
+        None
+        """
+        async with self._file_lock:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(prefix="streampipes-spill-", dir=self.directory)
+            if self.num_spilled == 0:
+                directory = self.directory or tempfile.gettempdir()
+                logger.warning(f"The subscription buffer is full, spilling messages to a file in {directory}")
+            await self._run_file_operation(len(data), self._write, data)
+            self.num_spilled += 1
+
+    def _write(self, data: bytes) -> None:
+        """Helper function to write a payload at the end of the spill file.
+
+        Parameters
+        ----------
+        data: bytes
+            The payload of the message.
+
+        Returns
+        -------
+        None
+        """
+        self._file.seek(0, 2)
+        self._file.write(_LENGTH.pack(len(data)))
+        self._file.write(data)
+
+    async def _unspill(self) -> bytes:
+        """Helper function to read the next payload from the spill file.
+
+        Returns
+        -------
+        data: bytes
+            The payload of the message.
+        """
+        async with self._file_lock:
+            self._file.seek(self._read_position)
+            (size,) = _LENGTH.unpack(self._file.read(_LENGTH.size))
+            data = await self._run_file_operation(size, self._file.read, size)
+            self._read_position += _LENGTH.size + size
+            self.num_spilled -= 1
+            if self.num_spilled == 0:
+                self._file.seek(0)
+                self._file.truncate()
+                self._read_position = 0
+                logger.info("The spilled messages have been processed")
+            else:
+                end = self._file.seek(0, 2)
+                # the processed part is removed once it is larger than the remaining part,
+                # which keeps the copying linear in the number of spilled messages
+                if self._read_position >= _COMPACT_BYTES and self._read_position >= end - self._read_position:
+                    await asyncio.get_running_loop().run_in_executor(None, self._compact)
+            return data
+
+    def _compact(self) -> None:
+        """Helper function to move the unread part of the spill file to its start in chunks.
+
+        The processed part is at least as large as a chunk, so a chunk is read before its target is overwritten.
+
+        Returns
+        -------
+        None
+        """
+        source, target = self._read_position, 0
+        while True:
+            self._file.seek(source)
+            chunk = self._file.read(_COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            self._file.seek(target)
+            self._file.write(chunk)
+            source += len(chunk)
+            target += len(chunk)
+        self._file.truncate(target)
+        self._read_position = 0
+
+    def __len__(self) -> int:
+        return len(self._memory) + self.num_spilled
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> SpilledMessage:
+        while not self._memory and self.num_spilled == 0:
+            self._ready.clear()
+            await self._ready.wait()
+        if self._memory:
+            data = self._memory.popleft()
+            self._memory_size -= len(data)
+        else:
+            data = await self._unspill()
+        return SpilledMessage(data)
+
+    def close(self) -> None:
+        """Removes the spill file.
+
+        Returns
+        -------
+        None
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._memory.clear()
+        self._memory_size = 0
+        self.num_spilled = 0
+        self._read_position = 0
@@ -15,9 +15,11 @@
 # limitations under the License.
 #
 import asyncio
-from typing import Any, Coroutine, Dict
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set
 
 from streampipes.functions.broker import Publisher, get_broker
+from streampipes.functions.utils.function_metrics import FunctionMetrics
 from streampipes.model.resource.data_stream import DataStream
 
 
@@ -25,6 +27,10 @@ class OutputCollector:
     """Collector for output events. The events are published to an output data stream.
     Therefore, the output collector establishes a connection to the broker.
 
+    Within a running event loop, the events collected until the loop gets back to publishing
+    are handed to the publisher as one batch instead of scheduling a task per event.
+    Only one batch is published at a time, the next batch collects events until the previous one is done.
+
     Parameters
     ----------
     data_stream: DataStream
@@ -34,12 +40,39 @@ class OutputCollector:
     ----------
     publisher: Publisher
         The publisher instance that sends the data to StreamPipes
+    pending: int
+        Number of events waiting to be published, only tracked if metrics are enabled
 
     """
 
     def __init__(self, data_stream: DataStream) -> None:
         self.publisher: Publisher = get_broker(data_stream, is_publisher=True)  # type: ignore
         self._run_coroutine(self.publisher.connect(data_stream))
+        self.pending = 0
+        self._metrics: Optional[FunctionMetrics] = None
+        self._metric_labels = ("", data_stream.element_id)
+        self._publish_tasks: Set[asyncio.Task] = set()
+        self._batch: List[Dict[str, Any]] = []
+        self._last_publish_task: Optional[asyncio.Task] = None
+        # the first error of a publish task, which is raised on the next flush
+        self._publish_error: Optional[BaseException] = None
+
+    def enable_metrics(self, metrics: FunctionMetrics, function_id: str) -> None:
+        """Records the metrics of the published events.
+
+        Parameters
+        ----------
+        metrics: FunctionMetrics
+            The metrics to be updated.
+        function_id: str
+            The id of the function the output data stream belongs to.
+
+        Returns
+        -------
+        None
+        """
+        self._metrics = metrics
+        self._metric_labels = (function_id, self._metric_labels[1])
 
     def collect(self, event: Dict[str, Any]) -> None:
         """Publishes an event to the output stream.
@@ -53,7 +86,107 @@ class OutputCollector:
         -------
         None
         """
-        self._run_coroutine(self.publisher.publish_event(event))
+        if self._metrics is not None:
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._publish_batch([event]))
+            return
+        self._batch.append(event)
+        # the first event of a batch schedules its publishing, further events join it until it starts
+        if len(self._batch) == 1:
+            task = loop.create_task(self._publish_batch(previous=self._last_publish_task))
+            self._last_publish_task = task
+            self._publish_tasks.add(task)
+            task.add_done_callback(self._on_published)
+
+    def _on_published(self, task: asyncio.Task) -> None:
+        """Helper function called once a publish task is done, which keeps its error for the next flush.
+
+        Parameters
+        ----------
+        task: asyncio.Task
+            The finished publish task.
+
+        Returns
+        -------
+        None
+        """
+        self._publish_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None and self._publish_error is None:
+            self._publish_error = task.exception()
+
+    async def _publish_batch(
+        self, events: Optional[List[Dict[str, Any]]] = None, previous: Optional[asyncio.Task] = None
+    ) -> None:
+        """Helper function to publish the collected events as one batch.
+
+        Parameters
+        ----------
+        events: Optional[List[Dict[str, Any]]]
+            The events to be published, the events collected since the batch was scheduled if not provided.
+        previous: Optional[asyncio.Task]
+            The task publishing the previous batch, which has to be done before this batch is published.
+
+        Returns
+        -------
+        None
+        """
+        if previous is not None:
+            # an error of the previous batch is raised by its own task on flush
+            await asyncio.wait([previous])
+        if events is None:
+            events, self._batch = self._batch, []
+        if self._metrics is None:
+            await self.publisher.publish_events(events)
+        else:
+            await self._publish_with_metrics(self._metrics, events)
+
+    async def flush(self) -> None:
+        """Waits until all collected events have been published.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        Exception
+            The first exception of an event that could not be published since the last flush.
+        """
+        if self._publish_tasks:
+            # the errors are kept by the done callbacks of the tasks, which run before gather returns
+            await asyncio.gather(*self._publish_tasks, return_exceptions=True)
+        error, self._publish_error = self._publish_error, None
+        if error is not None:
+            raise error
+        await self.publisher.flush()
+
+    async def _publish_with_metrics(self, metrics: FunctionMetrics, events: List[Dict[str, Any]]) -> None:
+        """Helper function to publish a batch of events and record their publish latency.
+
+        Parameters
+        ----------
+        metrics: FunctionMetrics
+            The metrics to be updated.
+        events: List[Dict[str, Any]]
+            The events to be published.
+
+        Returns
+        -------
+        None
+        """
+        start = time.perf_counter()
+        try:
+            await self.publisher.publish_events(events)
+        finally:
+            self.pending -= len(events)
+        # the latency of the batch is shared by its events
+        latency = (time.perf_counter() - start) / len(events)
+        for _ in events:
+            metrics.observe("streampipes_function_publish_seconds", self._metric_labels, latency)
+        metrics.inc("streampipes_function_events_out_total", self._metric_labels, len(events))
 
     def disconnect(self) -> None:
         """Disconnects the broker of the output collector.
@@ -79,3 +212,95 @@ class OutputCollector:
             asyncio.run(coroutine)
         else:
             loop.create_task(coroutine)
+
+
+class InProcessOutputCollector(OutputCollector):
+    """Collector for output events that are consumed by functions running in the same process.
+
+    The events are passed directly to the consuming functions without any serialization or broker round-trip.
+    Optionally, the events are additionally published to the output data stream by the given output collector.
+
+    Parameters
+    ----------
+    stream_id: str
+        The id of the output data stream.
+    consumers: List[Callable[[Dict[str, Any], str], None]]
+        The `onEvent` methods of the functions consuming the output data stream.
+    output_collector: Optional[OutputCollector]
+        The output collector publishing the events to the broker, if they should be published as well.
+    """
+
+    def __init__(
+        self,
+        stream_id: str,
+        consumers: List[Callable[[Dict[str, Any], str], None]],
+        output_collector: Optional[OutputCollector] = None,
+    ) -> None:
+        self.stream_id = stream_id
+        self.consumers = consumers
+        self.output_collector = output_collector
+        self.pending = 0
+        self._metrics: Optional[FunctionMetrics] = None
+        self._metric_labels = ("", stream_id)
+
+    def enable_metrics(self, metrics: FunctionMetrics, function_id: str) -> None:
+        """Records the metrics of the passed events.
+
+        Parameters
+        ----------
+        metrics: FunctionMetrics
+            The metrics to be updated.
+        function_id: str
+            The id of the function the output data stream belongs to.
+
+        Returns
+        -------
+        None
+        """
+        self._metrics = metrics
+        self._metric_labels = (function_id, self.stream_id)
+        if self.output_collector is not None:
+            self.output_collector.enable_metrics(metrics, function_id)
+
+    def collect(self, event: Dict[str, Any]) -> None:
+        """Passes an event to the consuming functions and publishes it if required.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The event to be passed.
+
+        Returns
+        -------
+        None
+        """
+        if self.output_collector is not None:
+            self.output_collector.collect(event)
+        elif self._metrics is not None:
+            self._metrics.inc("streampipes_function_events_out_total", self._metric_labels)
+
+        # every consumer receives its own event as functions are allowed to modify them
+        # only the last consumer can receive the original one, unless the event is still to be published
+        last = len(self.consumers) - 1 if self.output_collector is None else -1
+        for i, consumer in enumerate(self.consumers):
+            consumer(event if i == last else dict(event), self.stream_id)
+
+    async def flush(self) -> None:
+        """Waits until all collected events have been published, if the events are published.
+
+        Returns
+        -------
+        None
+        """
+        if self.output_collector is not None:
+            await self.output_collector.flush()
+
+    def disconnect(self) -> None:
+        """Disconnects the broker of the output collector, if the events are published.
+
+        Returns
+        -------
+        None
+        """
+        if self.output_collector is not None:
+            self.output_collector.disconnect()
@@ -15,7 +15,7 @@
 # limitations under the License.
 #
 from abc import abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from streampipes.functions.broker import Broker
 
@@ -40,3 +40,26 @@ class Publisher(Broker):
         None
         """
         raise NotImplementedError  # pragma: no cover
+
+    async def publish_events(self, events: List[Dict[str, Any]]) -> None:
+        """Publish a batch of events to a connected data stream.
+
+        Parameters
+        ----------
+        events: List[Dict[str, Any]]
+            The events to be published in order.
+
+        Returns
+        -------
+        None
+        """
+        for event in events:
+            await self.publish_event(event)
+
+    async def flush(self) -> None:
+        """Waits until all published events have been delivered to the broker.
+
+        Returns
+        -------
+        None
+        """
@@ -15,16 +15,50 @@
 # limitations under the License.
 #
 import asyncio
-import json
+import functools
+import itertools
 import logging
-from typing import AsyncIterator, Dict, List
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
+from requests.exceptions import RequestException
 from streampipes.client.client import StreamPipesClient
-from streampipes.functions.broker import Broker, Consumer, get_broker
+from streampipes.functions.broker import (
+    Broker,
+    Consumer,
+    InMemoryConsumer,
+    InMemoryPublisher,
+    KafkaConsumer,
+    KafkaPublisher,
+    NatsConsumer,
+    NatsPublisher,
+    SupportedBroker,
+    get_broker,
+)
+from streampipes.functions.broker.in_memory.in_memory_hub import InMemoryHub
+from streampipes.functions.broker.kafka.kafka_consumer import AtLeastOnceConfig
+from streampipes.functions.broker.kafka.kafka_profile import KafkaProfile
+from streampipes.functions.broker.nats.nats_consumer import (
+    JetStreamConfig,
+    SubscriptionLimits,
+)
+from streampipes.functions.broker.nats.nats_publisher import NatsPublisherConfig
+from streampipes.functions.broker.output_collector import InProcessOutputCollector
 from streampipes.functions.registration import Registration
+from streampipes.functions.streampipes_function import StreamPipesFunction
 from streampipes.functions.utils.async_iter_handler import AsyncIterHandler
+from streampipes.functions.utils.backfill import (
+    ReplayBoundary,
+    fetch_historic_events,
+    merge_events,
+)
 from streampipes.functions.utils.data_stream_context import DataStreamContext
+from streampipes.functions.utils.event_decoder import EventDecoder, EventFormat
+from streampipes.functions.utils.field_projection import FieldProjection
 from streampipes.functions.utils.function_context import FunctionContext
+from streampipes.functions.utils.function_metrics import FunctionMetrics, Sample
+from streampipes.functions.utils.function_profiler import FunctionProfiler
+from streampipes.functions.utils.latency_tracer import LatencyTracer
 from streampipes.model.resource.data_stream import DataStream
 
 logger = logging.getLogger(__name__)
@@ -35,6 +69,7 @@ class FunctionHandler:
 
     It controls the connection to the brokers, starts the functions, manages the broadcast of the live data
     and is able to stop the connection to the brokers and functions.
+    The functions are registered at the StreamPipes backend while they are running.
 
     Parameters
     ----------
@@ -42,6 +77,53 @@ class FunctionHandler:
         The registration, that contains the StreamPipesFunctions.
     client: StreamPipesClient
         The client to interact with the API.
+    fuse_functions: bool
+        If an output data stream of a function is required by another registered function,
+        the events are passed to it directly within the process instead of taking the route through the broker.
+    publish_fused_streams: bool
+        Defines whether events of output data streams that are consumed in-process
+        are published to the broker as well, e.g., to be consumed by pipelines.
+        Only disable it if no pipeline or data lake sink consumes these data streams,
+        since their subscribers cannot be detected.
+    metrics: Optional[FunctionMetrics]
+        Metrics to be recorded while the functions are running, e.g., to be served to Prometheus
+        via `metrics.start_server()`. No metrics are recorded if not provided.
+    tracer: Optional[LatencyTracer]
+        Traces the latency of the events from their timestamp through the functions. No tracing if not provided.
+    profiler: Optional[FunctionProfiler]
+        Profiles the processing of sampled events. If not provided, a profiler is created
+        if the environment variable `FUNCTION-PROFILING` is set. Profiling can be toggled via the signal `SIGUSR1`.
+    at_least_once: Optional[AtLeastOnceConfig]
+        Processes the messages of Kafka data streams at least once. Their offsets are committed in batches
+        after the messages have been processed by all functions and the output events have been published.
+        Otherwise, the offsets are committed automatically in the background.
+    kafka_profile: Optional[KafkaProfile]
+        Tuning profile of the consumers and publishers of all Kafka data streams,
+        e.g. `KafkaProfile.high_throughput()`. The profile selected by the environment variable `KAFKA-PROFILE`
+        is used if not provided.
+    stream_kafka_profiles: Optional[Dict[str, KafkaProfile]]
+        Tuning profiles of individual Kafka data streams by stream id, which take precedence over `kafka_profile`.
+    jetstream: Optional[JetStreamConfig]
+        Consumes NATS data streams via JetStream pull consumers, which are acknowledged in batches
+        after the messages have been processed by all functions and the output events have been published.
+        Otherwise, core NATS subscriptions are used, which drop messages while a function falls behind.
+    nats_limits: Optional[SubscriptionLimits]
+        Limits of the pending messages of the core NATS subscriptions and the handling of messages exceeding them,
+        e.g. spilling them to disk. The defaults of the NATS client are used if not provided.
+    stream_nats_limits: Optional[Dict[str, SubscriptionLimits]]
+        Limits of individual NATS data streams by stream id, which take precedence over `nats_limits`.
+    nats_publisher_config: Optional[NatsPublisherConfig]
+        Buffering and flushing of the publishers of all NATS output data streams.
+        The class attributes of `NatsPublisher` are used if not provided.
+    stream_nats_publisher_configs: Optional[Dict[str, NatsPublisherConfig]]
+        Buffering and flushing of individual NATS output data streams by stream id,
+        which take precedence over `nats_publisher_config`.
+    in_memory_hub: Optional[InMemoryHub]
+        Hub exchanging the events of the in-memory data streams. A new hub is created if not provided.
+    in_memory_streams: Optional[List[DataStream]]
+        In-memory data streams that are fed from outside the registered functions, e.g. by publishing events
+        to `in_memory_hub`. In-memory output streams of the registered functions are known without listing them.
+        In-memory data streams only exist within the process and are neither created nor looked up in StreamPipes.
 
     Attributes
     ----------
@@ -49,13 +131,58 @@ class FunctionHandler:
         Map of all data stream contexts
     brokers: List[Broker]
         List of all registered brokers
+    fused_streams: Dict[str, DataStream]
+        Map of all output data streams that are consumed in-process
+    local_streams: Dict[str, DataStream]
+        Map of all in-memory data streams, which are unknown to the StreamPipes backend
     """
 
-    def __init__(self, registration: Registration, client: StreamPipesClient) -> None:
+    def __init__(
+        self,
+        registration: Registration,
+        client: StreamPipesClient,
+        fuse_functions: bool = True,
+        publish_fused_streams: bool = True,
+        metrics: Optional[FunctionMetrics] = None,
+        tracer: Optional[LatencyTracer] = None,
+        profiler: Optional[FunctionProfiler] = None,
+        at_least_once: Optional[AtLeastOnceConfig] = None,
+        kafka_profile: Optional[KafkaProfile] = None,
+        stream_kafka_profiles: Optional[Dict[str, KafkaProfile]] = None,
+        jetstream: Optional[JetStreamConfig] = None,
+        nats_limits: Optional[SubscriptionLimits] = None,
+        stream_nats_limits: Optional[Dict[str, SubscriptionLimits]] = None,
+        nats_publisher_config: Optional[NatsPublisherConfig] = None,
+        stream_nats_publisher_configs: Optional[Dict[str, NatsPublisherConfig]] = None,
+        in_memory_hub: Optional[InMemoryHub] = None,
+        in_memory_streams: Optional[List[DataStream]] = None,
+    ) -> None:
         self.registration = registration
         self.client = client
+        self.fuse_functions = fuse_functions
+        self.publish_fused_streams = publish_fused_streams
+        self.metrics = metrics
+        self.tracer = tracer
+        self.profiler = profiler or FunctionProfiler.from_env()
+        self.at_least_once = at_least_once
+        self.kafka_profile = kafka_profile
+        self.stream_kafka_profiles = stream_kafka_profiles or {}
+        self.jetstream = jetstream
+        self.nats_limits = nats_limits
+        self.stream_nats_limits = stream_nats_limits or {}
+        self.nats_publisher_config = nats_publisher_config
+        self.stream_nats_publisher_configs = stream_nats_publisher_configs or {}
+        self.in_memory_hub = in_memory_hub or InMemoryHub()
+        self.local_streams: Dict[str, DataStream] = {
+            data_stream.element_id: data_stream for data_stream in in_memory_streams or []
+        }
         self.stream_contexts: Dict[str, DataStreamContext] = {}
         self.brokers: List[Broker] = []
+        self.fused_streams: Dict[str, DataStream] = {}
+        # decoders of the functions that require typed events per function id and stream id
+        self._decoders: Dict[Tuple[str, str], EventDecoder] = {}
+        # the most recent replayed events per function id and stream id
+        self._replay_boundaries: Dict[Tuple[str, str], ReplayBoundary] = {}
 
     def initializeFunctions(self) -> None:
         """Creates the context for every data stream and starts the event loop to manage the StreamPipes Functions.
@@ -64,9 +191,17 @@ class FunctionHandler:
         -------
         None
         """
+        self._collect_local_streams()
+        if self.fuse_functions:
+            self._fuse_functions()
+        self._configure_publishers()
+
         for streampipes_function in self.registration.getFunctions():
             # Create the output data streams for every function
             for stream_id, output_stream in streampipes_function.function_definition.get_output_data_streams().items():
+                # In-memory data streams only exist within this process
+                if stream_id in self.local_streams:
+                    continue
                 self.client.dataStreamApi.post(output_stream)
                 logger.info(
                     f'Create output data stream "{stream_id}" '
@@ -74,8 +209,14 @@ class FunctionHandler:
                 )
             # Choose the broker and collect the schema for every data stream
             for stream_id in streampipes_function.requiredStreamIds():
-                # Get the data stream schema from the API
-                data_stream: DataStream = self.client.dataStreamApi.get(stream_id)  # type: ignore
+                # Output streams of other functions might be consumed in-process
+                if stream_id in self.fused_streams:
+                    continue
+                if stream_id in self.local_streams:
+                    data_stream = self.local_streams[stream_id]
+                else:
+                    # Get the data stream schema from the API
+                    data_stream = self.client.dataStreamApi.get(stream_id)  # type: ignore
                 # Get the broker
                 broker: Consumer = get_broker(data_stream)  # type: ignore
                 # Assign the functions, broker and schema to every stream
@@ -86,6 +227,20 @@ class FunctionHandler:
                         functions=[streampipes_function], schema=data_stream, broker=broker
                     )
                 logger.info(f"Using {broker.__class__.__name__} for {streampipes_function.__class__.__name__}")
+        self._push_down_projections()
+        self._configure_consumers()
+
+        if self.metrics is not None:
+            self._enable_metrics(self.metrics)
+        if self.tracer is not None:
+            for streampipes_function in self.registration.getFunctions():
+                streampipes_function._tracer = self.tracer
+        if self.profiler is not None:
+            self.profiler.install_signal_handler()
+            if self.metrics is not None:
+                self.metrics.add_page("/profile", self.profiler.cached_summary)
+
+        self._register_functions()
 
         # Start the function loop or add it as tasks if a loop is already running
         try:
@@ -115,30 +270,553 @@ class FunctionHandler:
             messages[stream_id] = broker.get_message()
             # Generate the function context
             for streampipes_function in self.stream_contexts[stream_id].functions:
-                function_id = streampipes_function.getFunctionId().id
-                if function_id in contexts.keys():
-                    contexts[function_id].add_data_stream_schema(stream_id, data_stream)
-                else:
-                    contexts[function_id] = FunctionContext(
-                        function_id,
-                        schema={stream_id: data_stream},
-                        client=self.client,
-                        streams=streampipes_function.requiredStreamIds(),
-                    )
+                self._add_to_context(contexts, streampipes_function, stream_id, data_stream)
+        # Add the schema of the output data streams that are consumed in-process
+        for streampipes_function in self.registration.getFunctions():
+            for stream_id in streampipes_function.requiredStreamIds():
+                if stream_id in self.fused_streams:
+                    self._add_to_context(contexts, streampipes_function, stream_id, self.fused_streams[stream_id])
+        self._compile_decoders(contexts)
         # Start the functions
         for streampipes_function in self.registration.getFunctions():
             streampipes_function.onServiceStarted(contexts[streampipes_function.getFunctionId().id])
 
+        # Replay the historic data while the brokers keep buffering the live messages in the background
+        replay_boundaries = self._replay_boundaries = await self._replay_historic_data()
+
         # Get the messages continuously and send them to the functions
-        async for stream_id, msg in AsyncIterHandler.combine_async_messages(messages):
-            if stream_id == "stop":
-                break
-            for streampipes_function in self.stream_contexts[stream_id].functions:
-                streampipes_function.onEvent(json.loads(msg.data.decode()), stream_id)
+        combined_messages = AsyncIterHandler.combine_async_messages(messages)
+        metrics = self.metrics
+        tracer = self.tracer
+        profiler = self.profiler
+        decoders = self._decoders
+        timed = metrics is not None or tracer is not None
+        try:
+            async for stream_id, msg in combined_messages:
+                if stream_id == "stop":
+                    break
+                if tracer is not None:
+                    receive_time = time.time()
+                    # the input is traced once per message and the trace is shared by the functions
+                    trace = None
+                broker = self.stream_contexts[stream_id].broker
+                for streampipes_function in self.stream_contexts[stream_id].functions:
+                    if profiler is not None:
+                        sampled = profiler.start(streampipes_function.getFunctionId().id)
+                    if timed:
+                        start = time.perf_counter()
+                    event = broker.decode_message(msg)
+                    if timed:
+                        decoded = time.perf_counter()
+                        if metrics is not None:
+                            metrics.observe("streampipes_function_decode_seconds", (stream_id,), decoded - start)
+                    if replay_boundaries:
+                        key = (streampipes_function.getFunctionId().id, stream_id)
+                        boundary = replay_boundaries.get(key)
+                        if boundary is not None:
+                            if boundary.is_duplicate(event):
+                                if profiler is not None and sampled:
+                                    profiler.stop(streampipes_function.getFunctionId().id)
+                                continue
+                            if boundary.is_passed(event):
+                                del replay_boundaries[key]
+                    if tracer is not None:
+                        if trace is None:
+                            trace = tracer.trace_input(stream_id, event, receive_time, decoded - start)
+                        streampipes_function._trace = trace
+                    if decoders:
+                        decoder = decoders.get((streampipes_function.getFunctionId().id, stream_id))
+                        if decoder is not None:
+                            event = decoder.decode(event)
+                    streampipes_function.onEvent(event, stream_id)
+                    if tracer is not None and trace is not None:
+                        streampipes_function._trace = None
+                        tracer.trace_exit(streampipes_function.getFunctionId().id, trace)
+                    if metrics is not None:
+                        labels = (streampipes_function.getFunctionId().id, stream_id)
+                        metrics.observe("streampipes_function_on_event_seconds", labels, time.perf_counter() - decoded)
+                        metrics.inc("streampipes_function_events_in_total", labels)
+                    if profiler is not None and sampled:
+                        profiler.stop(streampipes_function.getFunctionId().id)
+                if broker.acknowledge(msg):
+                    await self._commit(broker)
+        finally:
+            # Stop the readers of the data streams
+            await combined_messages.aclose()
+
+        # Commit the messages processed since the last commit
+        if self.at_least_once is not None or self.jetstream is not None:
+            for stream_context in self.stream_contexts.values():
+                await self._commit(stream_context.broker, asynchronous=False)
 
         # Stop the functions
         self._stop_functions()
 
+    def _push_down_projections(self) -> None:
+        """Configures the brokers to decode only the properties required by the functions of their data streams.
+
+        A projection is only applied if all functions of a data stream declare their required fields.
+
+        Returns
+        -------
+        None
+        """
+        for stream_id, stream_context in self.stream_contexts.items():
+            fields = {"timestamp"}
+            if self.tracer is not None:
+                fields.add(self.tracer.timestamp_field)
+            for streampipes_function in stream_context.functions:
+                required_fields = streampipes_function.requiredFields(stream_id)
+                if required_fields is None:
+                    break
+                fields.update(required_fields)
+                backfill_config = streampipes_function.backfill_configs.get(stream_id)
+                if backfill_config is not None:
+                    fields.add(backfill_config.timestamp_field)
+            else:
+                stream_context.broker.projection = FieldProjection(fields, stream_context.schema.event_schema)
+                logger.info(f"Decoding only the properties {sorted(fields)} of the stream {stream_id}")
+
+    def _configure_consumers(self) -> None:
+        """Configures the consumer groups and the delivery guarantees of the brokers.
+
+        The partition assignments of Kafka data streams are forwarded to the functions.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the functions of a data stream require different consumer groups.
+        """
+        for stream_id, stream_context in self.stream_contexts.items():
+            functions = stream_context.functions
+            consumer_groups = {streampipes_function.consumerGroup(stream_id) for streampipes_function in functions}
+            if len(consumer_groups) > 1:
+                raise ValueError(
+                    f"The functions consuming the stream {stream_id} require different consumer groups: "
+                    f"{consumer_groups}"
+                )
+            broker = stream_context.broker
+            broker.consumer_group = consumer_groups.pop()
+            if broker.consumer_group is not None:
+                logger.info(f'Consuming the stream {stream_id} in the consumer group "{broker.consumer_group}"')
+            if isinstance(broker, KafkaConsumer):
+                broker.on_assign = functools.partial(self._notify_partitions, functions, stream_id, True)
+                broker.on_revoke = functools.partial(self._notify_partitions, functions, stream_id, False)
+                broker.at_least_once = self.at_least_once
+                broker.profile = self.stream_kafka_profiles.get(stream_id, self.kafka_profile)
+            elif isinstance(broker, NatsConsumer):
+                broker.jetstream = self.jetstream
+                broker.limits = self.stream_nats_limits.get(stream_id, self.nats_limits)
+            elif isinstance(broker, InMemoryConsumer):
+                broker.hub = self.in_memory_hub
+
+    def _configure_publishers(self) -> None:
+        """Applies the Kafka tuning profiles, the NATS publisher settings and the in-memory hub
+        to the publishers of the output data streams.
+
+        Returns
+        -------
+        None
+        """
+        for streampipes_function in self.registration.getFunctions():
+            for stream_id, output_collector in streampipes_function.output_collectors.items():
+                if isinstance(output_collector, InProcessOutputCollector):
+                    if output_collector.output_collector is None:
+                        continue
+                    output_collector = output_collector.output_collector
+                publisher = output_collector.publisher
+                profile = self.stream_kafka_profiles.get(stream_id, self.kafka_profile)
+                if isinstance(publisher, KafkaPublisher) and profile is not None:
+                    publisher.configure(profile)
+                elif isinstance(publisher, NatsPublisher):
+                    config = self.stream_nats_publisher_configs.get(stream_id, self.nats_publisher_config)
+                    if config is not None:
+                        publisher.configure(config)
+                elif isinstance(publisher, InMemoryPublisher):
+                    publisher.hub = self.in_memory_hub
+
+    def _collect_local_streams(self) -> None:
+        """Adds the in-memory output data streams of the registered functions to the local data streams.
+
+        Returns
+        -------
+        None
+        """
+        for streampipes_function in self.registration.getFunctions():
+            for stream_id, output_stream in streampipes_function.function_definition.get_output_data_streams().items():
+                broker_name = output_stream.event_grounding.transport_protocols[0].class_name
+                if SupportedBroker.IN_MEMORY.value in broker_name:
+                    self.local_streams[stream_id] = output_stream
+
+    async def _commit(self, broker: Consumer, asynchronous: bool = True) -> None:
+        """Helper function to commit the processed messages of a broker once all output events are published.
+
+        Parameters
+        ----------
+        broker: Consumer
+            The broker whose acknowledged messages are committed.
+        asynchronous: bool
+            Whether to wait for the broker to confirm the commit.
+
+        Returns
+        -------
+        None
+        """
+        for streampipes_function in self.registration.getFunctions():
+            for output_collector in streampipes_function.output_collectors.values():
+                await output_collector.flush()
+        await broker.commit(asynchronous)
+
+    @staticmethod
+    def _notify_partitions(
+        functions: List[StreamPipesFunction], stream_id: str, assigned: bool, partitions: List[int]
+    ) -> None:
+        """Helper function to notify the functions of a data stream about assigned or revoked partitions.
+
+        Parameters
+        ----------
+        functions: List[StreamPipesFunction]
+            The functions consuming the data stream.
+        stream_id: str
+            The id of the data stream.
+        assigned: bool
+            Whether the partitions are assigned or revoked.
+        partitions: List[int]
+            The partitions.
+
+        Returns
+        -------
+        None
+        """
+        for streampipes_function in functions:
+            if assigned:
+                streampipes_function.onPartitionsAssigned(stream_id, partitions)
+            else:
+                streampipes_function.onPartitionsRevoked(stream_id, partitions)
+
+    def _add_to_context(
+        self,
+        contexts: Dict[str, FunctionContext],
+        streampipes_function: StreamPipesFunction,
+        stream_id: str,
+        data_stream: DataStream,
+    ) -> None:
+        """Helper function to add the schema of a data stream to the context of a function.
+
+        Parameters
+        ----------
+        contexts: Dict[str, FunctionContext]
+            The function contexts per function id.
+        streampipes_function: StreamPipesFunction
+            The function requiring the data stream.
+        stream_id: str
+            The id of the data stream.
+        data_stream: DataStream
+            The schema of the data stream.
+
+        Returns
+        -------
+        None
+        """
+        function_id = streampipes_function.getFunctionId().id
+        if function_id in contexts.keys():
+            contexts[function_id].add_data_stream_schema(stream_id, data_stream)
+        else:
+            contexts[function_id] = FunctionContext(
+                function_id,
+                schema={stream_id: data_stream},
+                client=self.client,
+                streams=streampipes_function.requiredStreamIds(),
+            )
+
+    def _register_functions(self) -> None:
+        """Registers the functions at the StreamPipes backend, so that they are listed next to the Java functions.
+
+        A failed registration does not prevent the functions from running.
+
+        Returns
+        -------
+        None
+        """
+        function_definitions = []
+        for streampipes_function in self.registration.getFunctions():
+            # The backend does not know the in-memory data streams
+            streampipes_function.function_definition.consumed_streams = [
+                stream_id
+                for stream_id in streampipes_function.requiredStreamIds()
+                if stream_id not in self.local_streams
+            ]
+            function_definitions.append(streampipes_function.function_definition)
+        try:
+            self.client.functionApi.register(function_definitions)
+        except RequestException as err:
+            logger.warning(f"The functions could not be registered at the StreamPipes backend: {err}")
+        else:
+            logger.info(f"Registered {len(function_definitions)} function(s) at the StreamPipes backend")
+
+    def _deregister_functions(self) -> None:
+        """Deregisters the functions from the StreamPipes backend.
+
+        Returns
+        -------
+        None
+        """
+        for streampipes_function in self.registration.getFunctions():
+            function_id = streampipes_function.getFunctionId().id
+            try:
+                self.client.functionApi.deregister(function_id)
+            except RequestException as err:
+                logger.warning(f'The function "{function_id}" could not be deregistered: {err}')
+
+    def _enable_metrics(self, metrics: FunctionMetrics) -> None:
+        """Enables the metrics of the output collectors and brokers and adds the collectors for the queue depths.
+
+        Parameters
+        ----------
+        metrics: FunctionMetrics
+            The metrics to be recorded.
+
+        Returns
+        -------
+        None
+        """
+        functions = self.registration.getFunctions()
+        for streampipes_function in functions:
+            for output_collector in streampipes_function.output_collectors.values():
+                output_collector.enable_metrics(metrics, streampipes_function.getFunctionId().id)
+        for stream_id, stream_context in self.stream_contexts.items():
+            broker = stream_context.broker
+            if isinstance(broker, NatsConsumer):
+                labels = (stream_id, broker.__class__.__name__)
+                broker.on_slow_consumer = functools.partial(
+                    metrics.inc, "streampipes_broker_dropped_messages_total", labels
+                )
+
+        def collect() -> Iterator[Sample]:
+            """Collects the queue depths of the output collectors and the pending messages of the brokers.
+
+            Yields
+            ------
+            sample: Sample
+                The metric name, the label values and the current value.
+            """
+            for streampipes_function in functions:
+                function_id = streampipes_function.getFunctionId().id
+                for stream_id, output_collector in streampipes_function.output_collectors.items():
+                    labels = (function_id, stream_id)
+                    yield "streampipes_function_outbound_queue_depth", labels, output_collector.pending
+            for stream_id, stream_context in self.stream_contexts.items():
+                pending_messages = stream_context.broker.get_pending_messages()
+                if pending_messages is not None:
+                    labels = (stream_id, stream_context.broker.__class__.__name__)
+                    yield "streampipes_broker_pending_messages", labels, pending_messages
+
+        metrics.add_collector(collect)
+
+    def _fuse_functions(self) -> None:
+        """Wires functions in-process that consume an output data stream of another registered function.
+
+        The output collector of the producing function is replaced by an in-process output collector,
+        which passes the events directly to the consuming functions.
+        Unless `publish_fused_streams` is set, the events are no longer published to the broker.
+        Data streams within a cycle of functions, e.g. a function consuming its own output,
+        are kept on the broker, since passing their events in-process would recurse without bound.
+
+        Returns
+        -------
+        None
+        """
+        functions = self.registration.getFunctions()
+        for producer in functions:
+            for stream_id, output_stream in producer.function_definition.get_output_data_streams().items():
+                consumers = [f for f in functions if stream_id in f.requiredStreamIds()]
+                if not consumers:
+                    continue
+                if any(self._reaches(consumer, producer) for consumer in consumers):
+                    logger.info(
+                        f'Output data stream "{stream_id}" of the function "{producer.getFunctionId().id}" '
+                        f"is part of a cycle and is consumed via the broker"
+                    )
+                    continue
+
+                output_collector = producer.output_collectors[stream_id]
+                if not self.publish_fused_streams:
+                    output_collector.disconnect()
+                producer.output_collectors[stream_id] = InProcessOutputCollector(
+                    stream_id,
+                    consumers=[self._in_process_consumer(consumer) for consumer in consumers],
+                    output_collector=output_collector if self.publish_fused_streams else None,
+                )
+                self.fused_streams[stream_id] = output_stream
+                logger.info(
+                    f'Output data stream "{stream_id}" of the function "{producer.getFunctionId().id}" '
+                    f"is consumed in-process by {len(consumers)} function(s)"
+                )
+
+    def _reaches(self, source: StreamPipesFunction, target: StreamPipesFunction) -> bool:
+        """Helper function to check whether the events of a function reach another function via its output streams.
+
+        Parameters
+        ----------
+        source: StreamPipesFunction
+            The function whose output data streams are followed.
+        target: StreamPipesFunction
+            The function to be reached.
+
+        Returns
+        -------
+        reaches: bool
+            `True` if the target is the source itself or consumes the output of the source, directly or indirectly.
+        """
+        functions = self.registration.getFunctions()
+        visited = set()
+        pending = [source]
+        while pending:
+            streampipes_function = pending.pop()
+            if streampipes_function is target:
+                return True
+            if id(streampipes_function) in visited:
+                continue
+            visited.add(id(streampipes_function))
+            output_stream_ids = streampipes_function.function_definition.get_output_stream_ids()
+            pending.extend(
+                f for f in functions if any(stream_id in output_stream_ids for stream_id in f.requiredStreamIds())
+            )
+        return False
+
+    def _in_process_consumer(self, streampipes_function: StreamPipesFunction) -> Callable[[Dict[str, Any], str], None]:
+        """Helper function to create the callback passing the events of an in-process stream to a function.
+
+        The events are handled like the events received from a broker: already replayed events are skipped,
+        sampled events are profiled and the metrics are recorded.
+
+        Parameters
+        ----------
+        streampipes_function: StreamPipesFunction
+            The function consuming the stream.
+
+        Returns
+        -------
+        consumer: Callable[[Dict[str, Any], str], None]
+            The callback, which decodes the events if the function requires typed events.
+        """
+        function_id = streampipes_function.getFunctionId().id
+
+        def consume(event: Dict[str, Any], stream_id: str) -> None:
+            """Passes an event of an in-process data stream to the function.
+
+            Parameters
+            ----------
+            event: Dict[str, Any]
+                The event of the data stream.
+            stream_id: str
+                The id of the data stream.
+
+            Returns
+            -------
+            None
+            """
+            key = (function_id, stream_id)
+            if self._replay_boundaries:
+                boundary = self._replay_boundaries.get(key)
+                if boundary is not None:
+                    if boundary.is_duplicate(event):
+                        return
+                    if boundary.is_passed(event):
+                        del self._replay_boundaries[key]
+            profiler = self.profiler
+            sampled = profiler is not None and profiler.start(function_id)
+            metrics = self.metrics
+            if metrics is not None:
+                start = time.perf_counter()
+            decoder = self._decoders.get(key)
+            streampipes_function.onEvent(event if decoder is None else decoder.decode(event), stream_id)
+            if metrics is not None:
+                metrics.observe("streampipes_function_on_event_seconds", key, time.perf_counter() - start)
+                metrics.inc("streampipes_function_events_in_total", key)
+            if profiler is not None and sampled:
+                profiler.stop(function_id)
+
+        return consume
+
+    def _compile_decoders(self, contexts: Dict[str, FunctionContext]) -> None:
+        """Compiles the decoders of the data streams whose events are required in a typed representation.
+
+        Parameters
+        ----------
+        contexts: Dict[str, FunctionContext]
+            The function contexts per function id, which contain the schema of the data streams.
+
+        Returns
+        -------
+        None
+        """
+        for streampipes_function in self.registration.getFunctions():
+            function_id = streampipes_function.getFunctionId().id
+            for stream_id, data_stream in contexts[function_id].schema.items():
+                event_format = streampipes_function.eventFormat(stream_id)
+                if event_format == EventFormat.DICT:
+                    continue
+                if data_stream.event_schema is None:
+                    raise ValueError(f"The events of the stream {stream_id} can not be decoded without event schema.")
+                self._decoders[(function_id, stream_id)] = EventDecoder(
+                    data_stream.event_schema, event_format, fields=streampipes_function.requiredFields(stream_id)
+                )
+                logger.info(f"Compiled a decoder for {event_format.name} events of the stream {stream_id}")
+
+    async def _replay_historic_data(self, chunk_size: int = 1000) -> Dict[Tuple[str, str], ReplayBoundary]:
+        """Replays the historic data of the data lake to all functions that have configured a backfill.
+
+        Events of multiple streams are replayed in order of their timestamps.
+        The data lake is queried in a separate thread and the events are replayed in chunks,
+        so that the event loop keeps running and the brokers keep receiving the live messages meanwhile.
+
+        Parameters
+        ----------
+        chunk_size: int
+            Number of historic events that are fetched and replayed at once.
+
+        Returns
+        -------
+        replay_boundaries: Dict[Tuple[str, str], ReplayBoundary]
+            The most recent replayed events per function id and stream id,
+            used to filter live events that have already been replayed.
+        """
+        replay_boundaries: Dict[Tuple[str, str], ReplayBoundary] = {}
+        for streampipes_function in self.registration.getFunctions():
+            function_id = streampipes_function.getFunctionId().id
+            configs = streampipes_function.backfill_configs
+            if not configs:
+                continue
+
+            for stream_id, config in configs.items():
+                replay_boundaries[(function_id, stream_id)] = ReplayBoundary(config.timestamp_field)
+
+            historic_events = merge_events(
+                {stream_id: fetch_historic_events(self.client, config) for stream_id, config in configs.items()},
+                timestamp_fields={stream_id: config.timestamp_field for stream_id, config in configs.items()},
+            )
+            num_events = 0
+            loop = asyncio.get_running_loop()
+            while True:
+                chunk: List[Tuple[str, Dict[str, Any]]] = await loop.run_in_executor(
+                    None, list, itertools.islice(historic_events, chunk_size)
+                )
+                if not chunk:
+                    break
+                for stream_id, event in chunk:
+                    replay_boundaries[(function_id, stream_id)].add(event)
+                    decoder = self._decoders.get((function_id, stream_id))
+                    streampipes_function.onEvent(event if decoder is None else decoder.decode(event), stream_id)
+                num_events += len(chunk)
+            logger.info(f"Replayed {num_events} historic events for the function {function_id}")
+
+        return replay_boundaries
+
     def _stop_functions(self) -> None:
         """Helper function to stop the StreamPipesFunctions.
 
@@ -148,6 +826,9 @@ class FunctionHandler:
         """
         for streampipes_function in self.registration.getFunctions():
             streampipes_function.stop()
+        self._deregister_functions()
+        if self.profiler is not None and self.profiler.output_dir is not None:
+            self.profiler.dump(self.profiler.output_dir)
 
     def force_stop_functions(self) -> None:
         """Stops the StreamPipesFunctions when the event loop was stopped without stopping the functions.
@@ -35,6 +35,8 @@ class Registration:
     def register(self, streampipes_function: StreamPipesFunction):
         """Registers a new function.
 
+        The function is registered at the StreamPipes backend once it is started by the `FunctionHandler`.
+
         Parameters
         ----------
         streampipes_function: StreamPipesFunction
@@ -45,7 +47,7 @@ class Registration:
         self: Registration
             The updated Registration instance
         """
-        self.functions.append(streampipes_function)  # TODO register function to AdminAPI + consul
+        self.functions.append(streampipes_function)
         return self
 
     def getFunctions(self) -> List[StreamPipesFunction]:
@@ -0,0 +1,296 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Runner to replay recorded data through StreamPipes Functions without involving a broker.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+from streampipes.client.client import StreamPipesClient
+from streampipes.functions.broker.output_collector import OutputCollector
+from streampipes.functions.registration import Registration
+from streampipes.functions.utils.backfill import (
+    BackfillConfig,
+    dataframe_to_events,
+    fetch_historic_events,
+    merge_events,
+)
+from streampipes.functions.utils.function_context import FunctionContext
+from streampipes.model.resource.data_stream import DataStream
+
+__all__ = [
+    "InMemoryOutputCollector",
+    "ReplayResult",
+    "ReplayRunner",
+]
+
+logger = logging.getLogger(__name__)
+
+ReplaySource = Union[pd.DataFrame, str, Path, BackfillConfig]
+
+
+class InMemoryOutputCollector(OutputCollector):
+    """Output collector that keeps the output events in memory instead of publishing them to a broker.
+
+    Attributes
+    ----------
+    events: List[Dict[str, Any]]
+        The collected output events
+    """
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+
+    def collect(self, event: Dict[str, Any]) -> None:
+        """Stores an output event.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The output event.
+
+        Returns
+        -------
+        None
+        """
+        self.events.append(event)
+
+    def disconnect(self) -> None:
+        """Nothing to disconnect for an in-memory output collector.
+
+        Returns
+        -------
+        None
+        """
+
+
+@dataclass
+class ReplayResult:
+    """Result of a replay.
+
+    Parameters
+    ----------
+    outputs: Dict[str, List[Dict[str, Any]]]
+        The output events per output stream id.
+    num_events: int
+        Number of replayed input events.
+    duration: float
+        Duration of the replay in seconds.
+    """
+
+    outputs: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    num_events: int = 0
+    duration: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        """Throughput of the replay.
+
+        Returns
+        -------
+        events_per_second: float
+            Number of replayed input events per second
+        """
+        return self.num_events / self.duration if self.duration > 0 else float("inf")
+
+
+class ReplayRunner:
+    """Drives the registered StreamPipes Functions with recorded data instead of the live data of a broker.
+
+    Each required stream is fed by a source, which is either a pandas DataFrame, the path of a Parquet file,
+    or a [BackfillConfig][streampipes.functions.utils.backfill.BackfillConfig] describing a data lake query.
+    Reading Parquet files requires `pyarrow` (`pip install streampipes[parquet]`).
+    Events of multiple streams are delivered in order of their timestamps,
+    the rows of DataFrames and Parquet files are sorted by their timestamp beforehand.
+    The output events of the functions are captured in memory instead of being published to StreamPipes.
+
+    Parameters
+    ----------
+    registration: Registration
+        The registration, that contains the StreamPipesFunctions.
+    client: Optional[StreamPipesClient]
+        The client to interact with the API. Required for data lake sources and to provide the schema
+        of the data streams in the function context.
+    speed: Optional[float]
+        Replay speed relative to the timestamps of the events, e.g. `1.0` for real-time and `10.0` for 10x.
+        If `None` the events are replayed as fast as possible.
+    timestamp_field: str
+        Name of the timestamp property of the replayed events.
+
+    Examples
+    --------
+
+    ```python
+    registration = Registration().register(my_function)
+    runner = ReplayRunner(registration)
+    result = runner.run({"urn:streampipes.apache.org:eventstream:uPDKLI": df})
+    print(result.events_per_second, result.outputs)
+    ```
+    """
+
+    def __init__(
+        self,
+        registration: Registration,
+        client: Optional[StreamPipesClient] = None,
+        speed: Optional[float] = None,
+        timestamp_field: str = "timestamp",
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("The replay speed must be positive.")
+        self.registration = registration
+        self.client = client
+        self.speed = speed
+        self.timestamp_field = timestamp_field
+
+    def _load_events(self, source: ReplaySource) -> Iterator[Dict[str, Any]]:
+        """Creates an iterator over the events of a source in order of their timestamps.
+
+        Parameters
+        ----------
+        source: ReplaySource
+            The source of the events.
+
+        Returns
+        -------
+        events: Iterator[Dict[str, Any]]
+            The events of the source
+
+        Raises
+        ------
+        ValueError
+            If a data lake source is used without a client.
+        """
+        if isinstance(source, BackfillConfig):
+            if self.client is None:
+                raise ValueError("A client is required to replay data from the data lake.")
+            return fetch_historic_events(self.client, source)
+        if isinstance(source, (str, Path)):
+            source = pd.read_parquet(source)
+        if self.timestamp_field in source.columns:
+            # a stable sort keeps the order of events with the same timestamp
+            source = source.sort_values(self.timestamp_field, kind="stable")
+        return dataframe_to_events(source, timestamp_field=self.timestamp_field)
+
+    def _create_contexts(self, stream_ids: List[str]) -> Dict[str, FunctionContext]:
+        """Creates the function context for every registered function.
+
+        Parameters
+        ----------
+        stream_ids: List[str]
+            The ids of the replayed streams.
+
+        Returns
+        -------
+        contexts: Dict[str, FunctionContext]
+            The function context per function id
+        """
+        schema: Dict[str, DataStream] = {}
+        if self.client is not None:
+            schema = {stream_id: self.client.dataStreamApi.get(stream_id) for stream_id in stream_ids}  # type: ignore
+
+        return {
+            streampipes_function.getFunctionId().id: FunctionContext(
+                streampipes_function.getFunctionId().id,
+                schema={
+                    stream_id: data_stream
+                    for stream_id, data_stream in schema.items()
+                    if stream_id in streampipes_function.requiredStreamIds()
+                },
+                client=self.client,  # type: ignore
+                streams=streampipes_function.requiredStreamIds(),
+            )
+            for streampipes_function in self.registration.getFunctions()
+        }
+
+    def run(self, sources: Dict[str, ReplaySource]) -> ReplayResult:
+        """Replays the sources through the registered functions.
+
+        The output collectors of the functions are replaced by in-memory collectors during the replay
+        and restored afterwards.
+
+        Parameters
+        ----------
+        sources: Dict[str, ReplaySource]
+            The source of the events per stream id.
+
+        Returns
+        -------
+        result: ReplayResult
+            The captured output events and statistics of the replay
+        """
+        functions = self.registration.getFunctions()
+        functions_per_stream = {
+            stream_id: [f for f in functions if stream_id in f.requiredStreamIds()] for stream_id in sources.keys()
+        }
+
+        original_collectors = {}
+        result = ReplayResult()
+        for streampipes_function in functions:
+            original_collectors[streampipes_function.getFunctionId().id] = streampipes_function.output_collectors
+            in_memory_collectors = {
+                stream_id: InMemoryOutputCollector() for stream_id in streampipes_function.output_collectors.keys()
+            }
+            streampipes_function.output_collectors = in_memory_collectors  # type: ignore
+            result.outputs.update({stream_id: c.events for stream_id, c in in_memory_collectors.items()})
+
+        contexts = self._create_contexts(list(sources.keys()))
+        for streampipes_function in functions:
+            streampipes_function.onServiceStarted(contexts[streampipes_function.getFunctionId().id])
+
+        timestamp_fields = {
+            stream_id: source.timestamp_field if isinstance(source, BackfillConfig) else self.timestamp_field
+            for stream_id, source in sources.items()
+        }
+        events = merge_events(
+            {stream_id: self._load_events(source) for stream_id, source in sources.items()},
+            timestamp_fields=timestamp_fields,
+        )
+
+        start_time = time.perf_counter()
+        first_timestamp: Optional[int] = None
+        try:
+            for stream_id, event in events:
+                if self.speed is not None:
+                    timestamp = event.get(timestamp_fields[stream_id])
+                    if timestamp is not None:
+                        if first_timestamp is None:
+                            first_timestamp = timestamp
+                        delay = (timestamp - first_timestamp) / 1000 / self.speed - (time.perf_counter() - start_time)
+                        if delay > 0:
+                            time.sleep(delay)
+
+                stream_functions = functions_per_stream[stream_id]
+                for i, streampipes_function in enumerate(stream_functions):
+                    # every function receives its own event as functions are allowed to modify them
+                    streampipes_function.onEvent(event if i == len(stream_functions) - 1 else dict(event), stream_id)
+                result.num_events += 1
+        finally:
+            result.duration = time.perf_counter() - start_time
+            for streampipes_function in functions:
+                streampipes_function.stop()
+                streampipes_function.output_collectors = original_collectors[streampipes_function.getFunctionId().id]
+
+        logger.info(
+            f"Replayed {result.num_events} events in {result.duration:.3f}s "
+            f"({result.events_per_second:.0f} events per second)"
+        )
+        return result
@@ -19,7 +19,10 @@ from time import time
 from typing import Any, Dict, List, Optional
 
 from streampipes.functions.broker.output_collector import OutputCollector
+from streampipes.functions.utils.backfill import BackfillConfig
+from streampipes.functions.utils.event_decoder import EventFormat
 from streampipes.functions.utils.function_context import FunctionContext
+from streampipes.functions.utils.latency_tracer import EventTrace, LatencyTracer
 from streampipes.model.resource import FunctionDefinition
 from streampipes.model.resource.function_definition import FunctionId
 
@@ -40,6 +43,8 @@ class StreamPipesFunction(ABC):
     ----------
     output_collectors: Dict[str, OutputCollector]
         List of all output collectors which are created based on the provided function definitions.
+    backfill_configs: Dict[str, BackfillConfig]
+        Configurations of the historic data to be replayed per stream id before the live data is processed.
     """
 
     def __init__(self, function_definition: Optional[FunctionDefinition] = None):
@@ -48,6 +53,32 @@ class StreamPipesFunction(ABC):
             stream_id: OutputCollector(data_stream)
             for stream_id, data_stream in self.function_definition.output_data_streams.items()
         }
+        self.backfill_configs: Dict[str, BackfillConfig] = {}
+        # set by the function handler if the latency of the events is traced
+        self._tracer: Optional[LatencyTracer] = None
+        self._trace: Optional[EventTrace] = None
+
+    def add_backfill(self, stream_id: str, config: BackfillConfig):
+        """Replay historic data of a required stream from the data lake before processing its live data.
+
+        The historic events are passed to `onEvent` at full speed when the function gets started.
+        Afterwards, the function seamlessly switches over to the live data of the stream,
+        events which have already been replayed are not delivered twice.
+
+        Parameters
+        ----------
+        stream_id: str
+            The id of the required data stream
+        config: BackfillConfig
+            The configuration of the historic data to be replayed
+
+        Returns
+        -------
+        self: StreamPipesFunction
+            The updated function instance
+        """
+        self.backfill_configs[stream_id] = config
+        return self
 
     def add_output(self, stream_id: str, event: Dict[str, Any]):
         """Send an event via an output data stream to StreamPipes
@@ -64,6 +95,8 @@ class StreamPipesFunction(ABC):
         None
         """
         event["timestamp"] = int(1000 * time())
+        if self._trace is not None:
+            self._tracer.trace_output(self.getFunctionId().id, stream_id, self._trace, event)  # type: ignore
         self.output_collectors[stream_id].collect(event)
 
     def getFunctionId(self) -> FunctionId:
@@ -94,6 +127,95 @@ class StreamPipesFunction(ABC):
         """
         raise NotImplementedError  # pragma: no cover
 
+    def requiredFields(self, streamId: str) -> Optional[List[str]]:
+        """Get the properties of the events of a data stream that are read by the function.
+
+        Only these properties are decoded from the received messages, which saves decoding time for wide events.
+        The timestamp is always decoded.
+
+        Parameters
+        ----------
+        streamId: str
+            The id of the required data stream.
+
+        Returns
+        -------
+        fields: Optional[List[str]]
+            Runtime names of the properties or `None` if all properties are needed, which is the default.
+        """
+        return None
+
+    def eventFormat(self, streamId: str) -> EventFormat:
+        """Get the representation in which the events of a data stream are passed to `onEvent`.
+
+        Typed representations are created by a decoder that is compiled from the event schema of the data stream,
+        see [EventDecoder][streampipes.functions.utils.event_decoder.EventDecoder].
+
+        Parameters
+        ----------
+        streamId: str
+            The id of the required data stream.
+
+        Returns
+        -------
+        event_format: EventFormat
+            The representation of the events, plain dictionaries by default.
+        """
+        return EventFormat.DICT
+
+    def consumerGroup(self, streamId: str) -> Optional[str]:
+        """Get the consumer group in which the function consumes a data stream.
+
+        All instances of the function that consume a data stream in the same group share its messages,
+        which allows to scale the function out over several processes. For Kafka, the partitions of the topic
+        are distributed among the instances, for NATS the messages are distributed via a queue group.
+        All functions consuming the same data stream within a process need to use the same group.
+
+        Parameters
+        ----------
+        streamId: str
+            The id of the required data stream.
+
+        Returns
+        -------
+        consumer_group: Optional[str]
+            The name of the group or `None` to receive all messages of the data stream, which is the default.
+        """
+        return None
+
+    def onPartitionsAssigned(self, streamId: str, partitions: List[int]) -> None:
+        """Is called when partitions of a data stream are assigned to this process within its consumer group.
+
+        Parameters
+        ----------
+        streamId: str
+            The id of the data stream.
+        partitions: List[int]
+            The newly assigned partitions.
+
+        Returns
+        -------
+        None
+        """
+
+    def onPartitionsRevoked(self, streamId: str, partitions: List[int]) -> None:
+        """Is called when partitions of a data stream are taken away from this process within its consumer group.
+
+        Keyed state of the revoked partitions can be handed off or dropped,
+        as the events of these keys are consumed by another process from now on.
+
+        Parameters
+        ----------
+        streamId: str
+            The id of the data stream.
+        partitions: List[int]
+            The revoked partitions.
+
+        Returns
+        -------
+        None
+        """
+
     @abstractmethod
     def onServiceStarted(self, context: FunctionContext) -> None:
         """Is called when the function gets started.
@@ -0,0 +1,1050 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Incremental aggregations whose memory does not grow with the number of aggregated events.
+
+The accumulators, e.g. [RunningStats][streampipes.functions.utils.aggregators.RunningStats],
+can be used directly within `onEvent`, while the aggregators wrap them to be used as results
+of a [WindowOperator][streampipes.functions.utils.windowing.WindowOperator].
+"""
+
+import hashlib
+import math
+import random
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from streampipes.functions.utils.windowing import Aggregator
+
+__all__ = [
+    "Aggregations",
+    "Count",
+    "DistinctCount",
+    "HyperLogLog",
+    "KllSketch",
+    "Max",
+    "Mean",
+    "Min",
+    "Quantiles",
+    "RunningStats",
+    "SlidingExtremes",
+    "Stats",
+    "Sum",
+    "Variance",
+]
+
+
+class RunningStats:
+    """Running count, mean, variance, minimum and maximum of a sequence of values.
+
+    The mean and the variance are updated with Welford's algorithm, which is numerically stable.
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Adds a value.
+
+        Parameters
+        ----------
+        value: float
+            The value to be added.
+
+        Returns
+        -------
+        None
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merges the statistics of another sequence of values into these statistics.
+
+        Parameters
+        ----------
+        other: RunningStats
+            The statistics to be merged.
+
+        Returns
+        -------
+        stats: RunningStats
+            The merged statistics.
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 1) -> float:
+        """Get the variance of the values.
+
+        Parameters
+        ----------
+        ddof: int
+            Delta degrees of freedom, the sample variance is returned by default.
+
+        Returns
+        -------
+        variance: float
+            The variance, `nan` if there are not more than `ddof` values.
+        """
+        if self.count <= ddof:
+            return math.nan
+        return self._m2 / (self.count - ddof)
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """Get the statistics as dictionary.
+
+        Returns
+        -------
+        stats: Dict[str, Optional[float]]
+            The count, mean, sample variance, minimum and maximum, which are `None` if no value has been added.
+        """
+        if self.count == 0:
+            return {"count": 0, "mean": None, "variance": None, "min": None, "max": None}
+        variance = self.variance()
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": None if math.isnan(variance) else variance,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class SlidingExtremes:
+    """Minimum and maximum of the values of the last `size` milliseconds.
+
+    The candidates for the minimum and the maximum are kept in monotonic deques,
+    so that every value is added and evicted at most once.
+
+    Parameters
+    ----------
+    size: int
+        The size of the sliding window in milliseconds.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size <= 0:
+            raise ValueError("The window size needs to be positive.")
+        self.size = size
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+
+    def add(self, timestamp: int, value: float) -> None:
+        """Adds a value and evicts all values that are outside the window afterwards.
+
+        Timestamps are expected to be non-decreasing.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the value in milliseconds since epoch.
+        value: float
+            The value to be added.
+
+        Returns
+        -------
+        None
+        """
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+
+        oldest = timestamp - self.size
+        while self._min[0][0] <= oldest:
+            self._min.popleft()
+        while self._max[0][0] <= oldest:
+            self._max.popleft()
+
+    @property
+    def min(self) -> Optional[float]:
+        """Minimum of the values in the window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Maximum of the values in the window."""
+        return self._max[0][1] if self._max else None
+
+
+class KllSketch:
+    """Approximate quantiles of a sequence of values based on the KLL sketch.
+
+    The sketch keeps a hierarchy of compactors, compacting a full compactor keeps every second of its sorted
+    values with double the weight. The memory is bounded by roughly `3 * k` values, while the rank error
+    is about `1.65 / k` with high probability.
+
+    Parameters
+    ----------
+    k: int
+        Accuracy parameter, i.e. the capacity of the largest compactor.
+    seed: Optional[int]
+        Seed of the random compaction offsets to get reproducible results.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("The accuracy parameter k needs to be at least 8.")
+        self.k = k
+        self.count = 0
+        self._random = random.Random(seed)
+        self._compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level: int) -> int:
+        """Helper function to compute the capacity of the compactor at the given level."""
+        depth = len(self._compactors) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self) -> None:
+        """Helper function to add another compactor level."""
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def _compress(self) -> None:
+        """Helper function to compact compactors until the sketch does not exceed its capacity."""
+        while self._size >= self._max_size:
+            for level, compactor in enumerate(self._compactors):
+                if len(compactor) >= self._capacity(level):
+                    if level + 1 == len(self._compactors):
+                        self._grow()
+                    compactor.sort()
+                    offset = self._random.randint(0, 1)
+                    self._compactors[level + 1].extend(compactor[offset::2])
+                    self._compactors[level] = []
+                    break
+            self._size = sum(len(compactor) for compactor in self._compactors)
+
+    def add(self, value: float) -> None:
+        """Adds a value.
+
+        Parameters
+        ----------
+        value: float
+            The value to be added.
+
+        Returns
+        -------
+        None
+        """
+        self._compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KllSketch") -> "KllSketch":
+        """Merges another sketch into this sketch.
+
+        Parameters
+        ----------
+        other: KllSketch
+            The sketch to be merged.
+
+        Returns
+        -------
+        sketch: KllSketch
+            The merged sketch.
+        """
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, compactor in enumerate(other._compactors):
+            self._compactors[level].extend(compactor)
+        self.count += other.count
+        self._size = sum(len(compactor) for compactor in self._compactors)
+        self._compress()
+        return self
+
+    def quantiles(self, quantiles: Sequence[float]) -> List[Optional[float]]:
+        """Get approximate quantiles of the values.
+
+        Parameters
+        ----------
+        quantiles: Sequence[float]
+            The quantiles to be computed, between 0 and 1.
+
+        Returns
+        -------
+        values: List[Optional[float]]
+            The approximate quantiles, `None` if no value has been added.
+        """
+        for quantile in quantiles:
+            if not 0 <= quantile <= 1:
+                raise ValueError(f"Quantile {quantile} is not between 0 and 1.")
+        if self.count == 0:
+            return [None for _ in quantiles]
+        weighted = sorted(
+            (value, 1 << level) for level, compactor in enumerate(self._compactors) for value in compactor
+        )
+        total = sum(weight for _, weight in weighted)
+        results: List[Optional[float]] = []
+        for quantile in quantiles:
+            rank = quantile * total
+            cumulative = 0
+            result = weighted[-1][0]
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= rank:
+                    result = value
+                    break
+            results.append(result)
+        return results
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Get an approximate quantile of the values.
+
+        Parameters
+        ----------
+        quantile: float
+            The quantile to be computed, between 0 and 1.
+
+        Returns
+        -------
+        value: Optional[float]
+            The approximate quantile, `None` if no value has been added.
+        """
+        return self.quantiles([quantile])[0]
+
+
+class HyperLogLog:
+    """Approximate number of distinct values based on the HyperLogLog algorithm.
+
+    The sketch uses `2 ** precision` one-byte registers, its standard error is about `1.04 / sqrt(2 ** precision)`.
+    Values are hashed by their string representation, so that sketches of different processes can be merged.
+
+    Parameters
+    ----------
+    precision: int
+        Number of bits addressing the registers, between 4 and 16.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("The precision needs to be between 4 and 16.")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Adds a value.
+
+        Parameters
+        ----------
+        value: Any
+            The value to be added.
+
+        Returns
+        -------
+        None
+        """
+        hashed = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+        index = hashed >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rank = remaining_bits - (hashed & ((1 << remaining_bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Merges another sketch into this sketch.
+
+        Parameters
+        ----------
+        other: HyperLogLog
+            The sketch to be merged, it needs to have the same precision.
+
+        Returns
+        -------
+        sketch: HyperLogLog
+            The merged sketch.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only sketches of the same precision can be merged.")
+        self._registers = bytearray(max(a, b) for a, b in zip(self._registers, other._registers))
+        return self
+
+    def estimate(self) -> int:
+        """Get the estimated number of distinct values.
+
+        Returns
+        -------
+        count: int
+            The estimated number of distinct values.
+        """
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-register for register in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros > 0:
+            # linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class _FieldAggregator(Aggregator):
+    """Aggregator of the values of a single event property, events without the property are ignored.
+
+    Parameters
+    ----------
+    field: str
+        Runtime name of the event property.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+
+
+class Count(Aggregator[int]):
+    """Counts the events."""
+
+    def create(self) -> int:
+        """Creates a count of zero.
+
+        Returns
+        -------
+        accumulator: int
+            The empty count.
+        """
+        return 0
+
+    def add(self, accumulator: int, event: Dict[str, Any]) -> int:
+        """Counts an event.
+
+        Parameters
+        ----------
+        accumulator: int
+            The count so far.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: int
+            The incremented count.
+        """
+        return accumulator + 1
+
+    def merge(self, accumulator: int, other: int) -> int:
+        """Adds up two counts.
+
+        Parameters
+        ----------
+        accumulator: int
+            The first count.
+        other: int
+            The second count.
+
+        Returns
+        -------
+        accumulator: int
+            The sum of both counts.
+        """
+        return accumulator + other
+
+    def result(self, accumulator: int) -> int:
+        """Get the count.
+
+        Parameters
+        ----------
+        accumulator: int
+            The count.
+
+        Returns
+        -------
+        result: int
+            The number of events.
+        """
+        return accumulator
+
+
+class Sum(_FieldAggregator):
+    """Sums up the values of an event property."""
+
+    def create(self) -> float:
+        """Creates a sum of zero.
+
+        Returns
+        -------
+        accumulator: float
+            The empty sum.
+        """
+        return 0
+
+    def add(self, accumulator: float, event: Dict[str, Any]) -> float:
+        """Adds the value of an event to the sum.
+
+        Parameters
+        ----------
+        accumulator: float
+            The sum so far.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: float
+            The updated sum.
+        """
+        value = event.get(self.field)
+        return accumulator if value is None else accumulator + value
+
+    def merge(self, accumulator: float, other: float) -> float:
+        """Adds up two sums.
+
+        Parameters
+        ----------
+        accumulator: float
+            The first sum.
+        other: float
+            The second sum.
+
+        Returns
+        -------
+        accumulator: float
+            The sum of both sums.
+        """
+        return accumulator + other
+
+    def result(self, accumulator: float) -> float:
+        """Get the sum.
+
+        Parameters
+        ----------
+        accumulator: float
+            The sum.
+
+        Returns
+        -------
+        result: float
+            The sum of the values.
+        """
+        return accumulator
+
+
+class Min(_FieldAggregator):
+    """Minimum of the values of an event property, `None` if there is no value."""
+
+    def create(self) -> Optional[float]:
+        """Creates an empty minimum.
+
+        Returns
+        -------
+        accumulator: Optional[float]
+            `None` as no value has been seen yet.
+        """
+        return None
+
+    def add(self, accumulator: Optional[float], event: Dict[str, Any]) -> Optional[float]:
+        """Updates the minimum with the value of an event.
+
+        Parameters
+        ----------
+        accumulator: Optional[float]
+            The minimum so far.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: Optional[float]
+            The updated minimum.
+        """
+        return self.merge(accumulator, event.get(self.field))
+
+    def merge(self, accumulator: Optional[float], other: Optional[float]) -> Optional[float]:
+        """Get the smaller one of two minima.
+
+        Parameters
+        ----------
+        accumulator: Optional[float]
+            The first minimum.
+        other: Optional[float]
+            The second minimum.
+
+        Returns
+        -------
+        accumulator: Optional[float]
+            The minimum of both.
+        """
+        if accumulator is None or (other is not None and other < accumulator):
+            return other
+        return accumulator
+
+    def result(self, accumulator: Optional[float]) -> Optional[float]:
+        """Get the minimum.
+
+        Parameters
+        ----------
+        accumulator: Optional[float]
+            The minimum.
+
+        Returns
+        -------
+        result: Optional[float]
+            The minimum of the values.
+        """
+        return accumulator
+
+
+class Max(_FieldAggregator):
+    """Maximum of the values of an event property, `None` if there is no value."""
+
+    def create(self) -> Optional[float]:
+        """Creates an empty maximum.
+
+        Returns
+        -------
+        accumulator: Optional[float]
+            `None` as no value has been seen yet.
+        """
+        return None
+
+    def add(self, accumulator: Optional[float], event: Dict[str, Any]) -> Optional[float]:
+        """Updates the maximum with the value of an event.
+
+        Parameters
+        ----------
+        accumulator: Optional[float]
+            The maximum so far.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: Optional[float]
+            The updated maximum.
+        """
+        return self.merge(accumulator, event.get(self.field))
+
+    def merge(self, accumulator: Optional[float], other: Optional[float]) -> Optional[float]:
+        """Get the larger one of two maxima.
+
+        Parameters
+        ----------
+        accumulator: Optional[float]
+            The first maximum.
+        other: Optional[float]
+            The second maximum.
+
+        Returns
+        -------
+        accumulator: Optional[float]
+            The maximum of both.
+        """
+        if accumulator is None or (other is not None and other > accumulator):
+            return other
+        return accumulator
+
+    def result(self, accumulator: Optional[float]) -> Optional[float]:
+        """Get the maximum.
+
+        Parameters
+        ----------
+        accumulator: Optional[float]
+            The maximum.
+
+        Returns
+        -------
+        result: Optional[float]
+            The maximum of the values.
+        """
+        return accumulator
+
+
+class Stats(_FieldAggregator):
+    """Count, mean, sample variance, minimum and maximum of the values of an event property."""
+
+    def create(self) -> RunningStats:
+        """Creates empty running statistics.
+
+        Returns
+        -------
+        accumulator: RunningStats
+            The empty statistics.
+        """
+        return RunningStats()
+
+    def add(self, accumulator: RunningStats, event: Dict[str, Any]) -> RunningStats:
+        """Adds the value of an event to the statistics.
+
+        Parameters
+        ----------
+        accumulator: RunningStats
+            The statistics, which are modified in-place.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: RunningStats
+            The updated statistics.
+        """
+        value = event.get(self.field)
+        if value is not None:
+            accumulator.add(value)
+        return accumulator
+
+    def merge(self, accumulator: RunningStats, other: RunningStats) -> RunningStats:
+        """Merges the statistics of two windows.
+
+        Parameters
+        ----------
+        accumulator: RunningStats
+            The first statistics, which are modified in-place.
+        other: RunningStats
+            The second statistics.
+
+        Returns
+        -------
+        accumulator: RunningStats
+            The merged statistics.
+        """
+        return accumulator.merge(other)
+
+    def result(self, accumulator: RunningStats) -> Dict[str, Optional[float]]:
+        """Get the statistics as dictionary.
+
+        Parameters
+        ----------
+        accumulator: RunningStats
+            The statistics.
+
+        Returns
+        -------
+        result: Dict[str, Optional[float]]
+            The count, mean, sample variance, minimum and maximum.
+        """
+        return accumulator.as_dict()
+
+
+class Mean(Stats):
+    """Mean of the values of an event property, `None` if there is no value."""
+
+    def result(self, accumulator: RunningStats) -> Optional[float]:  # type: ignore[override]
+        """Get the mean of the values.
+
+        Parameters
+        ----------
+        accumulator: RunningStats
+            The statistics of the values.
+
+        Returns
+        -------
+        result: Optional[float]
+            The mean or `None` if there is no value.
+        """
+        return accumulator.mean if accumulator.count > 0 else None
+
+
+class Variance(Stats):
+    """Variance of the values of an event property, `None` if there are not enough values.
+
+    Parameters
+    ----------
+    field: str
+        Runtime name of the event property.
+    ddof: int
+        Delta degrees of freedom, the sample variance is computed by default.
+    """
+
+    def __init__(self, field: str, ddof: int = 1) -> None:
+        super().__init__(field)
+        self.ddof = ddof
+
+    def result(self, accumulator: RunningStats) -> Optional[float]:  # type: ignore[override]
+        """Get the variance of the values.
+
+        Parameters
+        ----------
+        accumulator: RunningStats
+            The statistics of the values.
+
+        Returns
+        -------
+        result: Optional[float]
+            The variance or `None` if there are not enough values.
+        """
+        variance = accumulator.variance(self.ddof)
+        return None if math.isnan(variance) else variance
+
+
+class Quantiles(_FieldAggregator):
+    """Approximate quantiles of the values of an event property.
+
+    Parameters
+    ----------
+    field: str
+        Runtime name of the event property.
+    quantiles: Sequence[float]
+        The quantiles to be computed, between 0 and 1.
+    k: int
+        Accuracy parameter of the [KllSketch][streampipes.functions.utils.aggregators.KllSketch].
+    """
+
+    def __init__(self, field: str, quantiles: Sequence[float] = (0.5,), k: int = 200) -> None:
+        super().__init__(field)
+        self.quantiles = list(quantiles)
+        self.k = k
+
+    def create(self) -> KllSketch:
+        """Creates an empty sketch.
+
+        Returns
+        -------
+        accumulator: KllSketch
+            The empty sketch.
+        """
+        return KllSketch(self.k)
+
+    def add(self, accumulator: KllSketch, event: Dict[str, Any]) -> KllSketch:
+        """Adds the value of an event to the sketch.
+
+        Parameters
+        ----------
+        accumulator: KllSketch
+            The sketch, which is modified in-place.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: KllSketch
+            The updated sketch.
+        """
+        value = event.get(self.field)
+        if value is not None:
+            accumulator.add(value)
+        return accumulator
+
+    def merge(self, accumulator: KllSketch, other: KllSketch) -> KllSketch:
+        """Merges the sketches of two windows.
+
+        Parameters
+        ----------
+        accumulator: KllSketch
+            The first sketch, which is modified in-place.
+        other: KllSketch
+            The second sketch.
+
+        Returns
+        -------
+        accumulator: KllSketch
+            The merged sketch.
+        """
+        return accumulator.merge(other)
+
+    def result(self, accumulator: KllSketch) -> Dict[float, Optional[float]]:
+        """Get the approximate quantiles.
+
+        Parameters
+        ----------
+        accumulator: KllSketch
+            The sketch of the values.
+
+        Returns
+        -------
+        result: Dict[float, Optional[float]]
+            The approximate value per quantile, `None` if there is no value.
+        """
+        return dict(zip(self.quantiles, accumulator.quantiles(self.quantiles)))
+
+
+class DistinctCount(_FieldAggregator):
+    """Approximate number of distinct values of an event property.
+
+    Parameters
+    ----------
+    field: str
+        Runtime name of the event property.
+    precision: int
+        Precision of the [HyperLogLog][streampipes.functions.utils.aggregators.HyperLogLog] sketch.
+    """
+
+    def __init__(self, field: str, precision: int = 12) -> None:
+        super().__init__(field)
+        self.precision = precision
+
+    def create(self) -> HyperLogLog:
+        """Creates an empty sketch.
+
+        Returns
+        -------
+        accumulator: HyperLogLog
+            The empty sketch.
+        """
+        return HyperLogLog(self.precision)
+
+    def add(self, accumulator: HyperLogLog, event: Dict[str, Any]) -> HyperLogLog:
+        """Adds the value of an event to the sketch.
+
+        Parameters
+        ----------
+        accumulator: HyperLogLog
+            The sketch, which is modified in-place.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: HyperLogLog
+            The updated sketch.
+        """
+        value = event.get(self.field)
+        if value is not None:
+            accumulator.add(value)
+        return accumulator
+
+    def merge(self, accumulator: HyperLogLog, other: HyperLogLog) -> HyperLogLog:
+        """Merges the sketches of two windows.
+
+        Parameters
+        ----------
+        accumulator: HyperLogLog
+            The first sketch, which is modified in-place.
+        other: HyperLogLog
+            The second sketch.
+
+        Returns
+        -------
+        accumulator: HyperLogLog
+            The merged sketch.
+        """
+        return accumulator.merge(other)
+
+    def result(self, accumulator: HyperLogLog) -> int:
+        """Get the approximate number of distinct values.
+
+        Parameters
+        ----------
+        accumulator: HyperLogLog
+            The sketch of the values.
+
+        Returns
+        -------
+        result: int
+            The estimated number of distinct values.
+        """
+        return accumulator.estimate()
+
+
+class Aggregations(Aggregator[Dict[str, Any]]):
+    """Computes several aggregations at once, the result is a dictionary of the named results.
+
+    Parameters
+    ----------
+    aggregators: Aggregator
+        The aggregators by the name of their result.
+
+    Examples
+    --------
+    ```python
+    WindowOperator(
+        TumblingWindows(size=60_000),
+        aggregator=Aggregations(
+            count=Count(), temperature=Stats("temperature"), p99=Quantiles("latency", [0.99])
+        ),
+    )
+    ```
+    """
+
+    def __init__(self, **aggregators: Aggregator) -> None:
+        self.aggregators = aggregators
+
+    def create(self) -> Dict[str, Any]:
+        """Creates the empty accumulators of all aggregators.
+
+        Returns
+        -------
+        accumulator: Dict[str, Any]
+            The accumulators by name.
+        """
+        return {name: aggregator.create() for name, aggregator in self.aggregators.items()}
+
+    def add(self, accumulator: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds an event to the accumulators of all aggregators.
+
+        Parameters
+        ----------
+        accumulator: Dict[str, Any]
+            The accumulators by name, which are modified in-place.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: Dict[str, Any]
+            The updated accumulators.
+        """
+        for name, aggregator in self.aggregators.items():
+            accumulator[name] = aggregator.add(accumulator[name], event)
+        return accumulator
+
+    def merge(self, accumulator: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+        """Merges the accumulators of all aggregators.
+
+        Parameters
+        ----------
+        accumulator: Dict[str, Any]
+            The first accumulators by name, which are modified in-place.
+        other: Dict[str, Any]
+            The second accumulators by name.
+
+        Returns
+        -------
+        accumulator: Dict[str, Any]
+            The merged accumulators.
+        """
+        for name, aggregator in self.aggregators.items():
+            accumulator[name] = aggregator.merge(accumulator[name], other[name])
+        return accumulator
+
+    def result(self, accumulator: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the results of all aggregators.
+
+        Parameters
+        ----------
+        accumulator: Dict[str, Any]
+            The accumulators by name.
+
+        Returns
+        -------
+        result: Dict[str, Any]
+            The results by name.
+        """
+        return {name: aggregator.result(accumulator[name]) for name, aggregator in self.aggregators.items()}
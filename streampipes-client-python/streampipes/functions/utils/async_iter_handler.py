@@ -15,7 +15,23 @@
 # limitations under the License.
 #
 import asyncio
-from typing import Any, AsyncGenerator, AsyncIterator, Dict, Tuple
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple
+
+
+class _EndOfStream:
+    """Marks the end of the messages of a data stream in the queue of its reader.
+
+    Parameters
+    ----------
+    error: Optional[BaseException]
+        The exception that ended the data stream, if it did not end regularly.
+    """
+
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+
+
+_END_OF_STREAM = _EndOfStream()
 
 
 class AsyncIterHandler:
@@ -43,24 +59,93 @@ class AsyncIterHandler:
             return "stop", None
 
     @staticmethod
-    async def combine_async_messages(messages: Dict[str, AsyncIterator]) -> AsyncGenerator:
+    async def _read(messages: AsyncIterator, queue: asyncio.Queue, ready: asyncio.Event) -> None:
+        """Continuously reads the messages of a single AsyncIterator into a queue.
+
+        Parameters
+        ----------
+        messages: AsyncIterator
+            An asynchronous iterator that contains the messages.
+        queue: asyncio.Queue
+            The queue the messages are put into, followed by an end marker once no message is left
+            or the iterator raised an exception. The end marker carries the exception to the consumer.
+        ready: asyncio.Event
+            Event that is set whenever a message is put into the queue.
+
+        Returns
+        -------
+        None
+        """
+        end = _END_OF_STREAM
+        try:
+            async for message in messages:
+                await queue.put(message)
+                ready.set()
+        except RuntimeError:
+            # the iterators of closed connections end with a RuntimeError, like in `anext()`
+            pass
+        except asyncio.CancelledError:
+            # the messages are no longer consumed, so nobody waits for the end marker
+            raise
+        except BaseException as err:
+            end = _EndOfStream(err)
+        await queue.put(end)
+        ready.set()
+
+    @staticmethod
+    async def combine_async_messages(
+        messages: Dict[str, AsyncIterator], max_buffer_size: int = 1000, max_batch_size: int = 100
+    ) -> AsyncGenerator:
         """Continuously gets the next published message from multiple AsyncIterators in parallel.
 
+        Every AsyncIterator is read by a long-lived task into its own bounded queue.
+        The queues are drained in a round-robin manner with at most `max_batch_size` messages per turn,
+        so that a data stream with a high message rate cannot starve the others.
+
         Parameters
         ----------
         messages: Dict[str, AsyncIterator]
             A dictionary with an asynchronous iterator for every stream id.
+        max_buffer_size: int
+            Maximum number of messages buffered per data stream before its reader waits.
+        max_batch_size: int
+            Maximum number of messages taken from a data stream before switching to the next one.
 
         Yields
         ------
         message: Tuple[str, Any]
-            Description of the anonymous integer return value.
+            Tuple of the stream id and the message or `("stop", None)` whenever a data stream has no message left.
+
+        Raises
+        ------
+        BaseException
+            The exception raised by an AsyncIterator while reading its messages.
         """
-        pending = {AsyncIterHandler.anext(stream_id, message) for stream_id, message in messages.items()}
-        while pending:
-            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)  # type: ignore
-            for i in done:
-                stream_id, msg = i.result()
-                if stream_id != "stop":
-                    pending.add(AsyncIterHandler.anext(stream_id, messages[stream_id]))
-                yield stream_id, msg
+        ready = asyncio.Event()
+        queues: Dict[str, asyncio.Queue] = {stream_id: asyncio.Queue(max_buffer_size) for stream_id in messages}
+        readers: List[asyncio.Task] = [
+            asyncio.ensure_future(AsyncIterHandler._read(message, queues[stream_id], ready))
+            for stream_id, message in messages.items()
+        ]
+        try:
+            while queues:
+                ready.clear()
+                ended = 0
+                for stream_id, queue in list(queues.items()):
+                    for _ in range(min(queue.qsize(), max_batch_size)):
+                        msg = queue.get_nowait()
+                        if isinstance(msg, _EndOfStream):
+                            if msg.error is not None:
+                                raise msg.error
+                            del queues[stream_id]
+                            ended += 1
+                            break
+                        yield stream_id, msg
+                # The end of a data stream is reported after the round, so the others still get their turn
+                for _ in range(ended):
+                    yield "stop", None
+                if queues and not any(queue.qsize() for queue in queues.values()):
+                    await ready.wait()
+        finally:
+            for reader in readers:
+                reader.cancel()
@@ -0,0 +1,295 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Utilities to replay historic data of the StreamPipes data lake before switching to the live data of a data stream.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from streampipes.client.client import StreamPipesClient
+
+__all__ = [
+    "BackfillConfig",
+    "ReplayBoundary",
+    "dataframe_to_events",
+    "fetch_historic_events",
+    "merge_events",
+]
+
+
+@dataclass
+class BackfillConfig:
+    """Configures the replay of historic data for a data stream required by a StreamPipes Function.
+
+    Parameters
+    ----------
+    measure_name: str
+        Name of the data lake measure that persists the data stream.
+    start_date: datetime
+        Only historic events that are younger than this point in time are replayed.
+    timestamp_field: str
+        Runtime name of the timestamp property of the data stream.
+    page_size: int
+        Number of records that are queried from the data lake at once.
+    """
+
+    measure_name: str
+    start_date: datetime
+    timestamp_field: str = "timestamp"
+    page_size: int = 10000
+
+
+def fetch_historic_events(client: StreamPipesClient, config: BackfillConfig) -> Iterator[Dict[str, Any]]:
+    """Pages through a data lake measure in ascending order of time and yields its records as events.
+
+    Records are returned in the same representation as live events,
+    i.e., as dictionaries with the timestamp as unix timestamp in milliseconds.
+    Paging stops as soon as a page contains less than `page_size` records, i.e., when the most recent
+    persisted record has been reached.
+
+    Parameters
+    ----------
+    client: StreamPipesClient
+        The client to query the data lake.
+    config: BackfillConfig
+        The configuration of the replay.
+
+    Yields
+    ------
+    event: Dict[str, Any]
+        A historic event
+    """
+
+    offset = 0
+    while True:
+        query_result = client.dataLakeMeasureApi.get(
+            identifier=config.measure_name,
+            start_date=config.start_date,  # type: ignore
+            limit=config.page_size,  # type: ignore
+            offset=offset,  # type: ignore
+            order="ASC",  # type: ignore
+        )
+        if not query_result.all_data_series:
+            return
+
+        df = query_result.to_pandas()
+        if config.timestamp_field != "timestamp":
+            df = df.rename(columns={"timestamp": config.timestamp_field})
+
+        yield from dataframe_to_events(df, timestamp_field=config.timestamp_field)
+
+        if len(df) < config.page_size:
+            return
+        offset += config.page_size
+
+
+def dataframe_to_events(
+    df: pd.DataFrame, timestamp_field: str = "timestamp", chunk_size: int = 10000
+) -> Iterator[Dict[str, Any]]:
+    """Yields the rows of a data frame as events.
+
+    Datetime values of the timestamp column are converted to unix timestamps in milliseconds
+    to match the representation of live events.
+    The data frame is converted in chunks to limit the memory required for large data frames.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The data frame containing one event per row.
+    timestamp_field: str
+        Name of the timestamp column.
+    chunk_size: int
+        Number of rows that are converted at once.
+
+    Yields
+    ------
+    event: Dict[str, Any]
+        The event of a row
+    """
+    for start in range(0, len(df), chunk_size):
+        end = start + chunk_size
+        chunk = df.iloc[start:end]
+        if timestamp_field in chunk.columns and pd.api.types.is_datetime64_any_dtype(chunk[timestamp_field]):
+            chunk = chunk.assign(**{timestamp_field: chunk[timestamp_field].astype("int64") // 10**6})
+        yield from chunk.to_dict(orient="records")  # type: ignore
+
+
+def merge_events(
+    events: Dict[str, Iterator[Dict[str, Any]]], timestamp_fields: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Merges the time-ordered events of multiple streams into a single stream ordered by timestamp.
+
+    Parameters
+    ----------
+    events: Dict[str, Iterator[Dict[str, Any]]]
+        The time-ordered events per stream id.
+    timestamp_fields: Optional[Dict[str, str]]
+        Name of the timestamp property per stream id (default: `timestamp`).
+
+    Yields
+    ------
+    event: Tuple[str, Dict[str, Any]]
+        Tuple of the stream id and the event
+    """
+
+    def tag_events(stream_id: str, stream_events: Iterator[Dict[str, Any]]) -> Iterator[Tuple[int, str, Dict]]:
+        """Prefixes the events of a stream with their timestamp to be merged by it.
+
+        Parameters
+        ----------
+        stream_id: str
+            The id of the stream.
+        stream_events: Iterator[Dict[str, Any]]
+            The time-ordered events of the stream.
+
+        Yields
+        ------
+        tagged_event: Tuple[int, str, Dict]
+            Tuple of the timestamp, the stream id and the event
+        """
+        timestamp_field = (timestamp_fields or {}).get(stream_id, "timestamp")
+        for event in stream_events:
+            yield event.get(timestamp_field) or 0, stream_id, event
+
+    tagged_events = [tag_events(stream_id, stream_events) for stream_id, stream_events in events.items()]
+    for _, stream_id, event in heapq.merge(*tagged_events, key=lambda item: item[0]):
+        yield stream_id, event
+
+
+class ReplayBoundary:
+    """Tracks the most recent replayed event of a data stream to seamlessly switch over to the live data.
+
+    Live events that are older than the last replayed event or equal to one replayed at the same timestamp
+    have already been delivered with the historic data and are reported as duplicates.
+
+    Parameters
+    ----------
+    timestamp_field: str
+        Runtime name of the timestamp property of the data stream.
+    """
+
+    def __init__(self, timestamp_field: str) -> None:
+        self.timestamp_field = timestamp_field
+        self.last_timestamp: Optional[int] = None
+        self.events_at_last_timestamp: List[Dict[str, Any]] = []
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """Registers a replayed event.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The replayed event.
+
+        Returns
+        -------
+        None
+        """
+        timestamp = event.get(self.timestamp_field)
+        if timestamp != self.last_timestamp:
+            self.last_timestamp = timestamp
+            self.events_at_last_timestamp = []
+        # copy the event since functions are free to modify the events they receive
+        self.events_at_last_timestamp.append(dict(event))
+
+    def is_duplicate(self, event: Dict[str, Any]) -> bool:
+        """Checks whether a live event has already been delivered as part of the replay.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The live event.
+
+        Returns
+        -------
+        is_duplicate: bool
+            `True` if the event has already been replayed.
+        """
+        timestamp = event.get(self.timestamp_field)
+        if self.last_timestamp is None or timestamp is None or timestamp > self.last_timestamp:
+            return False
+        if timestamp < self.last_timestamp:
+            return True
+        # the data lake might not persist all properties, therefore only shared properties are compared
+        return any(
+            all(_same_value(event[key], value) for key, value in replayed.items() if key in event)
+            for replayed in self.events_at_last_timestamp
+        )
+
+    def is_passed(self, event: Dict[str, Any]) -> bool:
+        """Checks whether a live event is younger than all replayed events.
+
+        Once this is the case, no further live event can be a duplicate.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The live event.
+
+        Returns
+        -------
+        is_passed: bool
+            `True` if the event is younger than the last replayed event.
+        """
+        timestamp = event.get(self.timestamp_field)
+        return self.last_timestamp is None or (timestamp is not None and timestamp > self.last_timestamp)
+
+
+def _same_value(live: Any, replayed: Any) -> bool:
+    """Helper function to compare a property of a live event with the one of a replayed event.
+
+    Missing values are represented as `None` in live events but as `NaN` or `pd.NA` in replayed events,
+    which never compare equal. Therefore, missing values are considered to be the same.
+
+    Parameters
+    ----------
+    live: Any
+        The value of the live event.
+    replayed: Any
+        The value of the replayed event.
+
+    Returns
+    -------
+    same: bool
+        `True` if both values are equal or both are missing.
+    """
+    live_missing = _is_missing(live)
+    replayed_missing = _is_missing(replayed)
+    if live_missing or replayed_missing:
+        return live_missing and replayed_missing
+    return bool(live == replayed)
+
+
+def _is_missing(value: Any) -> bool:
+    """Helper function to check whether a value represents a missing value.
+
+    Parameters
+    ----------
+    value: Any
+        The value to check.
+
+    Returns
+    -------
+    missing: bool
+        `True` if the value is `None`, `pd.NA` or `NaN`.
+    """
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
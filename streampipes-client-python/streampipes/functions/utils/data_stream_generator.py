@@ -103,6 +103,22 @@ def create_data_stream(
                 port=9092,
             )
         ]
+    elif broker == SupportedBroker.MQTT:
+        transport_protocols = [
+            TransportProtocol(
+                class_name="org.apache.streampipes.model.grounding.MqttTransportProtocol",  # type: ignore
+                broker_hostname="mosquitto",
+                port=1883,
+            )
+        ]
+    elif broker == SupportedBroker.IN_MEMORY:
+        # Only known by the Python client, in-memory data streams are never sent to the backend
+        transport_protocols = [
+            TransportProtocol(
+                class_name="org.apache.streampipes.model.grounding.InMemoryTransportProtocol",  # type: ignore
+                broker_hostname="localhost",
+            )
+        ]
 
     data_stream = DataStream(
         name=name, event_schema=event_schema, event_grounding=EventGrounding(transport_protocols=transport_protocols)
@@ -0,0 +1,286 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Decoders that convert the events of a data stream into typed representations based on its event schema.
+"""
+
+import keyword
+import logging
+import re
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+import numpy as np
+from streampipes.model.common import EventSchema
+
+__all__ = ["EventDecoder", "EventFormat", "EventView"]
+
+logger = logging.getLogger(__name__)
+
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+
+# maps the runtime types of the StreamPipes event schema to the Python type and the NumPy dtype
+_RUNTIME_TYPES: Dict[str, Tuple[type, str]] = {
+    f"{_XSD}string": (str, "O"),
+    f"{_XSD}boolean": (bool, "?"),
+    f"{_XSD}float": (float, "f4"),
+    f"{_XSD}double": (float, "f8"),
+    f"{_XSD}integer": (int, "i4"),
+    f"{_XSD}long": (int, "i8"),
+}
+
+
+class EventFormat(Enum):
+    """Representations of the events passed to `onEvent`.
+
+    Attributes
+    ----------
+    DICT
+        The decoded JSON object as it is.
+    TYPED_DICT
+        A dictionary with a value of the runtime type for every property of the event schema.
+    RECORD
+        A named tuple with a typed attribute for every property of the event schema.
+    VIEW
+        A preallocated [EventView][streampipes.functions.utils.event_decoder.EventView] that is overwritten
+        by every event, so that no object is allocated per event. It is only valid within `onEvent`.
+    """
+
+    DICT = "dict"
+    TYPED_DICT = "typed_dict"
+    RECORD = "record"
+    VIEW = "view"
+
+
+def _to_bool(value: Any) -> bool:
+    """Helper function to convert a value to a boolean, which might be encoded as string."""
+    if isinstance(value, str):
+        if value.lower() in ("true", "1"):
+            return True
+        if value.lower() in ("false", "0"):
+            return False
+        raise ValueError(f"Invalid boolean value: {value!r}")
+    return bool(value)
+
+
+class EventView:
+    """Reusable container for the typed values of an event with an attribute for every property of the event schema.
+
+    The attributes are stored in `__slots__`, the concrete class is generated per event schema.
+    As the container is overwritten by the next event, events that need to be kept,
+    e.g. in a buffer, have to be copied via `to_record()` or `to_dict()`.
+    """
+
+    __slots__ = ()
+
+    _record_type: Type[tuple]
+    _attribute_names: Tuple[str, ...]
+    _runtime_names: Tuple[str, ...]
+
+    def to_record(self) -> tuple:
+        """Copies the values into a record.
+
+        Returns
+        -------
+        record: tuple
+            A named tuple with the same attributes.
+        """
+        return self._record_type(*[getattr(self, name) for name in self._attribute_names])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copies the values into a dictionary.
+
+        Returns
+        -------
+        event: Dict[str, Any]
+            The values by the runtime names of their properties.
+        """
+        return {
+            runtime_name: getattr(self, name) for runtime_name, name in zip(self._runtime_names, self._attribute_names)
+        }
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name, None)!r}" for name in self._attribute_names)
+        return f"{self.__class__.__name__}({values})"
+
+
+class EventDecoder:
+    """Converts events into a typed representation according to the event schema of a data stream.
+
+    The conversion routine is generated and compiled once per data stream. It accesses every property
+    of the schema directly, values that already have the runtime type of their property are passed through,
+    all others are converted. Properties missing in an event are set to `None`,
+    properties that are not part of the schema are dropped.
+
+    Parameters
+    ----------
+    event_schema: EventSchema
+        The event schema of the data stream.
+    event_format: EventFormat
+        The representation to be created, either `TYPED_DICT`, `RECORD` or `VIEW`.
+    fields: Optional[Iterable[str]]
+        Runtime names of the properties to be decoded, all properties of the schema by default.
+
+    Attributes
+    ----------
+    record_type: Type[tuple]
+        The named tuple created for the events, its attribute names are the runtime names
+        with characters that are not allowed in identifiers replaced by underscores.
+    view: Optional[EventView]
+        The preallocated container returned by `decode()` in the format `VIEW`.
+    dtype: np.dtype
+        The NumPy structured dtype of the records, e.g. to be used with `to_numpy()`.
+
+    Examples
+    --------
+    ```python
+    decoder = EventDecoder(data_stream.event_schema, EventFormat.RECORD)
+    record = decoder.decode({"timestamp": 1670000000000, "temperature": 20})
+    record.temperature
+    ```
+    """
+
+    def __init__(
+        self, event_schema: EventSchema, event_format: EventFormat, fields: Optional[Iterable[str]] = None
+    ) -> None:
+        if event_format == EventFormat.DICT:
+            raise ValueError("Events in the format DICT do not need to be decoded.")
+        self.event_format = event_format
+        selected = None if fields is None else set(fields)
+        self.properties: List[Tuple[str, type, str]] = []
+        seen = set()
+        for event_property in event_schema.event_properties:
+            if event_property.runtime_name in seen or (
+                selected is not None and event_property.runtime_name not in selected
+            ):
+                continue
+            seen.add(event_property.runtime_name)
+            if event_property.runtime_type not in _RUNTIME_TYPES:
+                logger.warning(
+                    f"The property {event_property.runtime_name} of the unsupported runtime type "
+                    f"{event_property.runtime_type} is not converted."
+                )
+            python_type, dtype = _RUNTIME_TYPES.get(event_property.runtime_type, (object, "O"))
+            self.properties.append((event_property.runtime_name, python_type, dtype))
+
+        attribute_names = [self._attribute_name(name) for name, _, _ in self.properties]
+        if len(set(attribute_names)) != len(attribute_names):
+            raise ValueError(f"The runtime names {[name for name, _, _ in self.properties]} are ambiguous.")
+        self.record_type: Type[tuple] = NamedTuple(  # type: ignore[misc, assignment]
+            "Event",
+            [
+                (attribute_name, Optional[python_type])
+                for attribute_name, (_, python_type, _) in zip(attribute_names, self.properties)
+            ],
+        )
+        self.view: Optional[EventView] = None
+        if event_format == EventFormat.VIEW:
+            view_type = type(
+                "EventView",
+                (EventView,),
+                {
+                    "__slots__": tuple(attribute_names),
+                    "_attribute_names": tuple(attribute_names),
+                    "_record_type": self.record_type,
+                    "_runtime_names": tuple(name for name, _, _ in self.properties),
+                },
+            )
+            self.view = view_type()
+        self.dtype = np.dtype([(name, dtype) for name, _, dtype in self.properties])
+        self.decode: Callable[[Dict[str, Any]], Any] = self._compile(event_format, attribute_names)
+        self._decode_record = (
+            self.decode if event_format == EventFormat.RECORD else self._compile(EventFormat.RECORD, attribute_names)
+        )
+
+    @staticmethod
+    def _attribute_name(runtime_name: str) -> str:
+        """Helper function to derive a valid attribute name of the record from a runtime name."""
+        name = re.sub(r"\W", "_", runtime_name)
+        if not name or name[0].isdigit() or name[0] == "_" or keyword.iskeyword(name):
+            name = f"p_{name}"
+        return name
+
+    def _compile(self, event_format: EventFormat, attribute_names: List[str]) -> Callable[[Dict[str, Any]], Any]:
+        """Helper function to generate and compile the conversion routine.
+
+        Parameters
+        ----------
+        event_format: EventFormat
+            The representation to be created.
+        attribute_names: List[str]
+            The attribute names of the properties.
+
+        Returns
+        -------
+        decode: Callable[[Dict[str, Any]], Any]
+            The routine converting an event.
+        """
+        namespace: Dict[str, Any] = {"Record": self.record_type, "view": self.view, "_to_bool": _to_bool}
+        lines = ["def decode(event):", "    get = event.get"]
+        values = []
+        for index, (name, python_type, _) in enumerate(self.properties):
+            variable = f"v{index}"
+            lines.append(f"    {variable} = get({name!r})")
+            if python_type is object:
+                values.append(variable)
+                continue
+            converter = "_to_bool" if python_type is bool else python_type.__name__
+            namespace[python_type.__name__] = python_type
+            values.append(
+                f"{variable} if {variable} is None or {variable}.__class__ is {python_type.__name__} "
+                f"else {converter}({variable})"
+            )
+        lines.append("    try:")
+        if event_format == EventFormat.RECORD:
+            lines.append(f"        return Record({', '.join(f'({value})' for value in values)})")
+        elif event_format == EventFormat.VIEW:
+            lines.extend(f"        view.{name} = {value}" for name, value in zip(attribute_names, values))
+            lines.append("        return view")
+        else:
+            items = ", ".join(f"{name!r}: ({value})" for (name, _, _), value in zip(self.properties, values))
+            lines.append(f"        return {{{items}}}")
+        lines.append("    except (TypeError, ValueError) as err:")
+        lines.append("        raise ValueError(f'The event {event} does not match the event schema: {err}') from err")
+
+        exec("\n".join(lines), namespace)
+        return namespace["decode"]
+
+    def to_numpy(self, events: Iterable[Dict[str, Any]]) -> np.ndarray:
+        """Converts a batch of events into a NumPy structured array with a column per property.
+
+        Missing values are only supported for properties of the runtime types `float` and `double`,
+        where they are represented as `nan`.
+
+        Parameters
+        ----------
+        events: Iterable[Dict[str, Any]]
+            The events to be converted.
+
+        Returns
+        -------
+        array: np.ndarray
+            The structured array with the dtype `dtype`.
+        """
+        decode = self._decode_record
+        nan_columns = [index for index, (_, _, dtype) in enumerate(self.properties) if dtype[0] == "f"]
+        rows = []
+        for event in events:
+            row = decode(event)
+            if nan_columns and None in row:
+                row = tuple(np.nan if value is None and i in nan_columns else value for i, value in enumerate(row))
+            rows.append(row)
+        return np.array(rows, dtype=self.dtype)
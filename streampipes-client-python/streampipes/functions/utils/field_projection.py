@@ -0,0 +1,126 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Decoding of only those properties of an event that are read by the functions.
+"""
+
+import json
+from json.decoder import WHITESPACE  # type: ignore
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from streampipes.model.common import EventSchema
+
+__all__ = ["FieldProjection"]
+
+_PRIMITIVE_PROPERTY = "org.apache.streampipes.model.schema.EventPropertyPrimitive"
+
+_scan_once = json.JSONDecoder().scan_once  # type: ignore[attr-defined]
+_skip_whitespace = WHITESPACE.match
+
+
+class FieldProjection:
+    """Decodes only the given properties of JSON encoded events.
+
+    Instead of decoding the complete event, the encoded properties are looked up by their key
+    and only their values are decoded. A key can only be found unambiguously if the event has
+    no nested objects, therefore the lookup is only used if the event schema consists of primitive
+    properties. Otherwise, as well as for unexpected encodings, the complete event is decoded
+    and the properties are selected afterwards.
+
+    Parameters
+    ----------
+    fields: Iterable[str]
+        Runtime names of the properties to be decoded.
+    event_schema: Optional[EventSchema]
+        The schema of the events, the lookup of the encoded properties is disabled without schema.
+    """
+
+    def __init__(self, fields: Iterable[str], event_schema: Optional[EventSchema] = None) -> None:
+        self.fields: FrozenSet[str] = frozenset(fields)
+        self.flat = event_schema is not None and all(
+            event_property.class_name == _PRIMITIVE_PROPERTY for event_property in event_schema.event_properties
+        )
+        self._patterns: List[Tuple[str, str]] = [(field, json.dumps(field) + ":") for field in sorted(self.fields)]
+
+    def decode(self, data: str) -> Dict[str, Any]:
+        """Decodes the properties of the projection from a JSON encoded event.
+
+        Properties missing in the event are missing in the result as well.
+
+        Parameters
+        ----------
+        data: str
+            The JSON encoded event.
+
+        Returns
+        -------
+        event: Dict[str, Any]
+            The projected event.
+        """
+        if self.flat:
+            event = self._lookup(data)
+            if event is not None:
+                return event
+        return self.project(json.loads(data))
+
+    def project(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Selects the properties of the projection from a decoded event.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The decoded event.
+
+        Returns
+        -------
+        event: Dict[str, Any]
+            A new event containing only the properties of the projection.
+        """
+        return {field: value for field, value in event.items() if field in self.fields}
+
+    def _lookup(self, data: str) -> Optional[Dict[str, Any]]:
+        """Helper function to decode the values of the encoded properties of a flat event.
+
+        Parameters
+        ----------
+        data: str
+            The JSON encoded event.
+
+        Returns
+        -------
+        event: Optional[Dict[str, Any]]
+            The projected event or `None` if the encoding can not be handled.
+        """
+        event = {}
+        for field, pattern in self._patterns:
+            index = data.find(pattern)
+            if index < 0:
+                # the key might be followed by whitespace or be encoded differently
+                if f'"{field}"' in data:
+                    return None
+                continue
+            # a key follows the opening brace or a comma, which rules out matches within string values
+            preceding = index - 1
+            while preceding >= 0 and data[preceding] in " \t\n\r":
+                preceding -= 1
+            if preceding < 0 or data[preceding] not in "{,":
+                return None
+            try:
+                event[field], _ = _scan_once(data, _skip_whitespace(data, index + len(pattern)).end())
+            except StopIteration:
+                return None
+        return event
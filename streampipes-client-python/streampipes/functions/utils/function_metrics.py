@@ -0,0 +1,351 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FunctionMetrics",
+]
+
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# name: (type, description, label names)
+_METRICS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "streampipes_function_events_in_total": (
+        "counter",
+        "Number of events passed to a function.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_function_events_out_total": (
+        "counter",
+        "Number of events sent by a function to an output data stream.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_function_on_event_seconds": (
+        "histogram",
+        "Time spent in onEvent of a function.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_function_decode_seconds": (
+        "histogram",
+        "Time spent decoding a received message into an event.",
+        ("stream_id",),
+    ),
+    "streampipes_function_publish_seconds": (
+        "histogram",
+        "Time spent publishing an event to the broker of an output data stream, averaged over a published batch.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_function_receive_lag_seconds": (
+        "histogram",
+        "Time from the timestamp of an event until it is received from the broker.",
+        ("stream_id",),
+    ),
+    "streampipes_function_exit_lag_seconds": (
+        "histogram",
+        "Time from the timestamp of an event until it has been processed by a function.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_function_output_lag_seconds": (
+        "histogram",
+        "Time from the timestamp of an input event until an output event is sent while processing it.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_broker_dropped_messages_total": (
+        "counter",
+        "Number of messages of a data stream dropped by the broker client because they were consumed too slowly.",
+        ("stream_id", "broker"),
+    ),
+    "streampipes_function_outbound_queue_depth": (
+        "gauge",
+        "Number of events of an output data stream waiting to be published.",
+        ("function_id", "stream_id"),
+    ),
+    "streampipes_broker_pending_messages": (
+        "gauge",
+        "Number of messages of a data stream not yet received, i.e. the consumer lag for Kafka "
+        "or the pending messages of the subscription for NATS.",
+        ("stream_id", "broker"),
+    ),
+}
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, LabelValues, float]
+
+
+class FunctionMetrics:
+    """Collects metrics of StreamPipes Functions and exposes them in the Prometheus text format.
+
+    Counters and histograms are updated while the events are processed,
+    gauges that are expensive to determine are provided by collectors, which are only called on a scrape.
+
+    Parameters
+    ----------
+    buckets: Sequence[float]
+        Upper bounds of the histogram buckets in seconds.
+
+    Examples
+    --------
+    ```python
+    function_handler = FunctionHandler(registration, client, metrics=FunctionMetrics())
+    function_handler.metrics.start_server(port=8000)
+    function_handler.initializeFunctions()
+    ```
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[str, Dict[LabelValues, float]] = {}
+        self._histograms: Dict[str, Dict[LabelValues, List[float]]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._pages: Dict[str, Callable[[], str]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def inc(self, name: str, labels: LabelValues, value: float = 1.0) -> None:
+        """Increments a counter.
+
+        Parameters
+        ----------
+        name: str
+            The name of the counter.
+        labels: Tuple[str, ...]
+            The label values in the order of the label names.
+        value: float
+            The amount to increment the counter by.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            values = self._values.setdefault(name, {})
+            values[labels] = values.get(labels, 0.0) + value
+
+    def set(self, name: str, labels: LabelValues, value: float) -> None:
+        """Sets a gauge.
+
+        Parameters
+        ----------
+        name: str
+            The name of the gauge.
+        labels: Tuple[str, ...]
+            The label values in the order of the label names.
+        value: float
+            The current value of the gauge.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._values.setdefault(name, {})[labels] = value
+
+    def observe(self, name: str, labels: LabelValues, value: float) -> None:
+        """Adds an observation to a histogram.
+
+        Parameters
+        ----------
+        name: str
+            The name of the histogram.
+        labels: Tuple[str, ...]
+            The label values in the order of the label names.
+        value: float
+            The observed value in seconds.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            histograms = self._histograms.setdefault(name, {})
+            histogram = histograms.get(labels)
+            if histogram is None:
+                # counts per bucket followed by the count of +Inf and the sum
+                histogram = histograms[labels] = [0.0] * (len(self.buckets) + 2)
+            histogram[bisect_left(self.buckets, value)] += 1
+            histogram[-1] += value
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Adds a collector, which provides gauge samples on every scrape.
+
+        Parameters
+        ----------
+        collector: Callable[[], Iterable[Tuple[str, Tuple[str, ...], float]]]
+            Callable returning samples as tuple of the gauge name, its label values and value.
+
+        Returns
+        -------
+        None
+        """
+        self._collectors.append(collector)
+
+    def add_page(self, path: str, page: Callable[[], str]) -> None:
+        """Adds a plain text page to the HTTP server, e.g., to provide profiling results.
+
+        Parameters
+        ----------
+        path: str
+            The path the page is served at.
+        page: Callable[[], str]
+            Callable returning the content of the page on every request.
+
+        Returns
+        -------
+        None
+        """
+        self._pages[path] = page
+
+    def render(self) -> str:
+        """Renders all metrics in the Prometheus text format.
+
+        Returns
+        -------
+        metrics: str
+            The metrics in the Prometheus text format.
+        """
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    self.set(name, labels, value)
+            except Exception:
+                logger.exception("Failed to collect metrics")
+
+        with self._lock:
+            values = {name: dict(samples) for name, samples in self._values.items()}
+            histograms = {name: {k: list(v) for k, v in samples.items()} for name, samples in self._histograms.items()}
+
+        lines: List[str] = []
+        for name, (metric_type, description, label_names) in _METRICS.items():
+            if name not in values and name not in histograms:
+                continue
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in values.get(name, {}).items():
+                lines.append(f"{name}{_format_labels(label_names, labels)} {value}")
+            for labels, histogram in histograms.get(name, {}).items():
+                cumulative = 0.0
+                for bound, count in zip(self.buckets + (float("inf"),), histogram):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(label_names + ('le',), labels + (le,))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(label_names, labels)} {histogram[-1]}")
+                lines.append(f"{name}_count{_format_labels(label_names, labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def start_server(self, port: int, host: str = "") -> None:
+        """Starts a local HTTP server in a background thread.
+
+        It serves the metrics in the Prometheus text format at `/metrics`
+        as well as the pages added via `add_page()`.
+
+        Parameters
+        ----------
+        port: int
+            The port of the HTTP server.
+        host: str
+            The address the HTTP server binds to, defaults to all interfaces.
+
+        Returns
+        -------
+        None
+        """
+        if self._server is not None:
+            return
+        metrics = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            """Serves the metrics and the added pages."""
+
+            def do_GET(self) -> None:
+                """Responds to a GET request with the requested page or with `404` if the page is unknown.
+
+                Returns
+                -------
+                None
+                """
+                path = self.path.split("?")[0]
+                if path == "/metrics":
+                    body = metrics.render().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path in metrics._pages:
+                    body = metrics._pages[path]().encode("utf-8")
+                    content_type = "text/plain; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                """Logs the requests on debug level instead of writing them to stderr.
+
+                Parameters
+                ----------
+                format: str
+                    The format string of the message.
+                args: Any
+                    The arguments of the format string.
+
+                Returns
+                -------
+                None
+                """
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        threading.Thread(target=self._server.serve_forever, name="streampipes-metrics", daemon=True).start()
+        logger.info(f"Serving metrics at http://{host or '0.0.0.0'}:{self._server.server_port}/metrics")
+
+    def stop_server(self) -> None:
+        """Stops the HTTP server serving the metrics.
+
+        Returns
+        -------
+        None
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: LabelValues) -> str:
+    """Formats labels in the Prometheus text format.
+
+    Parameters
+    ----------
+    label_names: Tuple[str, ...]
+        The names of the labels.
+    label_values: Tuple[str, ...]
+        The values of the labels.
+
+    Returns
+    -------
+    labels: str
+        The formatted labels.
+    """
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in label_values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(label_names, escaped)) + "}"
@@ -0,0 +1,269 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Sampling profiler to find the hot spots of running StreamPipes Functions.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import threading
+from typing import Dict, List, Optional
+
+__all__ = [
+    "FunctionProfiler",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class FunctionProfiler:
+    """Profiles the processing of every n-th event of each function with cProfile.
+
+    The sampled processing covers decoding the message, `onEvent` and everything it calls synchronously,
+    e.g., sending output events. Events passed in-process to other functions while a sampled event is processed
+    are part of its profile, as only one profile can be active at a time. Since only a fraction of the events
+    is profiled, the overhead stays low and the profiler can be switched on in production, either via
+    the environment variable `FUNCTION-PROFILING` or by sending the signal `SIGUSR1` to the process.
+    The profiles are only read between sampled events on the thread processing them, other threads
+    like the metrics server get a summary cached there via `cached_summary()`.
+
+    Parameters
+    ----------
+    sample_interval: int
+        Every `sample_interval`-th event of a function is profiled.
+    output_dir: Optional[str]
+        Directory the profiles are written to as `<function_id>.prof` when profiling is stopped.
+        They can be inspected with `pstats` or tools like `snakeviz`. Nothing is written if not provided.
+    enabled: bool
+        Defines whether the profiler starts sampling right away.
+
+    Examples
+    --------
+    ```python
+    profiler = FunctionProfiler(sample_interval=100, output_dir="/tmp/profiles")
+    function_handler = FunctionHandler(registration, client, profiler=profiler)
+    function_handler.initializeFunctions()
+
+    # later on
+    print(profiler.summary())
+    ```
+    """
+
+    ENV_VARIABLE = "FUNCTION-PROFILING"
+    DEFAULT_SAMPLE_INTERVAL = 100
+
+    def __init__(
+        self, sample_interval: int = DEFAULT_SAMPLE_INTERVAL, output_dir: Optional[str] = None, enabled: bool = True
+    ) -> None:
+        if sample_interval < 1:
+            raise ValueError("The sample interval needs to be at least 1.")
+        self.sample_interval = sample_interval
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._counters: Dict[str, int] = {}
+        self._samples: Dict[str, int] = {}
+        # the function whose event is being profiled
+        self._active: Optional[str] = None
+        # profiling has been switched off while an event was being profiled
+        self._switch_off_pending = False
+        self._summary = "No summary available yet, it is created after the next sampled event.\n"
+        self._summary_requested = False
+
+    @classmethod
+    def from_env(cls) -> Optional["FunctionProfiler"]:
+        """Creates a profiler if it is requested by the environment variable `FUNCTION-PROFILING`.
+
+        The value of the variable is the sample interval, any other value than an integer uses the default interval.
+        The profiles are written to the directory given by `FUNCTION-PROFILING-DIR`, if it is set.
+
+        Returns
+        -------
+        profiler: Optional[FunctionProfiler]
+            The profiler or `None` if profiling is not requested.
+        """
+        value = os.environ.get(cls.ENV_VARIABLE, "").strip()
+        if value.lower() in ("", "0", "false"):
+            return None
+        sample_interval = int(value) if value.isdigit() else cls.DEFAULT_SAMPLE_INTERVAL
+        return cls(sample_interval=sample_interval, output_dir=os.environ.get(f"{cls.ENV_VARIABLE}-DIR"))
+
+    def install_signal_handler(self, signal_number: int = getattr(signal, "SIGUSR1", 0)) -> bool:
+        """Toggles the profiler whenever the process receives the given signal.
+
+        Signal handlers can only be installed from the main thread and `SIGUSR1` is not available on Windows.
+
+        Parameters
+        ----------
+        signal_number: int
+            The signal that toggles the profiler.
+
+        Returns
+        -------
+        installed: bool
+            Whether the signal handler was installed.
+        """
+        if not signal_number or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal_number, lambda *_: self.toggle())
+        return True
+
+    def toggle(self) -> None:
+        """Switches the profiler on or off. When switched off, the profiles are written to the output directory.
+
+        If an event is being profiled, e.g. when called by the signal handler, the profiles are written
+        after the event has been processed.
+
+        Returns
+        -------
+        None
+        """
+        self.enabled = not self.enabled
+        logger.info(f"Function profiling {'enabled' if self.enabled else 'disabled'}")
+        if not self.enabled:
+            if self._active is not None:
+                self._switch_off_pending = True
+            else:
+                self._switch_off()
+
+    def _switch_off(self) -> None:
+        """Writes the profiles and caches the final summary once profiling has been switched off.
+
+        Returns
+        -------
+        None
+        """
+        self._summary = self.summary()
+        if self.output_dir is not None:
+            self.dump(self.output_dir)
+
+    def start(self, function_id: str) -> bool:
+        """Starts profiling the processing of an event if it is sampled.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function processing the event.
+
+        Returns
+        -------
+        sampled: bool
+            Whether the event is profiled, in this case `stop()` needs to be called after processing it.
+        """
+        if not self.enabled or self._active is not None:
+            return False
+        counter = self._counters.get(function_id, 0)
+        self._counters[function_id] = counter + 1
+        if counter % self.sample_interval:
+            return False
+        profile = self._profiles.get(function_id)
+        if profile is None:
+            profile = self._profiles[function_id] = cProfile.Profile()
+        # marked as active before profiling, so that the profile is never read while it is enabled
+        self._active = function_id
+        profile.enable()
+        return True
+
+    def stop(self, function_id: str) -> None:
+        """Stops profiling the processing of a sampled event.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function that processed the event.
+
+        Returns
+        -------
+        None
+        """
+        self._profiles[function_id].disable()
+        self._active = None
+        self._samples[function_id] = self._samples.get(function_id, 0) + 1
+        if self._switch_off_pending:
+            self._switch_off_pending = False
+            self._switch_off()
+        elif self._summary_requested:
+            self._summary_requested = False
+            self._summary = self.summary()
+
+    def cached_summary(self) -> str:
+        """Get the summary created after the last sampled event, which can be called from any thread.
+
+        Every call requests a new summary, which is created after the next sampled event.
+        When profiling is switched off, the final summary is cached.
+
+        Returns
+        -------
+        summary: str
+            The profiling statistics sorted by cumulative time per function.
+        """
+        self._summary_requested = True
+        return self._summary
+
+    def summary(self, limit: int = 20) -> str:
+        """Get the hot spots of every function.
+
+        Reading the profiles disables them, so the summary has to be created between sampled events
+        on the thread processing them. Use `cached_summary()` from other threads.
+
+        Parameters
+        ----------
+        limit: int
+            Maximum number of entries listed per function.
+
+        Returns
+        -------
+        summary: str
+            The profiling statistics sorted by cumulative time per function.
+        """
+        stream = io.StringIO()
+        for function_id, profile in list(self._profiles.items()):
+            stream.write(f"Function {function_id}: {self._samples.get(function_id, 0)} sampled event(s)\n")
+            try:
+                pstats.Stats(profile, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+            except TypeError:
+                # no sampled event has been processed completely yet
+                stream.write("No statistics collected yet.\n\n")
+        return stream.getvalue()
+
+    def dump(self, output_dir: str) -> List[str]:
+        """Writes the profile of every function to a file.
+
+        Like `summary()`, the profiles are written between sampled events on the thread processing them.
+
+        Parameters
+        ----------
+        output_dir: str
+            The directory the profiles are written to as `<function_id>.prof`.
+
+        Returns
+        -------
+        paths: List[str]
+            The paths of the written files.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for function_id, profile in list(self._profiles.items()):
+            path = os.path.join(output_dir, f"{function_id}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+        logger.info(f"Wrote {len(paths)} function profile(s) to {output_dir}")
+        return paths
@@ -0,0 +1,170 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Utilities to trace the latency of events on their way through StreamPipes Functions.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from streampipes.functions.utils.function_metrics import FunctionMetrics
+
+__all__ = [
+    "EventTrace",
+    "LatencyTracer",
+]
+
+
+class EventTrace:
+    """Timing information of an event that is currently processed by a function.
+
+    Parameters
+    ----------
+    stream_id: str
+        The id of the data stream the event belongs to.
+    input_timestamp: Optional[float]
+        The timestamp of the event in milliseconds since epoch, if the event has one.
+    receive_time: float
+        The point in time the event was received by the function handler in seconds since epoch.
+    decode_seconds: float
+        The time spent decoding the event.
+    """
+
+    __slots__ = ("stream_id", "input_timestamp", "receive_time", "decode_seconds")
+
+    def __init__(
+        self, stream_id: str, input_timestamp: Optional[float], receive_time: float, decode_seconds: float
+    ) -> None:
+        self.stream_id = stream_id
+        self.input_timestamp = input_timestamp
+        self.receive_time = receive_time
+        self.decode_seconds = decode_seconds
+
+
+class LatencyTracer:
+    """Traces the latency of events from their timestamp to the output of a function.
+
+    Based on the timestamp of the input events, the following latencies are recorded as histograms:
+
+    - `streampipes_function_receive_lag_seconds`: from the event timestamp to its receipt from the broker
+    - `streampipes_function_exit_lag_seconds`: from the event timestamp until `onEvent` returns
+    - `streampipes_function_output_lag_seconds`: from the event timestamp to an output event sent while processing it
+
+    Optionally, the timing of the input event is added to the output events as additional fields,
+    so that the latency can be followed across multiple hops.
+
+    Parameters
+    ----------
+    metrics: Optional[FunctionMetrics]
+        The metrics the latencies are recorded in, no histograms are recorded if not provided.
+    timestamp_field: str
+        Runtime name of the timestamp property of the input events.
+    trace_headers: bool
+        Defines whether the timing of the input event is added to the output events.
+    """
+
+    INPUT_TIMESTAMP_FIELD = "trace_input_timestamp"
+    RECEIVE_TIMESTAMP_FIELD = "trace_receive_timestamp"
+    DECODE_MS_FIELD = "trace_decode_ms"
+
+    def __init__(
+        self, metrics: Optional[FunctionMetrics] = None, timestamp_field: str = "timestamp", trace_headers: bool = False
+    ) -> None:
+        self.metrics = metrics
+        self.timestamp_field = timestamp_field
+        self.trace_headers = trace_headers
+
+    def trace_input(
+        self, stream_id: str, event: Dict[str, Any], receive_time: float, decode_seconds: float
+    ) -> EventTrace:
+        """Starts the trace of a received event.
+
+        Parameters
+        ----------
+        stream_id: str
+            The id of the data stream the event belongs to.
+        event: Dict[str, Any]
+            The decoded event.
+        receive_time: float
+            The point in time the event was received in seconds since epoch.
+        decode_seconds: float
+            The time spent decoding the event.
+
+        Returns
+        -------
+        trace: EventTrace
+            The trace of the event.
+        """
+        input_timestamp = event.get(self.timestamp_field)
+        if not isinstance(input_timestamp, (int, float)):
+            input_timestamp = None
+        trace = EventTrace(stream_id, input_timestamp, receive_time, decode_seconds)
+        if self.metrics is not None and input_timestamp is not None:
+            self.metrics.observe(
+                "streampipes_function_receive_lag_seconds", (stream_id,), receive_time - input_timestamp / 1000
+            )
+        return trace
+
+    def trace_exit(self, function_id: str, trace: EventTrace) -> None:
+        """Finishes the trace of an event after it has been processed by a function.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function that processed the event.
+        trace: EventTrace
+            The trace of the event.
+
+        Returns
+        -------
+        None
+        """
+        if self.metrics is not None and trace.input_timestamp is not None:
+            self.metrics.observe(
+                "streampipes_function_exit_lag_seconds",
+                (function_id, trace.stream_id),
+                time.time() - trace.input_timestamp / 1000,
+            )
+
+    def trace_output(self, function_id: str, stream_id: str, trace: EventTrace, event: Dict[str, Any]) -> None:
+        """Traces an output event sent by a function while processing the traced event.
+
+        Parameters
+        ----------
+        function_id: str
+            The id of the function sending the output event.
+        stream_id: str
+            The id of the output data stream.
+        trace: EventTrace
+            The trace of the input event.
+        event: Dict[str, Any]
+            The output event, which already carries its timestamp.
+
+        Returns
+        -------
+        None
+        """
+        if self.metrics is not None and trace.input_timestamp is not None:
+            self.metrics.observe(
+                "streampipes_function_output_lag_seconds",
+                (function_id, stream_id),
+                (event["timestamp"] - trace.input_timestamp) / 1000,
+            )
+        if self.trace_headers:
+            event[self.INPUT_TIMESTAMP_FIELD] = trace.input_timestamp
+            event[self.RECEIVE_TIMESTAMP_FIELD] = int(1000 * trace.receive_time)
+            event[self.DECODE_MS_FIELD] = 1000 * trace.decode_seconds
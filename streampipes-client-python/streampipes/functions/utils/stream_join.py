@@ -0,0 +1,220 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Correlation of the events of two data streams by key and event time.
+"""
+
+import heapq
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+__all__ = ["IntervalJoin"]
+
+
+class IntervalJoin:
+    """Joins the events of two data streams that have the same key and whose timestamps differ by at most `within`.
+
+    The events are buffered per stream and key, sorted by their timestamp, so that the join partners of an event
+    are found by a binary search. The watermark of a stream trails the largest timestamp seen so far
+    by `max_out_of_orderness`, the watermark of the join is the smaller one of both streams,
+    so that a stream running ahead of the other does not cause its events to be dropped. Buffered events that are older
+    than the watermark minus `within` cannot be joined anymore and are evicted, which bounds the memory
+    by the number of events within the join interval. Events that are older than the watermark are dropped
+    and counted in `dropped_events`.
+
+    As long as a stream receives no events, its watermark holds back the one of the join and the events of the
+    other stream are buffered. With `idle_timeout`, a stream without events for that long is considered idle
+    and ignored by the watermark of the join until it receives events again, which are dropped if they are late
+    by then. Setting it bounds the buffers if one of the streams may pause.
+
+    Parameters
+    ----------
+    left_stream_id: str
+        The id of the first data stream.
+    right_stream_id: str
+        The id of the second data stream.
+    key_by: Union[str, Callable[[Dict[str, Any]], Hashable]]
+        Field name or function determining the join key of an event.
+    within: int
+        Maximal difference of the timestamps of two joined events in milliseconds.
+    join_function: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]]
+        Combines an event of the first and an event of the second stream, by default the properties of
+        both events are merged and the later timestamp is kept.
+    timestamp_field: str
+        Runtime name of the timestamp property (milliseconds since epoch).
+    max_out_of_orderness: int
+        Time in milliseconds the watermark trails the largest timestamp seen so far.
+    idle_timeout: Optional[int]
+        Time in milliseconds without events after which a stream is considered idle, measured in processing time.
+        Streams are never considered idle if not set.
+
+    Examples
+    --------
+    ```python
+    join = IntervalJoin("flow-rate", "temperature", key_by="sensorId", within=500)
+
+    def onEvent(self, event: Dict[str, Any], streamId: str) -> None:
+        for joined in join.process(event, streamId):
+            self.add_output("joined", joined)
+    ```
+    """
+
+    def __init__(
+        self,
+        left_stream_id: str,
+        right_stream_id: str,
+        key_by: Union[str, Callable[[Dict[str, Any]], Hashable]],
+        within: int,
+        join_function: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = None,
+        timestamp_field: str = "timestamp",
+        max_out_of_orderness: int = 0,
+        idle_timeout: Optional[int] = None,
+    ) -> None:
+        if left_stream_id == right_stream_id:
+            raise ValueError("A stream can not be joined with itself.")
+        if within < 0 or max_out_of_orderness < 0:
+            raise ValueError("The join interval and the out-of-orderness must not be negative.")
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("The idle timeout needs to be positive.")
+        self.left_stream_id = left_stream_id
+        self.right_stream_id = right_stream_id
+        if callable(key_by):
+            self._key_selector = key_by
+        else:
+            field = key_by
+            self._key_selector = lambda event: event.get(field)
+        self.within = within
+        self.join_function = join_function or self._merge
+        self.timestamp_field = timestamp_field
+        self.max_out_of_orderness = max_out_of_orderness
+        self.idle_timeout = idle_timeout
+
+        self.watermark = float("-inf")
+        self.dropped_events = 0
+        self._stream_watermarks = {left_stream_id: float("-inf"), right_stream_id: float("-inf")}
+        # processing time of the last event per stream in seconds to detect idle streams
+        now = time.monotonic()
+        self._last_seen = {left_stream_id: now, right_stream_id: now}
+        # buffered events per stream and key sorted by (timestamp, sequence)
+        self._buffers: Dict[str, Dict[Hashable, List[Tuple[int, int, Dict[str, Any]]]]] = {
+            left_stream_id: {},
+            right_stream_id: {},
+        }
+        # timestamp of every buffered event to evict the buffers of keys that receive no more events
+        self._expirations: List[Tuple[int, int, str, Hashable]] = []
+        self._sequence = 0
+
+    @property
+    def num_buffered_events(self) -> int:
+        """Number of events kept in the buffers of both streams."""
+        return sum(len(buffer) for buffers in self._buffers.values() for buffer in buffers.values())
+
+    def process(self, event: Dict[str, Any], stream_id: str) -> List[Dict[str, Any]]:
+        """Joins an event with the buffered events of the other stream and buffers it afterwards.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The event to be joined.
+        stream_id: str
+            The id of the data stream the event belongs to.
+
+        Returns
+        -------
+        joined_events: List[Dict[str, Any]]
+            The results of the join function for all join partners of the event.
+        """
+        if stream_id == self.left_stream_id:
+            other_stream_id = self.right_stream_id
+        elif stream_id == self.right_stream_id:
+            other_stream_id = self.left_stream_id
+        else:
+            raise ValueError(f"The stream {stream_id} is not part of the join.")
+
+        if self.idle_timeout is not None:
+            self._last_seen[stream_id] = time.monotonic()
+        timestamp = int(event[self.timestamp_field])
+        if timestamp < self.watermark:
+            self.dropped_events += 1
+            return []
+        key = self._key_selector(event)
+
+        results = []
+        partners = self._buffers[other_stream_id].get(key)
+        if partners:
+            start = bisect_left(partners, (timestamp - self.within,))
+            end = bisect_right(partners, (timestamp + self.within, float("inf")))
+            for _, _, partner in partners[start:end]:
+                if stream_id == self.left_stream_id:
+                    results.append(self.join_function(event, partner))
+                else:
+                    results.append(self.join_function(partner, event))
+
+        self._sequence += 1
+        insort(self._buffers[stream_id].setdefault(key, []), (timestamp, self._sequence, event))
+        heapq.heappush(self._expirations, (timestamp, self._sequence, stream_id, key))
+
+        self.advance_watermark(stream_id, timestamp - self.max_out_of_orderness)
+        return results
+
+    def advance_watermark(self, stream_id: str, watermark: float) -> None:
+        """Advances the watermark of a stream and evicts all buffered events that can not be joined anymore.
+
+        Parameters
+        ----------
+        stream_id: str
+            The id of the data stream.
+        watermark: float
+            The new watermark of the stream in milliseconds since epoch, it is ignored if smaller than the current one.
+
+        Returns
+        -------
+        None
+        """
+        if watermark <= self._stream_watermarks[stream_id]:
+            return
+        self._stream_watermarks[stream_id] = watermark
+        if self.idle_timeout is None:
+            watermark = min(self._stream_watermarks.values())
+        else:
+            # idle streams do not hold back the watermark, the stream advancing its watermark is active
+            min_last_seen = time.monotonic() - self.idle_timeout / 1000
+            watermark = min(
+                w for s, w in self._stream_watermarks.items() if s == stream_id or self._last_seen[s] >= min_last_seen
+            )
+        if watermark <= self.watermark:
+            return
+        self.watermark = watermark
+
+        threshold = watermark - self.within
+        expirations = self._expirations
+        while expirations and expirations[0][0] < threshold:
+            _, _, stream_id, key = heapq.heappop(expirations)
+            buffers = self._buffers[stream_id]
+            buffer = buffers.get(key)
+            if buffer is None:
+                continue
+            del buffer[: bisect_left(buffer, (threshold,))]
+            if not buffer:
+                del buffers[key]
+
+    def _merge(self, left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+        """Helper function to merge the properties of two joined events."""
+        joined = {**left, **right}
+        joined[self.timestamp_field] = max(left[self.timestamp_field], right[self.timestamp_field])
+        return joined
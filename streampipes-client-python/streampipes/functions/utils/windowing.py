@@ -0,0 +1,580 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Event-time windowing of data streams based on the timestamp of the events.
+
+A [WindowOperator][streampipes.functions.utils.windowing.WindowOperator] assigns the events to windows
+and emits a window's result once the watermark, i.e. the event time the stream has progressed to, passes its end.
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+__all__ = [
+    "Aggregator",
+    "CollectEvents",
+    "SessionWindows",
+    "SlidingWindows",
+    "TumblingWindows",
+    "Window",
+    "WindowAssigner",
+    "WindowOperator",
+    "WindowResult",
+]
+
+A = TypeVar("A")
+
+_FIRE = 0
+_PURGE = 1
+
+
+@dataclass(frozen=True)
+class Window:
+    """A time interval of a data stream.
+
+    Parameters
+    ----------
+    start: int
+        Start of the window in milliseconds since epoch (inclusive).
+    end: int
+        End of the window in milliseconds since epoch (exclusive).
+    """
+
+    start: int
+    end: int
+
+
+@dataclass
+class WindowResult:
+    """The result of a window that is delivered to the function.
+
+    Parameters
+    ----------
+    key: Hashable
+        The key of the events in the window, `None` if the stream is not keyed.
+    window: Window
+        The window the result belongs to.
+    value: Any
+        The result of the aggregator for the events in the window.
+    late: bool
+        Whether the result is an update of a window that has already been emitted, caused by a late event.
+    """
+
+    key: Hashable
+    window: Window
+    value: Any
+    late: bool = False
+
+
+class WindowAssigner(ABC):
+    """Assigns events to windows based on their timestamp."""
+
+    merging = False
+
+    @abstractmethod
+    def assign(self, timestamp: int) -> List[Window]:
+        """Get the windows an event belongs to.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the event in milliseconds since epoch.
+
+        Returns
+        -------
+        windows: List[Window]
+            The windows the event belongs to.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+
+class TumblingWindows(WindowAssigner):
+    """Fixed-size, non-overlapping windows.
+
+    Parameters
+    ----------
+    size: int
+        The size of the windows in milliseconds.
+    offset: int
+        Shifts the start of the windows in milliseconds, windows are aligned to the epoch by default.
+    """
+
+    def __init__(self, size: int, offset: int = 0) -> None:
+        if size <= 0:
+            raise ValueError("The window size needs to be positive.")
+        self.size = size
+        self.offset = offset
+
+    def assign(self, timestamp: int) -> List[Window]:
+        """Get the single window an event belongs to.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the event in milliseconds since epoch.
+
+        Returns
+        -------
+        windows: List[Window]
+            The windows the event belongs to.
+        """
+        start = timestamp - (timestamp - self.offset) % self.size
+        return [Window(start, start + self.size)]
+
+
+class SlidingWindows(WindowAssigner):
+    """Fixed-size windows that start every `slide` milliseconds and overlap if `slide` is smaller than `size`.
+
+    Parameters
+    ----------
+    size: int
+        The size of the windows in milliseconds.
+    slide: int
+        The time between the start of two windows in milliseconds.
+    offset: int
+        Shifts the start of the windows in milliseconds, windows are aligned to the epoch by default.
+    """
+
+    def __init__(self, size: int, slide: int, offset: int = 0) -> None:
+        if size <= 0 or slide <= 0:
+            raise ValueError("The window size and slide need to be positive.")
+        self.size = size
+        self.slide = slide
+        self.offset = offset
+
+    def assign(self, timestamp: int) -> List[Window]:
+        """Get all windows an event belongs to, starting with the latest one.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the event in milliseconds since epoch.
+
+        Returns
+        -------
+        windows: List[Window]
+            The windows the event belongs to.
+        """
+        last_start = timestamp - (timestamp - self.offset) % self.slide
+        return [Window(start, start + self.size) for start in range(last_start, timestamp - self.size, -self.slide)]
+
+
+class SessionWindows(WindowAssigner):
+    """Windows of activity that are closed by a gap without events.
+
+    Events belong to the same session as long as they are less than `gap` milliseconds apart.
+
+    Parameters
+    ----------
+    gap: int
+        The minimal time without events in milliseconds that closes a session.
+    """
+
+    merging = True
+
+    def __init__(self, gap: int) -> None:
+        if gap <= 0:
+            raise ValueError("The session gap needs to be positive.")
+        self.gap = gap
+
+    def assign(self, timestamp: int) -> List[Window]:
+        """Get the session of an event, which is merged with overlapping sessions by the window operator.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the event in milliseconds since epoch.
+
+        Returns
+        -------
+        windows: List[Window]
+            The windows the event belongs to.
+        """
+        return [Window(timestamp, timestamp + self.gap)]
+
+
+class Aggregator(ABC, Generic[A]):
+    """Incrementally aggregates the events of a window, so that only the accumulator needs to be kept in memory."""
+
+    @abstractmethod
+    def create(self) -> A:
+        """Creates an empty accumulator.
+
+        Returns
+        -------
+        accumulator: A
+            The empty accumulator.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    def add(self, accumulator: A, event: Dict[str, Any]) -> A:
+        """Adds an event to an accumulator.
+
+        Parameters
+        ----------
+        accumulator: A
+            The accumulator, which may be modified in-place.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: A
+            The updated accumulator.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    def merge(self, accumulator: A, other: A) -> A:
+        """Merges two accumulators, which is required by session windows.
+
+        Parameters
+        ----------
+        accumulator: A
+            The accumulator, which may be modified in-place.
+        other: A
+            The accumulator to be merged into the first one.
+
+        Returns
+        -------
+        accumulator: A
+            The merged accumulator.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    def result(self, accumulator: A) -> Any:
+        """Get the result of an accumulator.
+
+        Parameters
+        ----------
+        accumulator: A
+            The accumulator.
+
+        Returns
+        -------
+        result: Any
+            The result of the aggregation.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+
+class CollectEvents(Aggregator[List[Dict[str, Any]]]):
+    """Collects the contents of a window, i.e. the result is the list of its events in the order of arrival."""
+
+    def create(self) -> List[Dict[str, Any]]:
+        """Creates an empty list of events.
+
+        Returns
+        -------
+        accumulator: List[Dict[str, Any]]
+            The empty list.
+        """
+        return []
+
+    def add(self, accumulator: List[Dict[str, Any]], event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Appends an event to the list.
+
+        Parameters
+        ----------
+        accumulator: List[Dict[str, Any]]
+            The events of the window so far.
+        event: Dict[str, Any]
+            The event to be added.
+
+        Returns
+        -------
+        accumulator: List[Dict[str, Any]]
+            The events of the window.
+        """
+        accumulator.append(event)
+        return accumulator
+
+    def merge(self, accumulator: List[Dict[str, Any]], other: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Appends the events of another window.
+
+        Parameters
+        ----------
+        accumulator: List[Dict[str, Any]]
+            The events of the earlier window.
+        other: List[Dict[str, Any]]
+            The events of the later window.
+
+        Returns
+        -------
+        accumulator: List[Dict[str, Any]]
+            The events of both windows.
+        """
+        accumulator.extend(other)
+        return accumulator
+
+    def result(self, accumulator: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get a copy of the events, so that the accumulator can still be updated by late events.
+
+        Parameters
+        ----------
+        accumulator: List[Dict[str, Any]]
+            The events of the window.
+
+        Returns
+        -------
+        result: List[Dict[str, Any]]
+            The events of the window in the order of arrival.
+        """
+        return list(accumulator)
+
+
+class _WindowState:
+    """The accumulator of a window and whether its result has been emitted already."""
+
+    __slots__ = ("accumulator", "fired")
+
+    def __init__(self, accumulator: Any) -> None:
+        self.accumulator = accumulator
+        self.fired = False
+
+
+class WindowOperator:
+    """Assigns the events of a data stream to event-time windows and emits their results.
+
+    The watermark tracks the progress of the event time, it trails the largest timestamp seen so far
+    by `max_out_of_orderness`. Once the watermark passes the end of a window, its result is emitted.
+    Events that arrive later but within `allowed_lateness` after the end of their window update
+    the window and its result is emitted again (marked as `late`). Afterwards, the state of the window is dropped,
+    so that the memory stays bounded by the number of open windows, even for keyed streams.
+    Events that are even later are dropped and counted in `dropped_events`.
+
+    Parameters
+    ----------
+    assigner: WindowAssigner
+        Assigns the events to windows, e.g. [TumblingWindows][streampipes.functions.utils.windowing.TumblingWindows].
+    aggregator: Optional[Aggregator]
+        Incrementally aggregates the events of a window, the events of a window are collected by default.
+    key_by: Optional[Union[str, Callable[[Dict[str, Any]], Hashable]]]
+        Field name or function determining the key of an event, windows are maintained per key.
+    timestamp_field: str
+        Runtime name of the timestamp property (milliseconds since epoch).
+    max_out_of_orderness: int
+        Time in milliseconds the watermark trails the largest timestamp seen so far.
+    allowed_lateness: int
+        Time in milliseconds after the end of a window in which late events still update the window.
+
+    Examples
+    --------
+    ```python
+    operator = WindowOperator(TumblingWindows(size=60_000), key_by="sensor", max_out_of_orderness=5_000)
+    for result in operator.process(event):
+        print(result.key, result.window, len(result.value))
+    ```
+    """
+
+    def __init__(
+        self,
+        assigner: WindowAssigner,
+        aggregator: Optional[Aggregator] = None,
+        key_by: Optional[Union[str, Callable[[Dict[str, Any]], Hashable]]] = None,
+        timestamp_field: str = "timestamp",
+        max_out_of_orderness: int = 0,
+        allowed_lateness: int = 0,
+    ) -> None:
+        if max_out_of_orderness < 0 or allowed_lateness < 0:
+            raise ValueError("The out-of-orderness and the allowed lateness must not be negative.")
+        self.assigner = assigner
+        self.aggregator: Aggregator = aggregator or CollectEvents()
+        if key_by is None or callable(key_by):
+            self._key_selector = key_by
+        else:
+            field = key_by
+            self._key_selector = lambda event: event.get(field)
+        self.timestamp_field = timestamp_field
+        self.max_out_of_orderness = max_out_of_orderness
+        self.allowed_lateness = allowed_lateness
+
+        self.watermark = float("-inf")
+        self.dropped_events = 0
+        self._state: Dict[Hashable, Dict[Window, _WindowState]] = {}
+        # timers to fire or purge windows ordered by time (time, sequence, action, key, window)
+        self._timers: List[Tuple[int, int, int, Hashable, Window]] = []
+        self._sequence = 0
+
+    @property
+    def num_open_windows(self) -> int:
+        """Number of windows whose state is kept."""
+        return sum(len(windows) for windows in self._state.values())
+
+    def process(self, event: Dict[str, Any]) -> List[WindowResult]:
+        """Adds an event to its windows and advances the watermark.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The event to be processed.
+
+        Returns
+        -------
+        results: List[WindowResult]
+            The results of all windows that have been closed or updated by this event.
+        """
+        timestamp = int(event[self.timestamp_field])
+        key = self._key_selector(event) if self._key_selector is not None else None
+        results: List[WindowResult] = []
+
+        windows = self._state.get(key)
+        if windows is None:
+            windows = self._state[key] = {}
+        for window in self.assigner.assign(timestamp):
+            if window.end + self.allowed_lateness <= self.watermark:
+                # the window has been dropped already
+                self.dropped_events += 1
+                continue
+            if self.assigner.merging:
+                window = self._merge_windows(windows, key, window)
+            state = windows.get(window)
+            if state is None:
+                state = windows[window] = _WindowState(self.aggregator.create())
+                self._add_timer(window.end, _FIRE, key, window)
+            state.accumulator = self.aggregator.add(state.accumulator, event)
+            if state.fired:
+                results.append(WindowResult(key, window, self.aggregator.result(state.accumulator), late=True))
+        if not windows:
+            del self._state[key]
+
+        self.advance_watermark(timestamp - self.max_out_of_orderness, results)
+        return results
+
+    def advance_watermark(self, watermark: float, results: Optional[List[WindowResult]] = None) -> List[WindowResult]:
+        """Advances the watermark and emits the results of all windows that end before it.
+
+        Parameters
+        ----------
+        watermark: float
+            The new watermark in milliseconds since epoch, it is ignored if smaller than the current one.
+        results: Optional[List[WindowResult]]
+            List the results are appended to.
+
+        Returns
+        -------
+        results: List[WindowResult]
+            The results of the closed windows.
+        """
+        results = [] if results is None else results
+        if watermark <= self.watermark:
+            return results
+        self.watermark = watermark
+
+        timers = self._timers
+        while timers and timers[0][0] <= watermark:
+            _, _, action, key, window = heapq.heappop(timers)
+            windows = self._state.get(key)
+            state = windows.get(window) if windows is not None else None
+            if state is None:
+                # the window has been merged into another session window
+                continue
+            if action == _FIRE and not state.fired:
+                state.fired = True
+                results.append(WindowResult(key, window, self.aggregator.result(state.accumulator)))
+                if self.allowed_lateness > 0:
+                    self._add_timer(window.end + self.allowed_lateness, _PURGE, key, window)
+                    continue
+            if action == _PURGE or self.allowed_lateness == 0:
+                self._remove_window(key, window)
+        return results
+
+    def flush(self) -> List[WindowResult]:
+        """Emits the results of all windows that have not been emitted yet and drops the complete state.
+
+        Returns
+        -------
+        results: List[WindowResult]
+            The results of the windows that were still open.
+        """
+        results = [
+            WindowResult(key, window, self.aggregator.result(state.accumulator))
+            for key, windows in self._state.items()
+            for window, state in sorted(windows.items(), key=lambda item: item[0].end)
+            if not state.fired
+        ]
+        results.sort(key=lambda result: result.window.end)
+        self._state.clear()
+        self._timers.clear()
+        return results
+
+    def _add_timer(self, time: int, action: int, key: Hashable, window: Window) -> None:
+        """Helper function to register a timer for a window."""
+        self._sequence += 1
+        heapq.heappush(self._timers, (time, self._sequence, action, key, window))
+
+    def _remove_window(self, key: Hashable, window: Window) -> None:
+        """Helper function to drop the state of a window."""
+        windows = self._state[key]
+        del windows[window]
+        if not windows:
+            del self._state[key]
+
+    def _merge_windows(self, windows: Dict[Window, _WindowState], key: Hashable, window: Window) -> Window:
+        """Helper function to merge a new session window with all overlapping session windows of its key.
+
+        Parameters
+        ----------
+        windows: Dict[Window, _WindowState]
+            The windows of the key.
+        key: Hashable
+            The key of the window.
+        window: Window
+            The new window.
+
+        Returns
+        -------
+        window: Window
+            The merged window, which already holds the state of the merged windows.
+        """
+        # the end of a window is exclusive, so sessions that only touch are exactly `gap` apart and stay separate
+        overlapping = [w for w in windows if w.start < window.end and window.start < w.end]
+        if not overlapping or (len(overlapping) == 1 and overlapping[0] == window):
+            return window
+        merged = Window(
+            min([window.start] + [w.start for w in overlapping]), max([window.end] + [w.end for w in overlapping])
+        )
+        if merged in windows and len(overlapping) == 1:
+            return merged
+
+        state = _WindowState(self.aggregator.create())
+        for w in sorted(overlapping, key=lambda w: w.start):
+            previous = windows.pop(w)
+            state.accumulator = self.aggregator.merge(state.accumulator, previous.accumulator)
+            state.fired = state.fired or previous.fired
+        windows[merged] = state
+        if state.fired:
+            # the merged session has been emitted before, it will be emitted again and purged after the lateness
+            self._add_timer(merged.end + self.allowed_lateness, _PURGE, key, merged)
+        else:
+            self._add_timer(merged.end, _FIRE, key, merged)
+        return merged
@@ -0,0 +1,127 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from abc import abstractmethod
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+from streampipes.functions.streampipes_function import StreamPipesFunction
+from streampipes.functions.utils.windowing import (
+    Aggregator,
+    WindowAssigner,
+    WindowOperator,
+    WindowResult,
+)
+from streampipes.model.resource import FunctionDefinition
+
+
+class WindowedStreamPipesFunction(StreamPipesFunction):
+    """StreamPipesFunction that processes the events of its data streams in event-time windows.
+
+    The events of every required stream are assigned to windows based on their timestamp
+    and `onWindow` is called with the result of a window as soon as the window is closed by the watermark.
+    The windows that are still open when the function gets stopped are emitted before `onServiceStopped` is called.
+
+    Parameters
+    ----------
+    assigner: WindowAssigner
+        Assigns the events to windows, e.g. [TumblingWindows][streampipes.functions.utils.windowing.TumblingWindows].
+    aggregator: Optional[Aggregator]
+        Incrementally aggregates the events of a window, the events of a window are collected by default.
+    key_by: Optional[Union[str, Callable[[Dict[str, Any]], Hashable]]]
+        Field name or function determining the key of an event, windows are maintained per key.
+    timestamp_field: str
+        Runtime name of the timestamp property (milliseconds since epoch).
+    max_out_of_orderness: int
+        Time in milliseconds the watermark trails the largest timestamp seen so far.
+    allowed_lateness: int
+        Time in milliseconds after the end of a window in which late events still update the window.
+    function_definition: Optional[FunctionDefinition]
+        the definition of the function that contains metadata about the connected function
+
+    Attributes
+    ----------
+    window_operators: Dict[str, WindowOperator]
+        The window operator per stream id.
+    """
+
+    def __init__(
+        self,
+        assigner: WindowAssigner,
+        aggregator: Optional[Aggregator] = None,
+        key_by: Optional[Union[str, Callable[[Dict[str, Any]], Hashable]]] = None,
+        timestamp_field: str = "timestamp",
+        max_out_of_orderness: int = 0,
+        allowed_lateness: int = 0,
+        function_definition: Optional[FunctionDefinition] = None,
+    ):
+        super().__init__(function_definition)
+        self._operator_factory = lambda: WindowOperator(
+            assigner,
+            aggregator=aggregator,
+            key_by=key_by,
+            timestamp_field=timestamp_field,
+            max_out_of_orderness=max_out_of_orderness,
+            allowed_lateness=allowed_lateness,
+        )
+        self.window_operators: Dict[str, WindowOperator] = {}
+
+    def onEvent(self, event: Dict[str, Any], streamId: str) -> None:
+        """Assigns the event to its windows and calls `onWindow` for every window that is closed or updated.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The received event from the data stream.
+        streamId: str
+            The id of the data stream which the event belongs to.
+
+        Returns
+        -------
+        None
+        """
+        operator = self.window_operators.get(streamId)
+        if operator is None:
+            operator = self.window_operators[streamId] = self._operator_factory()
+        self._emit(operator.process(event), streamId)
+
+    def stop(self) -> None:
+        """Emits the results of all open windows and stops the function afterwards"""
+
+        for stream_id, operator in self.window_operators.items():
+            self._emit(operator.flush(), stream_id)
+        super().stop()
+
+    def _emit(self, results: List[WindowResult], stream_id: str) -> None:
+        """Helper function to pass the results of the windows to `onWindow`."""
+        for result in results:
+            self.onWindow(result, stream_id)
+
+    @abstractmethod
+    def onWindow(self, result: WindowResult, streamId: str) -> None:
+        """Is called for every window that is closed by the watermark or updated by a late event.
+
+        Parameters
+        ----------
+        result: WindowResult
+            The result of the window with its key and time interval.
+        streamId: str
+            The id of the data stream which the window belongs to.
+
+        Returns
+        -------
+        None
+        """
+        raise NotImplementedError  # pragma: no cover
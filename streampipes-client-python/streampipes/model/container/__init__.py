@@ -17,10 +17,12 @@
 
 from .data_lake_measures import DataLakeMeasures
 from .data_streams import DataStreams
+from .function_definitions import FunctionDefinitions
 from .versions import Versions
 
 __all__ = [
     "DataLakeMeasures",
     "DataStreams",
+    "FunctionDefinitions",
     "Versions",
 ]
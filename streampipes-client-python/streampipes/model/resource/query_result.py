@@ -16,10 +16,11 @@
 #
 
 from itertools import chain
-from typing import Any, Dict, List, Literal, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 import pandas as pd
 from pydantic import Field, StrictInt, StrictStr
+from streampipes.model.common import EventSchema
 from streampipes.model.resource import DataSeries
 from streampipes.model.resource.exceptions import StreamPipesUnsupportedDataSeries
 from streampipes.model.resource.resource import Resource
@@ -28,6 +29,21 @@ __all__ = [
     "QueryResult",
 ]
 
+# maps the runtime types of the StreamPipes event schema to the most compact pandas dtype
+# nullable pandas dtypes are used as soon as a column contains missing values
+_RUNTIME_TYPE_TO_DTYPE = {
+    "http://www.w3.org/2001/XMLSchema#float": ("float32", "float32"),
+    "http://www.w3.org/2001/XMLSchema#double": ("float64", "float64"),
+    "http://www.w3.org/2001/XMLSchema#integer": ("int32", "Int32"),
+    "http://www.w3.org/2001/XMLSchema#long": ("int64", "Int64"),
+    "http://www.w3.org/2001/XMLSchema#boolean": ("bool", "boolean"),
+}
+
+_RUNTIME_TYPE_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+# string columns are stored as categoricals if the share of distinct values does not exceed this ratio
+_CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
 
 class QueryResult(Resource):
     """Implementation of a resource for query result.
@@ -59,12 +75,12 @@ class QueryResult(Resource):
                 raise StreamPipesUnsupportedDataSeries("Headers of series does not match query result headers")
 
         if self.headers[0] == "time":
-            self.headers[0] = "timestamp"
+            headers = ["timestamp"] + self.headers[1:]
         else:
             raise StreamPipesUnsupportedDataSeries(f"Unsupported headers {self.headers}")
 
         return {
-            "headers": self.headers,
+            "headers": headers,
             "rows": list(chain.from_iterable([series.rows for series in self.all_data_series])),
         }
 
@@ -73,9 +89,77 @@ class QueryResult(Resource):
     all_data_series: List[DataSeries]
     query_status: Literal["OK", "TOO_MUCH_DATA"] = Field(alias="spQueryStatus")
 
-    def to_pandas(self) -> pd.DataFrame:
+    @staticmethod
+    def _convert_timestamp(column: pd.Series) -> pd.Series:
+        """Parses the timestamp column into timezone-aware datetime values (UTC).
+
+        The StreamPipes API returns timestamps as ISO 8601 strings,
+        numeric values are interpreted as unix timestamps in milliseconds.
+
+        Parameters
+        ----------
+        column: pd.Series
+            The raw timestamp column
+
+        Returns
+        -------
+        timestamp_column: pd.Series
+            The timestamp column with dtype `datetime64[ns, UTC]`
+        """
+        if pd.api.types.is_numeric_dtype(column):
+            return pd.to_datetime(column, unit="ms", utc=True)
+        return pd.to_datetime(column, utc=True)
+
+    @staticmethod
+    def _convert_column(column: pd.Series, runtime_type: Optional[str]) -> pd.Series:
+        """Converts a data column to the most compact dtype that suits the given runtime type.
+
+        Numeric columns are downcast to the declared runtime type (e.g. `float32` for `float`),
+        columns consisting only of strings with repeated values (e.g. sensor ids) are turned into categoricals.
+        If no runtime type is known, only the conversion of string columns is applied.
+
+        Parameters
+        ----------
+        column: pd.Series
+            The column to be converted
+        runtime_type: Optional[str]
+            The runtime type of the column as defined in the event schema
+
+        Returns
+        -------
+        converted_column: pd.Series
+            The converted column
+        """
+
+        if runtime_type in _RUNTIME_TYPE_TO_DTYPE:
+            dtype, nullable_dtype = _RUNTIME_TYPE_TO_DTYPE[runtime_type]
+            if dtype != "bool":
+                column = pd.to_numeric(column)
+            return column.astype(nullable_dtype if column.isna().any() else dtype)  # type: ignore
+
+        if (runtime_type is None and column.dtype == object) or runtime_type == _RUNTIME_TYPE_STRING:
+            # columns holding other values, e.g. lists or dicts, cannot be represented as categoricals
+            if pd.api.types.infer_dtype(column, skipna=True) != "string":
+                return column
+            num_values = column.count()
+            if 0 < num_values and column.nunique() / num_values <= _CATEGORICAL_MAX_UNIQUE_RATIO:
+                return column.astype("category")
+
+        return column
+
+    def to_pandas(self, event_schema: Optional[EventSchema] = None) -> pd.DataFrame:
         """Returns the data lake series in representation of a Pandas Dataframe.
 
+        The column `timestamp` is parsed into `datetime64[ns, UTC]` and
+        string columns with repeated values (e.g. sensor ids) are represented as categoricals.
+        If the event schema of the data lake measure is provided,
+        the remaining columns are converted to the compact dtype of their runtime type (e.g. `float32`, `int32`).
+
+        Parameters
+        ----------
+        event_schema: Optional[EventSchema]
+            Event schema of the queried data lake measure (see `DataLakeMeasure.event_schema`).
+
         Returns
         -------
         df: pd.DataFrame
@@ -86,4 +170,17 @@ class QueryResult(Resource):
 
         df = pd.DataFrame(data=pandas_representation["rows"], columns=pandas_representation["headers"])
 
+        runtime_types: Dict[str, str] = {}
+        if event_schema is not None:
+            runtime_types = {
+                event_property.runtime_name: event_property.runtime_type
+                for event_property in event_schema.event_properties
+            }
+
+        for column_name in df.columns:
+            if column_name == "timestamp":
+                df[column_name] = self._convert_timestamp(df[column_name])
+            else:
+                df[column_name] = self._convert_column(df[column_name], runtime_types.get(column_name))
+
         return df
@@ -113,6 +113,10 @@ class TestStreamPipesClient(TestCase):
                         [{"elementId": "test-stream", "name": "test", "eventGrounding": {"transportProtocols": []}}]
                     )
                 )
+            if "functions" in kwargs["url"]:
+                return MockResponse(
+                    json.dumps([{"functionId": {"id": "test-function", "version": 1}, "consumedStreams": ["test-stream"]}])
+                )
             if "versions" in kwargs["url"]:
                 return MockResponse(
                     json.dumps({"backendVersion": "SP-dev"})
@@ -133,7 +137,7 @@ class TestStreamPipesClient(TestCase):
                 call(
                     "\nHi there!\nYou are connected to a StreamPipes instance running at https://localhost:443 with version SP-dev.\n"
                     "The following StreamPipes resources are available with this client:\n"
-                    "1x DataLakeMeasures\n1x DataStreams"
+                    "1x DataLakeMeasures\n1x DataStreams\n1x FunctionDefinitions"
                 ),
             ],
             any_order=True,
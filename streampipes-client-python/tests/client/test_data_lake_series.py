@@ -15,12 +15,17 @@
 # limitations under the License.
 #
 import json
+from datetime import datetime, timezone
+from typing import Optional
 from unittest import TestCase
 from unittest.mock import MagicMock, call, patch
 
+import pandas as pd
+
 from streampipes.client import StreamPipesClient
 from streampipes.client.config import StreamPipesClientConfig
 from streampipes.client.credential_provider import StreamPipesApiKeyCredentials
+from streampipes.model.common import EventProperty, EventSchema
 from streampipes.model.resource.exceptions import StreamPipesUnsupportedDataSeries
 
 
@@ -72,7 +77,7 @@ class TestDataLakeSeries(TestCase):
         }
 
     @staticmethod
-    def get_result_as_panda(http_session: MagicMock, data: dict):
+    def get_result_as_panda(http_session: MagicMock, data: dict, event_schema: Optional[EventSchema] = None):
         http_session_mock = MagicMock()
         http_session_mock.get.return_value.json.return_value = data
         http_session.return_value = http_session_mock
@@ -91,7 +96,7 @@ class TestDataLakeSeries(TestCase):
             any_order=True,
         )
 
-        return result.to_pandas()
+        return result.to_pandas(event_schema=event_schema)
 
     @patch("streampipes.client.client.Session", autospec=True)
     @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
@@ -116,6 +121,75 @@ class TestDataLakeSeries(TestCase):
             list(result_pd.columns),
         )
         self.assertEqual(73.37740325927734, result_pd["level"][0])
+        self.assertEqual("datetime64[ns, UTC]", str(result_pd["timestamp"].dtype))
+        self.assertEqual(pd.Timestamp("2022-11-05T14:47:50.838Z"), result_pd["timestamp"][0])
+        self.assertEqual("category", str(result_pd["sensorId"].dtype))
+
+    @patch("streampipes.client.client.Session", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_to_pandas_list_values(self, server_version: MagicMock, http_session: MagicMock):
+
+        server_version.return_value = {"backendVersion": "0.x.y"}
+
+        data_series = {
+            "total": 3,
+            "rows": [
+                ["2022-11-05T14:47:50.838Z", [1, 2], {"unit": "m"}],
+                ["2022-11-05T14:47:54.906Z", [1, 2], {"unit": "m"}],
+                ["2022-11-05T14:47:58.906Z", [3], {"unit": "m"}],
+            ],
+            "tags": None,
+            "headers": ["time", "values", "metadata"],
+        }
+        query_result = {
+            "total": 1,
+            "headers": data_series["headers"],
+            "spQueryStatus": "OK",
+            "allDataSeries": [data_series],
+        }
+
+        result_pd = self.get_result_as_panda(http_session, query_result)
+
+        self.assertEqual("object", str(result_pd["values"].dtype))
+        self.assertListEqual([1, 2], result_pd["values"][0])
+        self.assertEqual("object", str(result_pd["metadata"].dtype))
+
+    @patch("streampipes.client.client.Session", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_to_pandas_with_event_schema(self, server_version: MagicMock, http_session: MagicMock):
+
+        server_version.return_value = {"backendVersion": "0.x.y"}
+
+        query_result = {
+            "total": 1,
+            "headers": self.headers,
+            "spQueryStatus": "OK",
+            "allDataSeries": [
+                self.data_series
+            ],
+        }
+
+        event_schema = EventSchema(
+            event_properties=[
+                EventProperty(runtime_name="cumSumHigh", runtime_type="http://www.w3.org/2001/XMLSchema#double"),
+                EventProperty(runtime_name="level", runtime_type="http://www.w3.org/2001/XMLSchema#float"),
+                EventProperty(runtime_name="overflow", runtime_type="http://www.w3.org/2001/XMLSchema#boolean"),
+                EventProperty(runtime_name="sensorId", runtime_type="http://www.w3.org/2001/XMLSchema#string"),
+            ]
+        )
+
+        result_pd = self.get_result_as_panda(http_session, query_result, event_schema)
+
+        self.assertListEqual(
+            self.headers_expected,
+            list(result_pd.columns),
+        )
+        self.assertEqual("datetime64[ns, UTC]", str(result_pd["timestamp"].dtype))
+        self.assertEqual("float64", str(result_pd["cumSumHigh"].dtype))
+        self.assertEqual("float32", str(result_pd["level"].dtype))
+        self.assertEqual("bool", str(result_pd["overflow"].dtype))
+        self.assertEqual("category", str(result_pd["sensorId"].dtype))
+        self.assertAlmostEqual(73.3774, float(result_pd["level"][0]), places=4)
 
     @patch("streampipes.client.client.Session", autospec=True)
     @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
@@ -159,3 +233,104 @@ class TestDataLakeSeries(TestCase):
 
         with self.assertRaises(StreamPipesUnsupportedDataSeries):
             self.get_result_as_panda(http_session, query_result)
+
+    @patch("streampipes.endpoint.api.data_lake_measure.time", autospec=True)
+    @patch("streampipes.client.client.Session", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_follow(self, server_version: MagicMock, http_session: MagicMock, time_mock: MagicMock):
+
+        server_version.return_value = {"backendVersion": "0.x.y"}
+
+        def query_result(rows):
+            return {
+                "total": len(rows),
+                "headers": ["time", "level"],
+                "spQueryStatus": "OK",
+                "allDataSeries": [{"total": len(rows), "rows": rows, "tags": None, "headers": ["time", "level"]}],
+            }
+
+        responses = [
+            query_result([["2022-11-05T14:47:50.000Z", 1.0], ["2022-11-05T14:47:51.000Z", 2.0]]),
+            query_result([]),
+            query_result([["2022-11-05T14:47:51.000Z", 3.0]]),
+        ]
+
+        http_session_mock = MagicMock()
+        http_session_mock.get.return_value.json.side_effect = responses
+        http_session.return_value = http_session_mock
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        start = datetime(2022, 11, 5, 14, 47, tzinfo=timezone.utc)
+        increments = client.dataLakeMeasureApi.follow(
+            identifier="test", poll_interval=1, max_poll_interval=3, start_date=start
+        )
+
+        first = next(increments)
+        self.assertListEqual([1.0, 2.0], list(first["level"]))
+
+        # the second response contains no new record, the record at the last timestamp is skipped via offset
+        second = next(increments)
+        self.assertListEqual([3.0], list(second["level"]))
+
+        time_mock.sleep.assert_has_calls([call(1), call(2)])
+
+        last_ts = int(datetime(2022, 11, 5, 14, 47, 51, tzinfo=timezone.utc).timestamp() * 1000)
+        http_session_mock.get.assert_called_with(
+            url="https://localhost:80/streampipes-backend/api/v4/datalake/measurements/test"
+            f"?limit=1000&offset=1&order=ASC&startDate={last_ts}"
+        )
+
+    @patch("streampipes.endpoint.api.data_lake_measure.time", autospec=True)
+    @patch("streampipes.client.client.Session", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_follow_same_timestamp(self, server_version: MagicMock, http_session: MagicMock, time_mock: MagicMock):
+
+        server_version.return_value = {"backendVersion": "0.x.y"}
+
+        def query_result(rows):
+            return {
+                "total": len(rows),
+                "headers": ["time", "level"],
+                "spQueryStatus": "OK",
+                "allDataSeries": [{"total": len(rows), "rows": rows, "tags": None, "headers": ["time", "level"]}],
+            }
+
+        timestamp = "2022-11-05T14:47:50.000Z"
+        responses = [
+            query_result([[timestamp, None], [timestamp, 1.0]]),
+            query_result([[timestamp, 2.0]]),
+            # an already seen record with a missing value is returned again
+            query_result([[timestamp, None]]),
+            query_result([["2022-11-05T14:47:51.000Z", 5.0]]),
+        ]
+
+        http_session_mock = MagicMock()
+        http_session_mock.get.return_value.json.side_effect = responses
+        http_session.return_value = http_session_mock
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        start = datetime(2022, 11, 5, 14, 47, 50, tzinfo=timezone.utc)
+        increments = client.dataLakeMeasureApi.follow(identifier="test", limit=2, start_date=start)
+
+        self.assertEqual(2, len(next(increments)))
+        # the first page was cut at the limit, so the records with the same timestamp are paged through
+        self.assertListEqual([2.0], list(next(increments)["level"]))
+        self.assertListEqual([5.0], list(next(increments)["level"]))
+
+        start_ts = int(start.timestamp() * 1000)
+        urls = [kwargs["url"] for _, kwargs in http_session_mock.get.call_args_list]
+        self.assertTrue(urls[1].endswith(f"?limit=2&offset=2&order=ASC&startDate={start_ts}"))
+        self.assertTrue(urls[2].endswith(f"?limit=2&offset=3&order=ASC&startDate={start_ts}"))
+        self.assertTrue(urls[3].endswith(f"?limit=2&offset=4&order=ASC&startDate={start_ts}"))
@@ -338,6 +338,9 @@ class TestStreamPipesEndpoints(TestCase):
             "test",
             result[0].measure_name,  # type: ignore
         )
+        self.assertEqual(result[0], client.dataLakeMeasureApi.get_measure("test"))
+        with self.assertRaises(KeyError):
+            client.dataLakeMeasureApi.get_measure("missing")
         self.assertEqual(
             self.data_lake_measure_all_json,
             result.to_json(),
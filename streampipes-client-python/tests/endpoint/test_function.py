@@ -0,0 +1,72 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from streampipes.client import StreamPipesClient
+from streampipes.client.config import StreamPipesClientConfig
+from streampipes.client.credential_provider import StreamPipesApiKeyCredentials
+from streampipes.model.resource import FunctionDefinition
+from streampipes.model.resource.function_definition import FunctionId
+
+
+class TestFunctionEndpoint(TestCase):
+    @patch("streampipes.client.client.Session", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def setUp(self, server_version: MagicMock, http_session: MagicMock) -> None:
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        self.http_session = MagicMock()
+        http_session.return_value = self.http_session
+
+        self.client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+    def test_register(self):
+        function_definition = FunctionDefinition(
+            function_id=FunctionId(id="test-function", version=2), consumed_streams=["test-stream"]
+        )
+
+        self.client.functionApi.register([function_definition])
+
+        self.http_session.post.assert_called_once()
+        kwargs = self.http_session.post.call_args.kwargs
+        self.assertEqual("https://localhost:80/streampipes-backend/api/v2/functions", kwargs["url"])
+        self.assertListEqual(
+            [{"functionId": {"id": "test-function", "version": 2}, "consumedStreams": ["test-stream"]}],
+            json.loads(kwargs["data"]),
+        )
+
+    def test_deregister(self):
+        self.client.functionApi.deregister("test-function")
+
+        self.http_session.delete.assert_called_once_with(
+            url="https://localhost:80/streampipes-backend/api/v2/functions/test-function"
+        )
+
+    def test_get_metrics(self):
+        metrics = {"lastTimestamp": 0, "messagesIn": {}, "messagesOut": {"counter": 0, "lastTimestamp": 0}}
+        self.http_session.get.return_value.json.return_value = metrics
+
+        self.assertDictEqual(metrics, self.client.functionApi.get_metrics("test-function"))
+        self.http_session.get.assert_called_once_with(
+            url="https://localhost:80/streampipes-backend/api/v2/functions/test-function/metrics"
+        )
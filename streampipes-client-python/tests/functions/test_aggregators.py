@@ -0,0 +1,176 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import random
+import statistics
+from unittest import TestCase
+
+from streampipes.functions.utils.aggregators import (
+    Aggregations,
+    Count,
+    DistinctCount,
+    HyperLogLog,
+    KllSketch,
+    Max,
+    Mean,
+    Min,
+    Quantiles,
+    RunningStats,
+    SlidingExtremes,
+    Stats,
+    Sum,
+    Variance,
+)
+from streampipes.functions.utils.windowing import (
+    SessionWindows,
+    TumblingWindows,
+    WindowOperator,
+)
+
+
+class TestRunningStats(TestCase):
+    def test_add_and_merge(self):
+        values = [random.Random(1).gauss(10, 2) for _ in range(100)]
+        stats, first, second = RunningStats(), RunningStats(), RunningStats()
+        for value in values:
+            stats.add(value)
+        for value in values[:30]:
+            first.add(value)
+        for value in values[30:]:
+            second.add(value)
+        first.merge(second)
+
+        for result in (stats, first):
+            self.assertEqual(100, result.count)
+            self.assertAlmostEqual(statistics.mean(values), result.mean)
+            self.assertAlmostEqual(statistics.variance(values), result.variance())
+            self.assertAlmostEqual(statistics.pvariance(values), result.variance(ddof=0))
+            self.assertEqual(min(values), result.min)
+            self.assertEqual(max(values), result.max)
+
+    def test_empty(self):
+        self.assertDictEqual(
+            {"count": 0, "mean": None, "variance": None, "min": None, "max": None}, RunningStats().as_dict()
+        )
+
+
+class TestSlidingExtremes(TestCase):
+    def test_sliding_window(self):
+        extremes = SlidingExtremes(size=3)
+        values = [5, 1, 4, 2, 8, 3]
+        expected = [(5, 5), (1, 5), (1, 5), (1, 4), (2, 8), (2, 8)]
+
+        for timestamp, (value, (minimum, maximum)) in enumerate(zip(values, expected)):
+            extremes.add(timestamp, value)
+            self.assertEqual((minimum, maximum), (extremes.min, extremes.max))
+            self.assertLessEqual(len(extremes._min) + len(extremes._max), 6)
+
+
+class TestKllSketch(TestCase):
+    def test_quantiles(self):
+        values = list(range(100_000))
+        random.Random(2).shuffle(values)
+        sketch = KllSketch(k=200, seed=3)
+        for value in values:
+            sketch.add(value)
+
+        self.assertEqual(100_000, sketch.count)
+        self.assertLess(sum(len(compactor) for compactor in sketch._compactors), 1000)
+        for quantile, estimate in zip([0.01, 0.5, 0.99], sketch.quantiles([0.01, 0.5, 0.99])):
+            self.assertAlmostEqual(quantile, estimate / 100_000, delta=0.02)
+
+    def test_merge(self):
+        first, second = KllSketch(seed=4), KllSketch(seed=5)
+        for value in range(10_000):
+            (first if value % 2 else second).add(value)
+        first.merge(second)
+
+        self.assertEqual(10_000, first.count)
+        self.assertAlmostEqual(0.9, first.quantile(0.9) / 10_000, delta=0.02)
+
+    def test_empty(self):
+        self.assertIsNone(KllSketch().quantile(0.5))
+        with self.assertRaises(ValueError):
+            KllSketch().quantile(1.5)
+
+
+class TestHyperLogLog(TestCase):
+    def test_estimate(self):
+        for cardinality in (10, 1000, 50_000):
+            sketch = HyperLogLog(precision=12)
+            for value in range(cardinality):
+                sketch.add(f"sensor-{value}")
+                sketch.add(f"sensor-{value}")
+            self.assertAlmostEqual(cardinality, sketch.estimate(), delta=0.05 * cardinality)
+
+    def test_merge(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for value in range(2000):
+            first.add(value)
+            second.add(value + 1000)
+
+        self.assertAlmostEqual(3000, first.merge(second).estimate(), delta=150)
+        with self.assertRaises(ValueError):
+            first.merge(HyperLogLog(precision=10))
+
+
+class TestAggregators(TestCase):
+    def test_window_aggregations(self):
+        aggregator = Aggregations(
+            count=Count(),
+            sum=Sum("value"),
+            min=Min("value"),
+            max=Max("value"),
+            mean=Mean("value"),
+            variance=Variance("value"),
+            stats=Stats("value"),
+            median=Quantiles("value", [0.5]),
+            distinct=DistinctCount("sensor"),
+        )
+        operator = WindowOperator(TumblingWindows(10), aggregator=aggregator)
+        data = [
+            {"timestamp": 1, "value": 2, "sensor": "a"},
+            {"timestamp": 2, "value": 4, "sensor": "b"},
+            {"timestamp": 3, "sensor": "a"},
+            {"timestamp": 4, "value": 6, "sensor": "a"},
+        ]
+        for event in data:
+            operator.process(event)
+        result = operator.flush()[0].value
+
+        self.assertDictEqual(
+            {
+                "count": 4,
+                "sum": 12,
+                "min": 2,
+                "max": 6,
+                "mean": 4.0,
+                "variance": 4.0,
+                "stats": {"count": 3, "mean": 4.0, "variance": 4.0, "min": 2, "max": 6},
+                "median": {0.5: 4},
+                "distinct": 2,
+            },
+            result,
+        )
+
+    def test_session_windows_merge_accumulators(self):
+        operator = WindowOperator(
+            SessionWindows(5), aggregator=Aggregations(mean=Mean("value"), max=Max("value")), max_out_of_orderness=10
+        )
+        for timestamp, value in [(1, 1), (9, 3), (5, 5)]:
+            operator.process({"timestamp": timestamp, "value": value})
+
+        self.assertDictEqual({"mean": 3.0, "max": 5}, operator.flush()[0].value)
@@ -0,0 +1,108 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+from typing import Any, List, Tuple
+from unittest import TestCase
+
+from streampipes.functions.utils.async_iter_handler import AsyncIterHandler
+
+
+class TestMessages:
+    def __init__(self, data: List[Any]) -> None:
+        self.data = iter(data)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.data)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class TestAsyncIterHandler(TestCase):
+    @staticmethod
+    def combine(**kwargs) -> List[Tuple[str, Any]]:
+        async def run():
+            messages = {"hot": TestMessages(list(range(10))), "cold": TestMessages(["a", "b"])}
+            return [message async for message in AsyncIterHandler.combine_async_messages(messages, **kwargs)]
+
+        return asyncio.run(run())
+
+    def test_combine_async_messages(self):
+        result = self.combine()
+
+        self.assertListEqual([msg for stream_id, msg in result if stream_id == "hot"], list(range(10)))
+        self.assertListEqual([msg for stream_id, msg in result if stream_id == "cold"], ["a", "b"])
+        self.assertEqual(2, result.count(("stop", None)))
+
+    def test_combine_async_messages_fair(self):
+        result = self.combine(max_buffer_size=2, max_batch_size=1)
+
+        # the messages of the cold stream are not queued behind the ones of the hot stream
+        stream_ids = [stream_id for stream_id, _ in result]
+        self.assertLess(stream_ids.index("cold"), 2)
+        self.assertLess(len(stream_ids) - stream_ids[::-1].index("cold"), 6)
+
+    def test_combine_async_messages_close(self):
+        async def endless():
+            while True:
+                yield "msg"
+
+        async def run():
+            combined_messages = AsyncIterHandler.combine_async_messages({"test": endless()})
+            message = await combined_messages.__anext__()
+            await combined_messages.aclose()
+            await asyncio.sleep(0)
+            return message, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        message, pending_tasks = asyncio.run(run())
+
+        self.assertTupleEqual(("test", "msg"), message)
+        self.assertListEqual([], pending_tasks)
+
+    def test_combine_async_messages_close_full_buffer(self):
+        async def endless():
+            while True:
+                yield "msg"
+
+        async def run():
+            combined_messages = AsyncIterHandler.combine_async_messages({"test": endless()}, max_buffer_size=1)
+            await combined_messages.__anext__()
+            # the reader is cancelled while it waits for free space in the buffer
+            await asyncio.sleep(0)
+            await combined_messages.aclose()
+            await asyncio.wait_for(asyncio.sleep(0), timeout=1)
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        self.assertListEqual([], asyncio.run(run()))
+
+    def test_combine_async_messages_error(self):
+        async def failing():
+            yield "msg"
+            raise ValueError("connection lost")
+
+        async def run():
+            received = []
+            with self.assertRaises(ValueError):
+                async for message in AsyncIterHandler.combine_async_messages({"test": failing()}):
+                    received.append(message)
+            return received
+
+        # the error is raised instead of ending the data stream silently
+        self.assertListEqual([("test", "msg")], asyncio.run(run()))
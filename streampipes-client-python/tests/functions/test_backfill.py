@@ -0,0 +1,36 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from unittest import TestCase
+
+import pandas as pd
+from streampipes.functions.utils.backfill import ReplayBoundary
+
+
+class TestReplayBoundary(TestCase):
+    def test_is_duplicate(self):
+        boundary = ReplayBoundary("timestamp")
+        boundary.add({"timestamp": 1000, "density": 1.0})
+        boundary.add({"timestamp": 2000, "density": float("nan"), "temperature": pd.NA})
+
+        self.assertTrue(boundary.is_duplicate({"timestamp": 1000, "density": 3.0}))
+        # missing values of replayed events are represented as NaN or pd.NA
+        self.assertTrue(boundary.is_duplicate({"timestamp": 2000, "density": float("nan"), "temperature": None}))
+        self.assertTrue(boundary.is_duplicate({"timestamp": 2000, "density": None}))
+        self.assertFalse(boundary.is_duplicate({"timestamp": 2000, "density": 1.0}))
+        self.assertFalse(boundary.is_duplicate({"timestamp": 2000, "density": None, "temperature": 20.0}))
+        self.assertFalse(boundary.is_duplicate({"timestamp": 3000, "density": None}))
+        self.assertTrue(boundary.is_passed({"timestamp": 3000}))
@@ -0,0 +1,90 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import math
+from unittest import TestCase
+
+import numpy as np
+from streampipes.functions.utils.data_stream_generator import (
+    RuntimeType,
+    create_data_stream,
+)
+from streampipes.functions.utils.event_decoder import EventDecoder, EventFormat
+
+
+class TestEventDecoder(TestCase):
+    def setUp(self) -> None:
+        self.event_schema = create_data_stream(
+            "test",
+            attributes={
+                "density": RuntimeType.FLOAT.value,
+                "sensor-id": RuntimeType.STRING.value,
+                "count": RuntimeType.INTEGER.value,
+                "active": RuntimeType.BOOLEAN.value,
+            },
+        ).event_schema
+        self.event = {"timestamp": 1670000001000, "density": 10, "sensor-id": "a", "count": "3", "active": "false"}
+
+    def test_record(self):
+        decoder = EventDecoder(self.event_schema, EventFormat.RECORD)
+        record = decoder.decode({**self.event, "unknown": 1})
+
+        self.assertTupleEqual((1670000001000, 10.0, "a", 3, False), record)
+        self.assertIsInstance(record.density, float)
+        self.assertEqual("a", record.sensor_id)
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_view(self):
+        decoder = EventDecoder(self.event_schema, EventFormat.VIEW)
+        view = decoder.decode(self.event)
+
+        self.assertIs(decoder.view, view)
+        self.assertFalse(hasattr(view, "__dict__"))
+        self.assertEqual(10.0, view.density)
+        record = view.to_record()
+        self.assertTupleEqual((1670000001000, 10.0, "a", 3, False), record)
+        self.assertDictEqual({**self.event, "density": 10.0, "count": 3, "active": False}, view.to_dict())
+
+        self.assertIs(view, decoder.decode({**self.event, "density": 12.5}))
+        self.assertEqual(12.5, view.density)
+        self.assertEqual(10.0, record.density)
+        self.assertEqual(2, len(decoder.to_numpy([self.event, self.event])))
+
+    def test_typed_dict(self):
+        decoder = EventDecoder(self.event_schema, EventFormat.TYPED_DICT, fields=["density", "count"])
+
+        self.assertDictEqual({"density": 10.0, "count": 3}, decoder.decode(self.event))
+        self.assertDictEqual({"density": None, "count": None}, decoder.decode({}))
+
+    def test_invalid_values(self):
+        decoder = EventDecoder(self.event_schema, EventFormat.RECORD)
+
+        with self.assertRaises(ValueError):
+            decoder.decode({**self.event, "density": "high"})
+        with self.assertRaises(ValueError):
+            decoder.decode({**self.event, "active": "maybe"})
+        with self.assertRaises(ValueError):
+            EventDecoder(self.event_schema, EventFormat.DICT)
+
+    def test_to_numpy(self):
+        decoder = EventDecoder(self.event_schema, EventFormat.TYPED_DICT)
+        array = decoder.to_numpy([self.event, {**self.event, "density": None}])
+
+        self.assertListEqual(["timestamp", "density", "sensor-id", "count", "active"], list(array.dtype.names))
+        self.assertEqual(np.dtype("f4"), array.dtype["density"])
+        self.assertEqual(10.0, array["density"][0])
+        self.assertTrue(math.isnan(array["density"][1]))
+        self.assertListEqual([3, 3], array["count"].tolist())
@@ -0,0 +1,69 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+from unittest import TestCase
+
+from streampipes.functions.utils.field_projection import FieldProjection
+from streampipes.model.common import EventProperty, EventSchema
+
+
+def create_schema(*runtime_names: str, nested: bool = False) -> EventSchema:
+    event_properties = [EventProperty(runtime_name=runtime_name) for runtime_name in runtime_names]
+    if nested:
+        event_properties.append(
+            EventProperty(
+                **{"@class": "org.apache.streampipes.model.schema.EventPropertyNested"}, runtime_name="nested"
+            )
+        )
+    return EventSchema(event_properties=event_properties)
+
+
+class TestFieldProjection(TestCase):
+    def setUp(self) -> None:
+        self.event = {"timestamp": 1670000001000, "density": 10.3, "temperature": 20.5, "sensor": "a"}
+        self.fields = ["timestamp", "temperature", "sensor"]
+
+    def test_lookup(self):
+        projection = FieldProjection(self.fields, create_schema(*self.event))
+        self.assertTrue(projection.flat)
+
+        for data in (json.dumps(self.event), json.dumps(self.event, separators=(",", ":"))):
+            self.assertDictEqual(
+                {"timestamp": 1670000001000, "temperature": 20.5, "sensor": "a"}, projection.decode(data)
+            )
+        self.assertDictEqual({"timestamp": 1}, projection.decode('{"timestamp": 1}'))
+
+    def test_keys_within_values(self):
+        projection = FieldProjection(["sensor"], create_schema("name", "sensor"))
+        data = json.dumps({"name": 'x", "sensor": "y', "sensor": "a"})
+
+        self.assertDictEqual({"sensor": "a"}, projection.decode(data))
+        self.assertIsNone(projection._lookup('{"x\\"sensor": 1, "sensor": "a"}'))
+        self.assertDictEqual({"sensor": "a"}, projection.decode('{"x\\"sensor": 1, "sensor": "a"}'))
+
+    def test_unexpected_encoding(self):
+        projection = FieldProjection(["sensor"], create_schema("sensor"))
+
+        self.assertDictEqual({"sensor": "a"}, projection.decode('{"sensor" : "a"}'))
+
+    def test_nested_events(self):
+        projection = FieldProjection(["sensor"], create_schema("sensor", nested=True))
+        data = json.dumps({"nested": {"sensor": "b"}, "sensor": "a"})
+
+        self.assertFalse(projection.flat)
+        self.assertDictEqual({"sensor": "a"}, projection.decode(data))
+        self.assertFalse(FieldProjection(["sensor"]).flat)
@@ -14,28 +14,43 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import asyncio
 import os
+from datetime import datetime
 from json.encoder import JSONEncoder
 from typing import Any, Dict, List, Tuple
 from unittest import TestCase
-from unittest.mock import AsyncMock, MagicMock, call, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
 
+from nats.errors import TimeoutError as NatsTimeoutError
+from nats.js.api import AckPolicy, DeliverPolicy
 from streampipes.client.client import StreamPipesClient, StreamPipesClientConfig
 from streampipes.client.credential_provider import StreamPipesApiKeyCredentials
 from streampipes.functions.broker.broker_handler import (
     SupportedBroker,
     UnsupportedBrokerError,
 )
+from streampipes.functions.broker.in_memory.in_memory_hub import InMemoryHub
+from streampipes.functions.broker.kafka.kafka_consumer import AtLeastOnceConfig
+from streampipes.functions.broker.nats.nats_consumer import JetStreamConfig
+from streampipes.functions.broker.nats.nats_publisher import NatsPublisherConfig
 from streampipes.functions.function_handler import FunctionHandler
 from streampipes.functions.registration import Registration
 from streampipes.functions.streampipes_function import StreamPipesFunction
+from streampipes.functions.utils.backfill import BackfillConfig
 from streampipes.functions.utils.data_stream_generator import (
     RuntimeType,
     create_data_stream,
 )
+from streampipes.functions.utils.event_decoder import EventFormat
 from streampipes.functions.utils.function_context import FunctionContext
+from streampipes.functions.utils.function_metrics import FunctionMetrics
+from streampipes.functions.utils.function_profiler import FunctionProfiler
+from streampipes.functions.utils.latency_tracer import LatencyTracer
+from streampipes.model.resource import DataSeries
 from streampipes.model.resource.data_stream import DataStream
 from streampipes.model.resource.function_definition import FunctionDefinition
+from streampipes.model.resource.query_result import QueryResult
 
 
 class TestFunction(StreamPipesFunction):
@@ -132,6 +147,13 @@ class TestKafkaMessageContainer:
 
 class TestFunctionHandler(TestCase):
     def setUp(self) -> None:
+        register = patch("streampipes.endpoint.api.FunctionEndpoint.register", autospec=True)
+        deregister = patch("streampipes.endpoint.api.FunctionEndpoint.deregister", autospec=True)
+        self.register = register.start()
+        self.deregister = deregister.start()
+        self.addCleanup(register.stop)
+        self.addCleanup(deregister.stop)
+
         attributes = {
             "density": RuntimeType.FLOAT.value,
             "temperature": RuntimeType.FLOAT.value,
@@ -207,6 +229,10 @@ class TestFunctionHandler(TestCase):
         self.assertListEqual(test_function.data, self.test_stream_data1)
         self.assertTrue(test_function.stopped)
 
+        self.register.assert_called_once_with(ANY, [test_function.function_definition])
+        self.assertListEqual(test_function.function_definition.consumed_streams, test_function.requiredStreamIds())
+        self.deregister.assert_called_once_with(ANY, test_function.getFunctionId().id)
+
     @patch("streampipes.functions.broker.kafka.kafka_consumer.KafkaConnection", autospec=True)
     @patch("streampipes.client.client.Session", autospec=True)
     @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
@@ -327,7 +353,7 @@ class TestFunctionHandler(TestCase):
     @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
     @patch("streampipes.functions.streampipes_function.time", autospec=True)
     @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
-    @patch("streampipes.functions.broker.NatsPublisher.publish_event", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
     @patch("streampipes.client.client.Session", autospec=True)
     @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
     def test_function_output_stream_nats(
@@ -347,10 +373,10 @@ class TestFunctionHandler(TestCase):
 
         output_events = []
 
-        def save_event(self, event: Dict[str, Any]):
-            output_events.append(event)
+        def save_events(self, events: List[Dict[str, Any]]):
+            output_events.extend(events)
 
-        pulish_event.side_effect = save_event
+        pulish_event.side_effect = save_events
         get_message.return_value = TestMessageIterator(self.test_stream_data1)
         time.side_effect = lambda: 0
 
@@ -442,3 +468,686 @@ class TestFunctionHandler(TestCase):
         self.assertTrue(test_function.stopped)
 
         self.assertListEqual(output_events, [{"number": i, "timestamp": 0} for i in range(len(self.test_stream_data1))])
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.endpoint.api.DataLakeMeasureEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.Session", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_backfill(
+        self,
+        server_version: MagicMock,
+        http_session: MagicMock,
+        data_lake_get: MagicMock,
+        get_messages: MagicMock,
+        connection: AsyncMock,
+    ):
+        http_session_mock = MagicMock()
+        http_session_mock.get.return_value.json.return_value = self.data_stream_nats
+        http_session.return_value = http_session_mock
+
+        server_version.return_value = {"backendVersion": "0.x.y"}
+
+        get_messages.return_value = TestMessageIterator(self.test_stream_data1)
+
+        historic_rows = [
+            ["2022-12-02T16:53:19.000Z", 9.1, 20.1],
+            ["2022-12-02T16:53:20.000Z", 9.2, 20.2],
+            ["2022-12-02T16:53:21.000Z", 10.3, 20.5],
+        ]
+        headers = ["time", "density", "temperature"]
+
+        def query_data_lake(endpoint, identifier, limit, offset, **kwargs):
+            rows = historic_rows[offset : offset + limit]
+            return QueryResult(
+                total=len(rows),
+                headers=headers,
+                spQueryStatus="OK",
+                allDataSeries=[DataSeries(total=len(rows), headers=headers, rows=rows)] if rows else [],
+            )
+
+        data_lake_get.side_effect = query_data_lake
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        registration = Registration()
+        test_function = TestFunction()
+        test_function.add_backfill(
+            test_function.requiredStreamIds()[0],
+            BackfillConfig(measure_name="test", start_date=datetime(2022, 12, 1), page_size=2),
+        )
+        registration.register(test_function)
+        function_handler = FunctionHandler(registration, client)
+        function_handler.initializeFunctions()
+
+        self.assertEqual(2, data_lake_get.call_count)
+        # the first live event has already been replayed from the data lake
+        self.assertListEqual(
+            test_function.data,
+            [
+                {"density": 9.1, "temperature": 20.1, "timestamp": 1669999999000},
+                {"density": 9.2, "temperature": 20.2, "timestamp": 1670000000000},
+            ]
+            + self.test_stream_data1,
+        )
+        self.assertTrue(test_function.stopped)
+
+    @patch("requests.Session.request", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_in_memory(self, server_version: MagicMock, request: MagicMock):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+
+        input_stream = create_data_stream(
+            "input",
+            attributes={"density": RuntimeType.FLOAT.value},
+            stream_id="urn:streampipes.apache.org:eventstream:uPDKLI",
+            broker=SupportedBroker.IN_MEMORY,
+        )
+        output_stream = create_data_stream(
+            "output", attributes={"number": RuntimeType.INTEGER.value}, broker=SupportedBroker.IN_MEMORY
+        )
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        class TestOutputConsumer(TestFunction):
+            def requiredStreamIds(self) -> List[str]:
+                return [output_stream.element_id]
+
+        hub = InMemoryHub()
+
+        async def run():
+            producer = TestFunctionOutput(FunctionDefinition().add_output_data_stream(output_stream))
+            consumer = TestOutputConsumer()
+            registration = Registration().register(producer).register(consumer)
+            function_handler = FunctionHandler(
+                registration, client, fuse_functions=False, in_memory_hub=hub, in_memory_streams=[input_stream]
+            )
+            function_handler.initializeFunctions()
+
+            topic = input_stream.event_grounding.transport_protocols[0].topic_definition.actual_topic_name
+            while not hub.has_subscriptions(topic):
+                await asyncio.sleep(0)
+            for event in self.test_stream_data1:
+                await hub.publish(topic, event)
+            while len(consumer.data) < len(self.test_stream_data1):
+                await asyncio.sleep(0)
+            hub.close(topic)
+            while not getattr(consumer, "stopped", False):
+                await asyncio.sleep(0)
+            return producer, consumer
+
+        producer, consumer = asyncio.run(run())
+
+        self.assertEqual(len(self.test_stream_data1), producer.i)
+        self.assertListEqual([event["number"] for event in consumer.data], list(range(len(self.test_stream_data1))))
+        self.assertTrue(consumer.stopped)
+        # the in-memory data streams are neither created nor looked up in StreamPipes
+        request.assert_not_called()
+        self.register.assert_called_once_with(ANY, [producer.function_definition, consumer.function_definition])
+        self.assertListEqual([], producer.function_definition.consumed_streams)
+        self.assertListEqual([], consumer.function_definition.consumed_streams)
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.streampipes_function.time", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.post", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_fused(
+        self,
+        server_version: MagicMock,
+        endpoint: MagicMock,
+        post: MagicMock,
+        publish_events: MagicMock,
+        get_message: MagicMock,
+        time: MagicMock,
+        *args: Tuple[AsyncMock],
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        time.side_effect = lambda: 0
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        output_stream = create_data_stream("output", attributes={"number": RuntimeType.INTEGER.value})
+
+        class TestOutputConsumer(TestFunction):
+            def requiredStreamIds(self) -> List[str]:
+                return [output_stream.element_id]
+
+        expected_events = [{"number": i, "timestamp": 0} for i in range(len(self.test_stream_data1))]
+
+        for publish_fused_streams in [False, True]:
+            with self.subTest(publish_fused_streams=publish_fused_streams):
+                publish_events.reset_mock()
+                get_message.return_value = TestMessageIterator(self.test_stream_data1)
+
+                producer = TestFunctionOutput(FunctionDefinition().add_output_data_stream(output_stream))
+                consumer = TestOutputConsumer()
+                registration = Registration().register(producer).register(consumer)
+                metrics = FunctionMetrics()
+                function_handler = FunctionHandler(
+                    registration, client, publish_fused_streams=publish_fused_streams, metrics=metrics
+                )
+                function_handler.initializeFunctions()
+
+                # the output data stream is neither fetched from the API nor subscribed to
+                endpoint.assert_called_once_with(ANY, "urn:streampipes.apache.org:eventstream:uPDKLI")
+                endpoint.reset_mock()
+                self.assertDictEqual(function_handler.fused_streams, {output_stream.element_id: output_stream})
+                self.assertDictEqual(consumer.context.schema, {output_stream.element_id: output_stream})
+
+                self.assertListEqual(consumer.data, expected_events)
+                self.assertTrue(producer.stopped)
+                self.assertTrue(consumer.stopped)
+                self.assertEqual(
+                    sum(len(call.args[1]) for call in publish_events.call_args_list),
+                    len(expected_events) if publish_fused_streams else 0,
+                )
+
+                # the in-process events are counted like the events received from the broker
+                labels = f'function_id="{consumer.getFunctionId().id}",stream_id="{output_stream.element_id}"'
+                self.assertIn(
+                    f"streampipes_function_events_in_total{{{labels}}} {float(len(expected_events))}",
+                    metrics.render().splitlines(),
+                )
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.post", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_fused_cycle(
+        self,
+        server_version: MagicMock,
+        endpoint: MagicMock,
+        post: MagicMock,
+        publish_events: MagicMock,
+        get_message: MagicMock,
+        *args: Tuple[AsyncMock],
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.side_effect = lambda _: TestMessageIterator(self.test_stream_data1)
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        output_stream = create_data_stream("output", attributes={"number": RuntimeType.INTEGER.value})
+
+        class TestCycleFunction(TestFunctionOutput):
+            def requiredStreamIds(self) -> List[str]:
+                return ["urn:streampipes.apache.org:eventstream:uPDKLI", output_stream.element_id]
+
+        test_function = TestCycleFunction(FunctionDefinition().add_output_data_stream(output_stream))
+        registration = Registration().register(test_function)
+        function_handler = FunctionHandler(registration, client)
+        function_handler.initializeFunctions()
+
+        # the function consumes its own output via the broker instead of recursing in-process
+        self.assertDictEqual(function_handler.fused_streams, {})
+        self.assertIn(output_stream.element_id, function_handler.stream_contexts)
+        self.assertEqual(
+            sum(len(call.args[1]) for call in publish_events.call_args_list), 2 * len(self.test_stream_data1)
+        )
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_pending_messages", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.post", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_metrics(
+        self,
+        server_version: MagicMock,
+        endpoint: MagicMock,
+        post: MagicMock,
+        publish_events: MagicMock,
+        get_pending_messages: MagicMock,
+        get_message: MagicMock,
+        *args: Tuple[AsyncMock],
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.return_value = TestMessageIterator(self.test_stream_data1)
+        get_pending_messages.return_value = 3
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        output_stream = create_data_stream("output", attributes={"number": RuntimeType.INTEGER.value})
+        test_function = TestFunctionOutput(FunctionDefinition().add_output_data_stream(output_stream))
+        registration = Registration().register(test_function)
+        metrics = FunctionMetrics()
+        function_handler = FunctionHandler(registration, client, metrics=metrics)
+        function_handler.initializeFunctions()
+
+        function_id = test_function.getFunctionId().id
+        input_labels = f'function_id="{function_id}",stream_id="{self.data_stream_nats["elementId"]}"'
+        output_labels = f'function_id="{function_id}",stream_id="{output_stream.element_id}"'
+        num_events = float(len(self.test_stream_data1))
+        rendered = metrics.render().splitlines()
+
+        self.assertIn(f"streampipes_function_events_in_total{{{input_labels}}} {num_events}", rendered)
+        self.assertIn(f"streampipes_function_on_event_seconds_count{{{input_labels}}} {num_events}", rendered)
+        self.assertIn(f"streampipes_function_events_out_total{{{output_labels}}} {num_events}", rendered)
+        self.assertIn(f"streampipes_function_publish_seconds_count{{{output_labels}}} {num_events}", rendered)
+        self.assertIn(f"streampipes_function_outbound_queue_depth{{{output_labels}}} 0", rendered)
+        self.assertIn(
+            f'streampipes_broker_pending_messages{{stream_id="{self.data_stream_nats["elementId"]}",'
+            f'broker="NatsConsumer"}} 3',
+            rendered,
+        )
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.post", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_tracing(
+        self,
+        server_version: MagicMock,
+        endpoint: MagicMock,
+        post: MagicMock,
+        publish_events: MagicMock,
+        get_message: MagicMock,
+        *args: Tuple[AsyncMock],
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.return_value = TestMessageIterator(self.test_stream_data1)
+
+        output_events = []
+        publish_events.side_effect = lambda _, events: output_events.extend(events)
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        output_stream = create_data_stream("output", attributes={"number": RuntimeType.INTEGER.value})
+        test_function = TestFunctionOutput(FunctionDefinition().add_output_data_stream(output_stream))
+        # a second function consuming the same data stream does not trace the received messages again
+        other_function = TestFunction()
+        registration = Registration().register(test_function).register(other_function)
+        metrics = FunctionMetrics()
+        tracer = LatencyTracer(metrics, trace_headers=True)
+        function_handler = FunctionHandler(registration, client, metrics=metrics, tracer=tracer)
+        function_handler.initializeFunctions()
+
+        self.assertListEqual(
+            [event["trace_input_timestamp"] for event in output_events],
+            [event["timestamp"] for event in self.test_stream_data1],
+        )
+        for event in output_events:
+            self.assertGreaterEqual(event["trace_receive_timestamp"], event["trace_input_timestamp"])
+            self.assertGreaterEqual(event["timestamp"], event["trace_receive_timestamp"])
+            self.assertGreaterEqual(event["trace_decode_ms"], 0)
+        self.assertIsNone(test_function._trace)
+
+        function_id = test_function.getFunctionId().id
+        input_stream_id = self.data_stream_nats["elementId"]
+        num_events = float(len(self.test_stream_data1))
+        rendered = metrics.render().splitlines()
+        self.assertIn(
+            f'streampipes_function_receive_lag_seconds_count{{stream_id="{input_stream_id}"}} {num_events}', rendered
+        )
+        self.assertIn(
+            f'streampipes_function_exit_lag_seconds_count{{function_id="{function_id}",stream_id="{input_stream_id}"}} '
+            f"{num_events}",
+            rendered,
+        )
+        other_id = other_function.getFunctionId().id
+        self.assertIn(
+            f'streampipes_function_exit_lag_seconds_count{{function_id="{other_id}",stream_id="{input_stream_id}"}} '
+            f"{num_events}",
+            rendered,
+        )
+        self.assertIn(
+            f"streampipes_function_output_lag_seconds_count"
+            f'{{function_id="{function_id}",stream_id="{output_stream.element_id}"}} {num_events}',
+            rendered,
+        )
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_profiler(
+        self, server_version: MagicMock, endpoint: MagicMock, get_message: MagicMock, *args: Tuple[AsyncMock]
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.return_value = TestMessageIterator(self.test_stream_data1)
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        test_function = TestFunction()
+        registration = Registration().register(test_function)
+        profiler = FunctionProfiler(sample_interval=2)
+        metrics = FunctionMetrics()
+        with patch.object(profiler, "install_signal_handler") as install_signal_handler:
+            FunctionHandler(registration, client, metrics=metrics, profiler=profiler).initializeFunctions()
+
+        install_signal_handler.assert_called_once()
+        self.assertListEqual(test_function.data, self.test_stream_data1)
+        summary = profiler.summary()
+        self.assertIn(f"Function {test_function.getFunctionId().id}: 4 sampled event(s)", summary)
+        self.assertIn("onEvent", summary)
+        self.assertIn("/profile", metrics._pages)
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_projection(
+        self, server_version: MagicMock, endpoint: MagicMock, get_message: MagicMock, *args: Tuple[AsyncMock]
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.return_value = TestMessageIterator(self.test_stream_data1)
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        class TestProjectionFunction(TestFunction):
+            def requiredFields(self, streamId: str) -> List[str]:
+                return ["density"]
+
+        test_function = TestProjectionFunction()
+        function_handler = FunctionHandler(Registration().register(test_function), client)
+        function_handler.initializeFunctions()
+
+        broker = function_handler.stream_contexts[test_function.requiredStreamIds()[0]].broker
+        self.assertTrue(broker.projection.flat)
+        self.assertListEqual(
+            test_function.data,
+            [{"density": event["density"], "timestamp": event["timestamp"]} for event in self.test_stream_data1],
+        )
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_event_format(
+        self, server_version: MagicMock, endpoint: MagicMock, get_message: MagicMock, *args: Tuple[AsyncMock]
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.return_value = TestMessageIterator(self.test_stream_data1)
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        class TestRecordFunction(TestFunction):
+            def eventFormat(self, streamId: str) -> EventFormat:
+                return EventFormat.RECORD
+
+        test_function = TestRecordFunction()
+        FunctionHandler(Registration().register(test_function), client).initializeFunctions()
+
+        self.assertListEqual(
+            [(event["timestamp"], event["density"], event["temperature"]) for event in self.test_stream_data1],
+            [(record.timestamp, record.density, record.temperature) for record in test_function.data],
+        )
+
+    @patch("streampipes.functions.broker.kafka.kafka_consumer.KafkaConnection", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_consumer_group(
+        self, server_version: MagicMock, endpoint: MagicMock, connection: MagicMock
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_kafka)
+
+        class TopicPartition:
+            def __init__(self, partition: int) -> None:
+                self.partition = partition
+
+        messages = TestKafkaMessageContainer(self.test_stream_data1)
+        connection_mock = MagicMock()
+
+        def poll(*args):
+            # the assignment callbacks are invoked by Kafka within poll()
+            callbacks = connection_mock.subscribe.call_args.kwargs
+            if messages.i == -1:
+                callbacks["on_assign"](connection_mock, [TopicPartition(0), TopicPartition(2)])
+            elif messages.i == 2:
+                callbacks["on_revoke"](connection_mock, [TopicPartition(2)])
+            return messages.get_data()
+
+        connection_mock.poll.side_effect = poll
+        connection.return_value = connection_mock
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        class TestGroupFunction(TestFunction):
+            def consumerGroup(self, streamId: str) -> str:
+                return "scaled-function"
+
+            def onPartitionsAssigned(self, streamId: str, partitions: List[int]) -> None:
+                self.partitions = getattr(self, "partitions", set()) | set(partitions)
+
+            def onPartitionsRevoked(self, streamId: str, partitions: List[int]) -> None:
+                self.partitions -= set(partitions)
+
+        test_function = TestGroupFunction()
+        function_handler = FunctionHandler(Registration().register(test_function), client)
+        function_handler.initializeFunctions()
+
+        config = connection.call_args.args[0]
+        self.assertEqual("scaled-function", config["group.id"])
+        self.assertEqual("cooperative-sticky", config["partition.assignment.strategy"])
+        self.assertSetEqual({0}, test_function.partitions)
+        self.assertSetEqual({0}, function_handler.brokers[0].assigned_partitions)
+        self.assertListEqual(test_function.data, self.test_stream_data1)
+
+        class OtherGroupFunction(TestFunction):
+            def consumerGroup(self, streamId: str) -> str:
+                return "other"
+
+        with self.assertRaises(ValueError):
+            FunctionHandler(
+                Registration().register(TestGroupFunction()).register(OtherGroupFunction()), client
+            ).initializeFunctions()
+
+    @patch("streampipes.functions.broker.kafka.kafka_consumer.KafkaConnection", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_at_least_once(
+        self, server_version: MagicMock, endpoint: MagicMock, connection: MagicMock
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_kafka)
+
+        class TestKafkaPartitionMessage(TestKafkaMessage):
+            def __init__(self, data, offset: int) -> None:
+                super().__init__(data)
+                self._offset = offset
+
+            def partition(self) -> int:
+                return 1
+
+            def offset(self) -> int:
+                return self._offset
+
+        messages = iter(
+            [TestKafkaPartitionMessage(event, offset) for offset, event in enumerate(self.test_stream_data1, 100)]
+        )
+
+        connection_mock = MagicMock()
+
+        def poll(*args):
+            # the partition is assigned by Kafka within the first poll()
+            if connection_mock.poll.call_count == 1:
+                partition = MagicMock()
+                partition.partition = 1
+                connection_mock.subscribe.call_args.kwargs["on_assign"](connection_mock, [partition])
+            try:
+                return next(messages)
+            except StopIteration:
+                raise StopAsyncIteration
+
+        connection_mock.poll.side_effect = poll
+        connection.return_value = connection_mock
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        test_function = TestFunction()
+        FunctionHandler(
+            Registration().register(test_function),
+            client,
+            at_least_once=AtLeastOnceConfig(commit_interval=60, commit_batch_size=3),
+        ).initializeFunctions()
+
+        config = connection.call_args.args[0]
+        self.assertFalse(config["enable.auto.commit"])
+        self.assertListEqual(test_function.data, self.test_stream_data1)
+        commits = [
+            ([(offset.partition, offset.offset) for offset in commit.kwargs["offsets"]], commit.kwargs["asynchronous"])
+            for commit in connection_mock.commit.call_args_list
+        ]
+        self.assertListEqual([([(1, 103)], True), ([(1, 106)], True), ([(1, 107)], False)], commits)
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_jetstream(self, server_version: MagicMock, endpoint: MagicMock, connection: AsyncMock):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+
+        messages = [TestNatsMessage(event) for event in self.test_stream_data1]
+        for message in messages:
+            message.ack = AsyncMock()
+            message.ack_sync = AsyncMock()
+
+        connection.return_value.jetstream = MagicMock()
+        jetstream = connection.return_value.jetstream.return_value
+        jetstream.pull_subscribe = AsyncMock()
+        subscription = jetstream.pull_subscribe.return_value
+        subscription.fetch = AsyncMock(
+            side_effect=[messages[:3], NatsTimeoutError(), messages[3:6], messages[6:], RuntimeError()]
+        )
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        test_function = TestFunction()
+        FunctionHandler(
+            Registration().register(test_function), client, jetstream=JetStreamConfig(batch_size=3)
+        ).initializeFunctions()
+
+        self.assertListEqual(test_function.data, self.test_stream_data1)
+        self.assertIsNone(jetstream.pull_subscribe.call_args.kwargs["durable"])
+        self.assertEqual(AckPolicy.ALL, jetstream.pull_subscribe.call_args.kwargs["config"].ack_policy)
+        self.assertEqual(DeliverPolicy.NEW, jetstream.pull_subscribe.call_args.kwargs["config"].deliver_policy)
+        subscription.fetch.assert_awaited_with(3, timeout=1.0)
+        # the messages are acknowledged in bulk, ending with the last one
+        acks = [message for message in messages if message.ack.await_count or message.ack_sync.await_count]
+        self.assertLess(len(acks), len(messages))
+        self.assertIs(messages[-1], acks[-1])
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.post", autospec=True)
+    @patch("streampipes.endpoint.api.DataStreamEndpoint.get", autospec=True)
+    @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
+    def test_function_handler_nats_publisher_config(
+        self,
+        server_version: MagicMock,
+        endpoint: MagicMock,
+        post: MagicMock,
+        get_message: MagicMock,
+        nats_consumer_connection: AsyncMock,
+        nats_publisher_connection: AsyncMock,
+    ):
+        server_version.return_value = {"backendVersion": "0.x.y"}
+        endpoint.return_value = DataStream(**self.data_stream_nats)
+        get_message.return_value = TestMessageIterator(self.test_stream_data1)
+
+        client = StreamPipesClient(
+            client_config=StreamPipesClientConfig(
+                credential_provider=StreamPipesApiKeyCredentials(username="user", api_key="key"),
+                host_address="localhost",
+            )
+        )
+
+        output_stream1 = create_data_stream("output1", attributes={"number": RuntimeType.INTEGER.value})
+        output_stream2 = create_data_stream("output2", attributes={"number": RuntimeType.INTEGER.value})
+        test_function = TestFunctionOutput(
+            FunctionDefinition().add_output_data_stream(output_stream1).add_output_data_stream(output_stream2)
+        )
+        FunctionHandler(
+            Registration().register(test_function),
+            client,
+            nats_publisher_config=NatsPublisherConfig(flush_size=1024),
+            stream_nats_publisher_configs={output_stream1.element_id: NatsPublisherConfig(pending_size=2048)},
+        ).initializeFunctions()
+
+        publisher1 = test_function.output_collectors[output_stream1.element_id].publisher
+        publisher2 = test_function.output_collectors[output_stream2.element_id].publisher
+        self.assertEqual((2048, None), (publisher1.pending_size, publisher1.flush_size))
+        self.assertEqual((None, 1024), (publisher2.pending_size, publisher2.flush_size))
+        # the publisher of the first stream reconnects with the changed pending size before publishing
+        self.assertEqual(2048, nats_publisher_connection.call_args.kwargs["pending_size"])
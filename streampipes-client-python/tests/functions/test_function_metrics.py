@@ -0,0 +1,60 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from streampipes.functions.utils.function_metrics import FunctionMetrics
+
+
+class TestFunctionMetrics(TestCase):
+    def test_render(self):
+        metrics = FunctionMetrics(buckets=[0.1, 1.0])
+        metrics.inc("streampipes_function_events_in_total", ("function", "stream"))
+        metrics.inc("streampipes_function_events_in_total", ("function", "stream"), 2)
+        metrics.observe("streampipes_function_decode_seconds", ('st"ream',), 0.05)
+        metrics.observe("streampipes_function_decode_seconds", ('st"ream',), 0.5)
+        metrics.observe("streampipes_function_decode_seconds", ('st"ream',), 5)
+        metrics.add_collector(lambda: [("streampipes_broker_pending_messages", ("stream", "NatsConsumer"), 7)])
+
+        rendered = metrics.render().splitlines()
+
+        self.assertIn("# TYPE streampipes_function_events_in_total counter", rendered)
+        self.assertIn('streampipes_function_events_in_total{function_id="function",stream_id="stream"} 3.0', rendered)
+        self.assertIn("# TYPE streampipes_function_decode_seconds histogram", rendered)
+        self.assertIn('streampipes_function_decode_seconds_bucket{stream_id="st\\"ream",le="0.1"} 1.0', rendered)
+        self.assertIn('streampipes_function_decode_seconds_bucket{stream_id="st\\"ream",le="1.0"} 2.0', rendered)
+        self.assertIn('streampipes_function_decode_seconds_bucket{stream_id="st\\"ream",le="+Inf"} 3.0', rendered)
+        self.assertIn('streampipes_function_decode_seconds_sum{stream_id="st\\"ream"} 5.55', rendered)
+        self.assertIn('streampipes_function_decode_seconds_count{stream_id="st\\"ream"} 3.0', rendered)
+        self.assertIn('streampipes_broker_pending_messages{stream_id="stream",broker="NatsConsumer"} 7', rendered)
+        self.assertNotIn("# TYPE streampipes_function_events_out_total counter", rendered)
+
+    def test_server(self):
+        metrics = FunctionMetrics()
+        metrics.inc("streampipes_function_events_in_total", ("function", "stream"))
+        metrics.start_server(port=0, host="127.0.0.1")
+        port = metrics._server.server_port  # type: ignore
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                self.assertEqual(200, response.status)
+                self.assertIn(b"streampipes_function_events_in_total", response.read())
+            with self.assertRaises(HTTPError):
+                urlopen(f"http://127.0.0.1:{port}/")
+        finally:
+            metrics.stop_server()
+        self.assertIsNone(metrics._server)
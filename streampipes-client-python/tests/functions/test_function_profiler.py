@@ -0,0 +1,119 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import signal
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from streampipes.functions.utils.function_profiler import FunctionProfiler
+
+
+def hot_spot():
+    return sum(range(1000))
+
+
+class TestFunctionProfiler(TestCase):
+    def process(self, profiler: FunctionProfiler, num_events: int) -> None:
+        for _ in range(num_events):
+            if profiler.start("function"):
+                hot_spot()
+                profiler.stop("function")
+
+    def test_sampling(self):
+        profiler = FunctionProfiler(sample_interval=3)
+        self.process(profiler, 7)
+
+        summary = profiler.summary()
+        self.assertIn("Function function: 3 sampled event(s)", summary)
+        self.assertIn("hot_spot", summary)
+
+    def test_disabled(self):
+        profiler = FunctionProfiler(enabled=False)
+        self.process(profiler, 5)
+
+        self.assertEqual("", profiler.summary())
+
+    def test_nested(self):
+        profiler = FunctionProfiler(sample_interval=1)
+        self.assertTrue(profiler.start("producer"))
+        # the in-process consumer is part of the profile of the producer
+        self.assertFalse(profiler.start("consumer"))
+        profiler.stop("producer")
+        self.assertTrue(profiler.start("consumer"))
+        profiler.stop("consumer")
+
+    def test_invalid_sample_interval(self):
+        with self.assertRaises(ValueError):
+            FunctionProfiler(sample_interval=0)
+
+    def test_toggle_dumps_profiles(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = FunctionProfiler(sample_interval=1, output_dir=output_dir)
+            self.process(profiler, 2)
+            profiler.toggle()
+
+            self.assertFalse(profiler.enabled)
+            self.assertListEqual(["function.prof"], os.listdir(output_dir))
+
+    def test_toggle_while_sampling(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = FunctionProfiler(sample_interval=1, output_dir=output_dir)
+            self.assertTrue(profiler.start("function"))
+            profiler.toggle()
+
+            # the profile is written once the sampled event has been processed
+            self.assertListEqual([], os.listdir(output_dir))
+            hot_spot()
+            profiler.stop("function")
+            self.assertListEqual(["function.prof"], os.listdir(output_dir))
+            self.assertIn("hot_spot", profiler.cached_summary())
+
+    def test_cached_summary(self):
+        profiler = FunctionProfiler(sample_interval=1)
+        self.process(profiler, 1)
+
+        self.assertNotIn("hot_spot", profiler.cached_summary())
+        # the requested summary is created after the next sampled event
+        self.process(profiler, 1)
+        summary = profiler.cached_summary()
+        self.assertIn("Function function: 2 sampled event(s)", summary)
+        self.assertIn("hot_spot", summary)
+
+    @skipUnless(hasattr(signal, "SIGUSR1"), "requires SIGUSR1")
+    def test_signal_handler(self):
+        previous_handler = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous_handler)
+
+        profiler = FunctionProfiler(enabled=False)
+        self.assertTrue(profiler.install_signal_handler())
+        os.kill(os.getpid(), signal.SIGUSR1)
+
+        self.assertTrue(profiler.enabled)
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(FunctionProfiler.from_env())
+        with patch.dict(os.environ, {"FUNCTION-PROFILING": "false"}):
+            self.assertIsNone(FunctionProfiler.from_env())
+        with patch.dict(os.environ, {"FUNCTION-PROFILING": "10", "FUNCTION-PROFILING-DIR": "/tmp/profiles"}):
+            profiler = FunctionProfiler.from_env()
+            self.assertEqual(10, profiler.sample_interval)  # type: ignore
+            self.assertEqual("/tmp/profiles", profiler.output_dir)  # type: ignore
+        with patch.dict(os.environ, {"FUNCTION-PROFILING": "true"}):
+            profiler = FunctionProfiler.from_env()
+            self.assertEqual(FunctionProfiler.DEFAULT_SAMPLE_INTERVAL, profiler.sample_interval)  # type: ignore
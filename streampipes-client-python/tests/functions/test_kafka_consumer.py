@@ -0,0 +1,96 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from confluent_kafka import TopicPartition
+from streampipes.functions.broker import KafkaConsumer
+from streampipes.functions.broker.kafka.kafka_consumer import AtLeastOnceConfig
+from streampipes.functions.broker.kafka.kafka_message_fetcher import KafkaMessage
+
+
+def message(partition: int, offset: int) -> KafkaMessage:
+    kafka_message = MagicMock()
+    kafka_message.partition.return_value = partition
+    kafka_message.offset.return_value = offset
+    return KafkaMessage(b"{}", kafka_message)
+
+
+class TestKafkaConsumer(TestCase):
+    @patch("streampipes.functions.broker.kafka.kafka_consumer.KafkaConnection", autospec=True)
+    def setUp(self, connection: MagicMock) -> None:
+        self.consumer = KafkaConsumer()
+        self.consumer.stream_id = "stream"
+        self.consumer.topic_name = "topic"
+        self.consumer.at_least_once = AtLeastOnceConfig()
+        asyncio.run(self.consumer._make_connection("localhost", 9094))
+        self.config = connection.call_args.args[0]
+
+    def test_lag_from_statistics(self):
+        self.assertEqual(KafkaConsumer.STATISTICS_INTERVAL_MS, self.config["statistics.interval.ms"])
+        self.assertIsNone(self.consumer.get_pending_messages())
+
+        self.consumer.assigned_partitions.update([0, 1])
+        statistics = {
+            "topics": {
+                "topic": {
+                    "partitions": {
+                        "0": {"hi_offset": 120, "app_offset": 100},
+                        "1": {"hi_offset": 50, "app_offset": -1001},
+                        "2": {"hi_offset": 80, "app_offset": 10},
+                        "-1": {"hi_offset": -1, "app_offset": -1},
+                    }
+                }
+            }
+        }
+        self.config["stats_cb"](json.dumps(statistics))
+
+        # only the assigned partitions with a known position are taken into account
+        self.assertEqual(20, self.consumer.get_pending_messages())
+        self.consumer.kafka_consumer.position.assert_not_called()
+        self.consumer.kafka_consumer.get_watermark_offsets.assert_not_called()
+
+    def test_revoke_commits_acknowledged_offsets(self):
+        kafka_consumer = self.consumer.kafka_consumer
+        self.consumer._on_assign(kafka_consumer, [TopicPartition("topic", 0), TopicPartition("topic", 1)])
+        self.consumer.acknowledge(message(0, 10))
+        self.consumer.acknowledge(message(1, 20))
+
+        self.consumer._on_revoke(kafka_consumer, [TopicPartition("topic", 1)])
+
+        kafka_consumer.commit.assert_called_once()
+        self.assertFalse(kafka_consumer.commit.call_args.kwargs["asynchronous"])
+        offsets = kafka_consumer.commit.call_args.kwargs["offsets"]
+        self.assertListEqual([(1, 21)], [(offset.partition, offset.offset) for offset in offsets])
+        self.assertDictEqual({0: 11}, self.consumer._offsets)
+
+        # messages of the revoked partition that are processed afterwards belong to its new owner
+        self.assertFalse(self.consumer.acknowledge(message(1, 21)))
+        self.assertDictEqual({0: 11}, self.consumer._offsets)
+
+    def test_lost_partitions_are_not_committed(self):
+        kafka_consumer = self.consumer.kafka_consumer
+        self.consumer._on_assign(kafka_consumer, [TopicPartition("topic", 0)])
+        self.consumer.acknowledge(message(0, 10))
+
+        self.consumer._on_lost(kafka_consumer, [TopicPartition("topic", 0)])
+
+        kafka_consumer.commit.assert_not_called()
+        self.assertDictEqual({}, self.consumer._offsets)
+        self.assertSetEqual(set(), self.consumer.assigned_partitions)
@@ -0,0 +1,114 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from confluent_kafka import KafkaError, KafkaException
+from streampipes.functions.broker import KafkaConsumer, KafkaPublisher
+from streampipes.functions.broker.kafka.kafka_profile import KafkaProfile
+
+
+class TestKafkaProfile(TestCase):
+    def test_presets(self):
+        profile = KafkaProfile.high_throughput()
+
+        self.assertDictEqual(
+            {"fetch.min.bytes": 65536, "fetch.wait.max.ms": 100, "queued.max.messages.kbytes": 262144},
+            profile.get_consumer_config(),
+        )
+        self.assertDictEqual(
+            {"linger.ms": 20, "batch.num.messages": 10000, "compression.type": "lz4", "enable.idempotence": True},
+            profile.get_producer_config(),
+        )
+        self.assertEqual(0, KafkaProfile.low_latency().get_producer_config()["linger.ms"])
+
+    def test_custom_profile(self):
+        profile = KafkaProfile(compression_type="zstd", producer_config={"acks": "all"})
+
+        self.assertDictEqual({}, profile.get_consumer_config())
+        self.assertDictEqual({"compression.type": "zstd", "acks": "all"}, profile.get_producer_config())
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(KafkaProfile.from_env())
+        with patch.dict(os.environ, {"KAFKA-PROFILE": "low-latency"}):
+            self.assertEqual(KafkaProfile.low_latency(), KafkaProfile.from_env())
+        with patch.dict(os.environ, {"KAFKA-PROFILE": "fastest"}):
+            self.assertIsNone(KafkaProfile.from_env())
+
+    @patch("streampipes.functions.broker.kafka.kafka_consumer.KafkaConnection", autospec=True)
+    def test_consumer(self, connection: MagicMock):
+        consumer = KafkaConsumer()
+        consumer.profile = KafkaProfile.high_throughput()
+        asyncio.run(consumer._make_connection("localhost", 9094))
+
+        config = connection.call_args.args[0]
+        self.assertEqual("localhost:9094", config["bootstrap.servers"])
+        self.assertEqual(65536, config["fetch.min.bytes"])
+
+    @patch("streampipes.functions.broker.kafka.kafka_publisher.Producer", autospec=True)
+    def test_publisher(self, producer: MagicMock):
+        producer.return_value.flush.return_value = 0
+        publisher = KafkaPublisher()
+        publisher.topic_name = "topic"
+        asyncio.run(publisher._make_connection("localhost", 9094))
+        asyncio.run(publisher.publish_event({"density": 1.0}))
+
+        # without profile, the delivery of every event is awaited
+        producer.return_value.flush.assert_called_once()
+
+        publisher.configure(KafkaProfile.high_throughput())
+        self.assertEqual(20, producer.call_args.args[0]["linger.ms"])
+        producer.return_value.flush.reset_mock()
+        asyncio.run(publisher.publish_event({"density": 1.0}))
+
+        producer.return_value.flush.assert_not_called()
+        producer.return_value.poll.assert_called_once_with(0)
+        asyncio.run(publisher.flush())
+        producer.return_value.flush.assert_called_once()
+
+    @patch("streampipes.functions.broker.kafka.kafka_publisher.Producer", autospec=True)
+    def test_publisher_delivery_errors(self, producer: MagicMock):
+        publisher = KafkaPublisher()
+        publisher.topic_name = "topic"
+        publisher.stream_id = "stream"
+        publisher.profile = KafkaProfile.high_throughput()
+        publisher.flush_timeout = 5.0
+        asyncio.run(publisher._make_connection("localhost", 9094))
+
+        # the delivery reports are served while flushing
+        def flush(timeout: float) -> int:
+            on_delivery = producer.return_value.produce.call_args.kwargs["on_delivery"]
+            on_delivery(KafkaError(KafkaError._MSG_TIMED_OUT), None)
+            return 0
+
+        producer.return_value.flush.side_effect = flush
+        asyncio.run(publisher.publish_event({"density": 1.0}))
+        with self.assertRaises(KafkaException):
+            asyncio.run(publisher.flush())
+        producer.return_value.flush.assert_called_once_with(5.0)
+
+        # events still waiting for their delivery after the timeout fail the flush as well
+        producer.return_value.flush.side_effect = None
+        producer.return_value.flush.return_value = 2
+        with self.assertRaisesRegex(KafkaException, "2 events"):
+            asyncio.run(publisher.flush())
+
+        producer.return_value.flush.return_value = 0
+        asyncio.run(publisher.flush())
@@ -0,0 +1,199 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import paho.mqtt.client as mqtt
+from streampipes.functions.broker import SupportedBroker
+from streampipes.functions.broker.broker_handler import get_broker
+from streampipes.functions.broker.mqtt.mqtt_consumer import MqttConsumer
+from streampipes.functions.broker.mqtt.mqtt_publisher import MqttPublisher
+from streampipes.functions.utils.data_stream_generator import (
+    RuntimeType,
+    create_data_stream,
+)
+
+
+class TestMqttMessage:
+    def __init__(self, data: Any) -> None:
+        self.payload = json.dumps(data).encode()
+
+
+class TestMqttBroker(TestCase):
+    def setUp(self) -> None:
+        self.data_stream = create_data_stream(
+            "Test_MQTT", attributes={"density": RuntimeType.FLOAT.value}, broker=SupportedBroker.MQTT
+        )
+        self.data_stream.event_grounding.transport_protocols[0].topic_definition.actual_topic_name = "test"
+
+    def test_get_broker(self):
+        self.assertIsInstance(get_broker(self.data_stream), MqttConsumer)
+        self.assertIsInstance(get_broker(self.data_stream, is_publisher=True), MqttPublisher)
+
+    def test_get_broker_without_paho(self):
+        # the client is usable without the optional MQTT package until an MQTT data stream is used
+        script = (
+            "import sys\n"
+            "sys.modules['paho'] = None\n"
+            "from streampipes.functions.broker import NatsConsumer, SupportedBroker, get_broker\n"
+            "from streampipes.functions.utils.data_stream_generator import create_data_stream\n"
+            "assert isinstance(get_broker(create_data_stream('test', {})), NatsConsumer)\n"
+            "get_broker(create_data_stream('test', {}, broker=SupportedBroker.MQTT))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+
+        self.assertNotEqual(0, result.returncode)
+        self.assertIn("ImportError: MQTT data streams require the package paho-mqtt", result.stderr)
+
+    @patch.dict(os.environ, {"BROKER-HOST": "localhost", "MQTT-PORT": "1884"})
+    @patch("streampipes.functions.broker.mqtt.mqtt_consumer.mqtt.Client", autospec=True)
+    def test_consumer(self, client: MagicMock):
+        consumer = MqttConsumer()
+        consumer.consumer_group = "group"
+        consumer.max_buffered_messages = 2
+
+        async def run() -> List[Any]:
+            await consumer.connect(self.data_stream)
+            # the network loop of the client delivers the messages from another thread
+            network_loop = threading.Thread(
+                target=lambda: [
+                    consumer._on_message(client.return_value, None, TestMqttMessage({"density": float(i)}))
+                    for i in range(5)
+                ]
+            )
+            network_loop.start()
+            messages = consumer.get_message()
+            events = [consumer.decode_message(await messages.__anext__()) for _ in range(5)]
+            network_loop.join()
+            await consumer.disconnect()
+            return events
+
+        events = asyncio.run(run())
+
+        self.assertListEqual([{"density": float(i)} for i in range(5)], events)
+        client.return_value.connect.assert_called_once_with("localhost", 1884)
+        client.return_value.max_inflight_messages_set.assert_called_once_with(20)
+        client.return_value.subscribe.assert_called_once_with("$share/group/test", qos=1)
+        self.assertEqual(0, consumer.get_pending_messages())
+
+    @patch("streampipes.functions.broker.mqtt.mqtt_consumer.mqtt.Client", autospec=True)
+    def test_consumer_full_buffer(self, client: MagicMock):
+        consumer = MqttConsumer()
+        consumer.max_buffered_messages = 1
+        consumer.max_block_time = 0.01
+
+        async def run() -> List[Any]:
+            await consumer.connect(self.data_stream)
+            # the network loop is only paused shortly and buffers the messages beyond the limit
+            with self.assertLogs("streampipes.functions.broker.mqtt.mqtt_consumer", level="WARNING") as logs:
+                for i in range(3):
+                    consumer._on_message(client.return_value, None, TestMqttMessage({"density": float(i)}))
+            self.assertEqual(2, len(logs.output))
+            messages = consumer.get_message()
+            events = [consumer.decode_message(await messages.__anext__()) for _ in range(3)]
+            # only the message that was buffered within the limit returns its capacity
+            self.assertTrue(consumer._capacity.acquire(blocking=False))
+            self.assertFalse(consumer._capacity.acquire(blocking=False))
+            consumer._capacity.release()
+
+            # a network loop waiting for capacity is released on disconnect and drops further messages
+            consumer.max_block_time = 60
+            network_loop = threading.Thread(
+                target=lambda: [
+                    consumer._on_message(client.return_value, None, TestMqttMessage({"density": float(i)}))
+                    for i in range(3)
+                ]
+            )
+            network_loop.start()
+            while consumer.get_pending_messages() == 0:
+                await asyncio.sleep(0.01)
+            await consumer.disconnect()
+            network_loop.join(timeout=5)
+            self.assertFalse(network_loop.is_alive())
+            return events
+
+        events = asyncio.run(run())
+
+        self.assertListEqual([{"density": float(i)} for i in range(3)], events)
+        self.assertEqual(1, consumer.get_pending_messages())
+
+    @patch("streampipes.functions.broker.mqtt.mqtt_publisher.mqtt.Client", autospec=True)
+    def test_publisher(self, client: MagicMock):
+        info = MagicMock()
+        info.rc = mqtt.MQTT_ERR_SUCCESS
+        client.return_value.publish.return_value = info
+        publisher = MqttPublisher()
+        publisher.qos = 2
+
+        async def run():
+            await publisher.connect(self.data_stream)
+            await publisher.publish_events([{"density": 1.0}, {"density": 2.0}])
+            info.wait_for_publish.assert_not_called()
+            await publisher.flush()
+
+        asyncio.run(run())
+
+        client.return_value.publish.assert_called_with("test", b'{"density": 2.0}', qos=2)
+        self.assertEqual(2, info.wait_for_publish.call_count)
+
+    @patch("streampipes.functions.broker.mqtt.mqtt_publisher.mqtt.Client", autospec=True)
+    def test_publisher_disconnected(self, client: MagicMock):
+        infos = [mqtt.MQTTMessageInfo(mid) for mid in range(3)]
+        for info in infos:
+            info.rc = mqtt.MQTT_ERR_NO_CONN
+        client.return_value.publish.side_effect = infos
+        publisher = MqttPublisher()
+        publisher.flush_timeout = 0.1
+
+        async def run():
+            await publisher.connect(self.data_stream)
+            # the events are queued by the client until it has reconnected
+            await publisher.publish_events([{"density": 1.0}, {"density": 2.0}])
+            infos[0]._set_as_published()
+            with self.assertRaisesRegex(TimeoutError, "1 events of stream .* not confirmed within 0.1 seconds"):
+                await publisher.flush()
+            # events with a quality of service of 0 are not queued
+            publisher.qos = 0
+            with self.assertLogs("streampipes.functions.broker.mqtt.mqtt_publisher", "WARNING"):
+                await publisher.publish_event({"density": 3.0})
+            await publisher.flush()
+
+        asyncio.run(run())
+
+    @patch("streampipes.functions.broker.mqtt.mqtt_publisher.mqtt.Client", autospec=True)
+    def test_publisher_disconnect_timeout(self, client: MagicMock):
+        client.return_value.publish.return_value = mqtt.MQTTMessageInfo(0)
+        publisher = MqttPublisher()
+        publisher.flush_timeout = 0.1
+
+        async def run():
+            await publisher.connect(self.data_stream)
+            await publisher.publish_event({"density": 1.0})
+            with self.assertLogs("streampipes.functions.broker.mqtt.mqtt_publisher", "ERROR"):
+                await publisher.disconnect()
+
+        asyncio.run(run())
+
+        client.return_value.disconnect.assert_called_once()
+        client.return_value.loop_stop.assert_called_once()
@@ -0,0 +1,139 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import tempfile
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from nats.errors import SlowConsumerError
+from streampipes.functions.broker import NatsConsumer
+from streampipes.functions.broker.nats.nats_consumer import (
+    OverflowPolicy,
+    SubscriptionLimits,
+)
+from streampipes.functions.broker.nats.nats_spill_buffer import SpillBuffer
+
+
+class TestNatsMessage:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+
+class TestSpillBuffer(TestCase):
+    def test_spill(self):
+        async def run() -> List[Any]:
+            with tempfile.TemporaryDirectory() as directory:
+                buffer = SpillBuffer(max_messages=2, max_bytes=0, directory=directory)
+                for i in range(5):
+                    await buffer.put(TestNatsMessage(str(i).encode()))
+                self.assertEqual(3, buffer.num_spilled)
+                received = [(await buffer.__anext__()).data for _ in range(3)]
+                # messages stay in order, the file is still read before the memory is used again
+                await buffer.put(TestNatsMessage(b"5"))
+                self.assertEqual(3, buffer.num_spilled)
+                received += [(await buffer.__anext__()).data for _ in range(3)]
+                self.assertEqual(0, buffer.num_spilled)
+                await buffer.put(TestNatsMessage(b"6"))
+                self.assertEqual(0, buffer.num_spilled)
+                received.append((await buffer.__anext__()).data)
+                buffer.close()
+                return received
+
+        self.assertListEqual([b"0", b"1", b"2", b"3", b"4", b"5", b"6"], asyncio.run(run()))
+
+    @patch("streampipes.functions.broker.nats.nats_spill_buffer._COMPACT_BYTES", 10)
+    @patch("streampipes.functions.broker.nats.nats_spill_buffer._COPY_CHUNK_BYTES", 4)
+    @patch("streampipes.functions.broker.nats.nats_spill_buffer._OFFLOAD_BYTES", 2)
+    def test_compact(self):
+        async def run() -> List[Any]:
+            buffer = SpillBuffer(max_messages=1, max_bytes=0)
+            received = []
+            # the file is never drained completely but only keeps the messages still to be read,
+            # the payloads and the compaction are handled in worker threads
+            for i in range(20):
+                await buffer.put(TestNatsMessage(f"{i:02}".encode()))
+                await buffer.put(TestNatsMessage(f"{i:02}".encode()))
+                received.append((await buffer.__anext__()).data)
+                self.assertLessEqual(buffer._file.seek(0, 2), 2 * (buffer.num_spilled * 6) + 10)
+            received += [(await buffer.__anext__()).data for _ in range(len(buffer))]
+            buffer.close()
+            return received
+
+        expected = [f"{i:02}".encode() for i in range(20) for _ in range(2)]
+        self.assertListEqual(expected, asyncio.run(run()))
+
+    def test_max_bytes(self):
+        async def run() -> SpillBuffer:
+            buffer = SpillBuffer(max_messages=0, max_bytes=10)
+            await buffer.put(TestNatsMessage(b"12345"))
+            await buffer.put(TestNatsMessage(b"12345"))
+            await buffer.put(TestNatsMessage(b"1"))
+            return buffer
+
+        buffer = asyncio.run(run())
+        self.assertEqual(1, buffer.num_spilled)
+        self.assertEqual(3, len(buffer))
+        buffer.close()
+
+
+class TestNatsConsumer(TestCase):
+    def subscribe(self, connection: AsyncMock, limits: SubscriptionLimits) -> NatsConsumer:
+        consumer = NatsConsumer()
+        consumer.topic_name = "topic"
+        consumer.stream_id = "stream"
+        consumer.limits = limits
+
+        async def run():
+            await consumer._make_connection("localhost", 4222)
+            await consumer._create_subscription()
+
+        asyncio.run(run())
+        return consumer
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    def test_drop(self, connection: AsyncMock):
+        consumer = self.subscribe(connection, SubscriptionLimits(pending_msgs_limit=100, pending_bytes_limit=1024))
+
+        connection.return_value.subscribe.assert_awaited_once_with(
+            "topic", pending_msgs_limit=100, pending_bytes_limit=1024
+        )
+        consumer.on_slow_consumer = MagicMock()
+        on_error = connection.call_args.kwargs["error_cb"]
+        asyncio.run(on_error(SlowConsumerError(subject="topic", reply="", sid=1, sub=MagicMock())))
+        asyncio.run(on_error(ValueError()))
+
+        self.assertEqual(1, consumer.dropped_messages)
+        consumer.on_slow_consumer.assert_called_once_with()
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    def test_unbounded(self, connection: AsyncMock):
+        with self.assertLogs("streampipes.functions.broker.nats.nats_consumer", level="WARNING"):
+            self.subscribe(connection, SubscriptionLimits(overflow_policy=OverflowPolicy.UNBOUNDED))
+
+        connection.return_value.subscribe.assert_awaited_once_with("topic", pending_msgs_limit=0, pending_bytes_limit=0)
+
+    @patch("streampipes.functions.broker.nats.nats_consumer.connect", autospec=True)
+    def test_spill(self, connection: AsyncMock):
+        consumer = self.subscribe(
+            connection, SubscriptionLimits(pending_msgs_limit=10, overflow_policy=OverflowPolicy.SPILL)
+        )
+
+        self.assertIsNotNone(consumer.spill_buffer)
+        self.assertIs(consumer.spill_buffer, consumer.get_message())
+        self.assertEqual(consumer.spill_buffer.put, connection.return_value.subscribe.call_args.kwargs["cb"])
+        self.assertEqual(0, consumer.get_pending_messages())
@@ -0,0 +1,173 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+from unittest import TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from streampipes.functions.broker import NatsPublisher
+from streampipes.functions.broker.nats.nats_publisher import NatsPublisherConfig
+from streampipes.functions.broker.output_collector import OutputCollector
+from streampipes.functions.utils.data_stream_generator import (
+    RuntimeType,
+    create_data_stream,
+)
+
+
+class TestNatsPublisher(TestCase):
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_flush_size(self, connection: AsyncMock):
+        publisher = NatsPublisher()
+        publisher.topic_name = "topic"
+        publisher.pending_size = 1024
+        publisher.flush_size = 30
+
+        async def run():
+            await publisher._make_connection("localhost", 4222)
+            await publisher.publish_events([{"density": 1.0}, {"density": 2.0}, {"density": 3.0}])
+            await publisher.publish_event({"density": 4.0})
+            await publisher.publish_event({"density": 5.0})
+
+        asyncio.run(run())
+
+        self.assertEqual(1024, connection.call_args.kwargs["pending_size"])
+        self.assertNotIn("flush_timeout", connection.call_args.kwargs)
+        self.assertEqual(5, connection.return_value.publish.await_count)
+        # every event has 17 bytes, the batch is flushed once after all of its events have been written,
+        # single events are flushed as soon as they reach the flush size
+        self.assertEqual(2, connection.return_value.flush.await_count)
+        connection.return_value.flush.assert_awaited_with(timeout=10)
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.time", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_flush_interval(self, connection: AsyncMock, time: MagicMock):
+        publisher = NatsPublisher()
+        publisher.topic_name = "topic"
+        publisher.flush_interval = 1.0
+        publisher.flush_timeout = 0.5
+
+        async def run():
+            time.monotonic.return_value = 0.0
+            await publisher._make_connection("localhost", 4222)
+            await publisher.publish_event({"density": 1.0})
+            time.monotonic.return_value = 1.5
+            await publisher.publish_event({"density": 2.0})
+            await publisher.publish_event({"density": 3.0})
+
+        asyncio.run(run())
+
+        self.assertEqual(0.5, connection.call_args.kwargs["flush_timeout"])
+        connection.return_value.flush.assert_awaited_once_with(timeout=0.5)
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_configure(self, connection: AsyncMock):
+        publisher = NatsPublisher()
+        publisher.topic_name = "topic"
+
+        async def run():
+            await publisher._make_connection("localhost", 4222)
+            # flush settings take effect without reconnecting
+            publisher.configure(NatsPublisherConfig(flush_size=1))
+            await publisher.publish_event({"density": 1.0})
+            self.assertEqual(1, connection.await_count)
+            self.assertEqual(1, connection.return_value.flush.await_count)
+            # connection settings reconnect before the next event is written
+            publisher.configure(NatsPublisherConfig(pending_size=1024, flush_size=1))
+            await publisher.publish_event({"density": 2.0})
+            await publisher.publish_event({"density": 3.0})
+
+        asyncio.run(run())
+
+        connection.return_value.close.assert_awaited_once()
+        self.assertEqual(2, connection.await_count)
+        self.assertEqual(1024, connection.call_args.kwargs["pending_size"])
+        self.assertEqual(3, connection.return_value.publish.await_count)
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_output_collector_batch(self, connection: AsyncMock):
+        data_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        output_collector = OutputCollector(data_stream)
+
+        with patch.object(output_collector.publisher, "publish_events", autospec=True) as publish_events:
+
+            async def run():
+                for i in range(3):
+                    output_collector.collect({"density": float(i)})
+                await output_collector.flush()
+                output_collector.collect({"density": 3.0})
+                await output_collector.flush()
+
+            asyncio.run(run())
+
+        self.assertListEqual(
+            [[{"density": 0.0}, {"density": 1.0}, {"density": 2.0}], [{"density": 3.0}]],
+            [call.args[0] for call in publish_events.await_args_list],
+        )
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_output_collector_serialized_batches(self, connection: AsyncMock):
+        data_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        output_collector = OutputCollector(data_stream)
+        published = []
+        in_flight = []
+
+        async def publish_events(events):
+            in_flight.append(events)
+            self.assertEqual(1, len(in_flight))
+            await asyncio.sleep(0.01)
+            published.append(events)
+            in_flight.remove(events)
+
+        with patch.object(output_collector.publisher, "publish_events", side_effect=publish_events):
+
+            async def run():
+                output_collector.collect({"density": 0.0})
+                await asyncio.sleep(0)
+                # the first batch is in flight, the following events wait for it as the next batch
+                for i in range(1, 4):
+                    output_collector.collect({"density": float(i)})
+                    await asyncio.sleep(0)
+                await output_collector.flush()
+
+            asyncio.run(run())
+
+        self.assertListEqual(
+            [[{"density": 0.0}], [{"density": 1.0}, {"density": 2.0}, {"density": 3.0}]],
+            published,
+        )
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_output_collector_publish_error(self, connection: AsyncMock):
+        data_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        output_collector = OutputCollector(data_stream)
+        connection.return_value.publish.side_effect = ConnectionError()
+
+        async def run():
+            output_collector.collect({"density": 0.0})
+            # the batch fails before the flush, the flush still reports the error
+            while output_collector._publish_tasks:
+                await asyncio.sleep(0)
+            with self.assertRaises(ConnectionError):
+                await output_collector.flush()
+            connection.return_value.flush.assert_not_awaited()
+            # the error is only raised once
+            connection.return_value.publish.side_effect = None
+            output_collector.collect({"density": 1.0})
+            await output_collector.flush()
+
+        asyncio.run(run())
+
+        connection.return_value.flush.assert_awaited_once()
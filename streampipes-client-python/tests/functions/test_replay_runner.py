@@ -0,0 +1,143 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import importlib.util
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List
+from unittest import TestCase, skipUnless
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+from streampipes.functions.registration import Registration
+from streampipes.functions.replay_runner import ReplayRunner
+from streampipes.functions.streampipes_function import StreamPipesFunction
+from streampipes.functions.utils.backfill import BackfillConfig
+from streampipes.functions.utils.data_stream_generator import (
+    RuntimeType,
+    create_data_stream,
+)
+from streampipes.functions.utils.function_context import FunctionContext
+from streampipes.model.resource import DataSeries
+from streampipes.model.resource.function_definition import FunctionDefinition
+from streampipes.model.resource.query_result import QueryResult
+
+STREAM_1 = "urn:streampipes.apache.org:eventstream:uPDKLI"
+STREAM_2 = "urn:streampipes.apache.org:eventstream:HHoidJ"
+
+
+class TestReplayFunction(StreamPipesFunction):
+    def requiredStreamIds(self) -> List[str]:
+        return [STREAM_1, STREAM_2]
+
+    def onServiceStarted(self, context: FunctionContext):
+        self.context = context
+        self.data: List[Dict[str, Any]] = []
+
+    def onEvent(self, event: Dict[str, Any], streamId: str):
+        self.data.append(event)
+        self.add_output(self.function_definition.get_output_stream_ids()[0], {"density": event["density"]})
+
+    def onServiceStopped(self):
+        self.stopped = True
+
+
+class TestReplayRunner(TestCase):
+    def setUp(self) -> None:
+        self.df1 = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime([1670000001000, 1670000003000], unit="ms", utc=True),
+                "density": [10.3, 12.6],
+            }
+        )
+        self.df2 = pd.DataFrame({"timestamp": [1670000002000, 1670000004000], "density": [5.3, 3.6]})
+
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_replay_as_fast_as_possible(self, connection: AsyncMock):
+        output_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        test_function = TestReplayFunction(FunctionDefinition().add_output_data_stream(output_stream))
+        original_collectors = test_function.output_collectors
+
+        result = ReplayRunner(Registration().register(test_function)).run({STREAM_1: self.df1, STREAM_2: self.df2})
+
+        self.assertListEqual(
+            test_function.data,
+            [
+                {"timestamp": 1670000001000, "density": 10.3},
+                {"timestamp": 1670000002000, "density": 5.3},
+                {"timestamp": 1670000003000, "density": 12.6},
+                {"timestamp": 1670000004000, "density": 3.6},
+            ],
+        )
+        self.assertEqual(4, result.num_events)
+        self.assertListEqual(
+            [10.3, 5.3, 12.6, 3.6], [event["density"] for event in result.outputs[output_stream.element_id]]
+        )
+        self.assertTrue(test_function.stopped)
+        self.assertIs(original_collectors, test_function.output_collectors)
+        self.assertEqual(0, connection.return_value.publish.call_count)
+
+    @patch("streampipes.functions.replay_runner.time", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_replay_speed(self, connection: AsyncMock, time: MagicMock):
+        time.perf_counter.return_value = 0.0
+        output_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        test_function = TestReplayFunction(FunctionDefinition().add_output_data_stream(output_stream))
+
+        ReplayRunner(Registration().register(test_function), speed=2.0).run({STREAM_1: self.df1, STREAM_2: self.df2})
+
+        self.assertListEqual([0.5, 1.0, 1.5], [c.args[0] for c in time.sleep.call_args_list])
+
+    @skipUnless(importlib.util.find_spec("pyarrow") is not None, "requires the parquet extra")
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_replay_unsorted_parquet(self, connection: AsyncMock):
+        output_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        test_function = TestReplayFunction(FunctionDefinition().add_output_data_stream(output_stream))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stream.parquet")
+            self.df1.iloc[::-1].to_parquet(path)
+            ReplayRunner(Registration().register(test_function)).run({STREAM_1: path, STREAM_2: self.df2.iloc[::-1]})
+
+        self.assertListEqual([10.3, 5.3, 12.6, 3.6], [event["density"] for event in test_function.data])
+
+    @patch("streampipes.functions.replay_runner.time", autospec=True)
+    @patch("streampipes.functions.broker.nats.nats_publisher.connect", autospec=True)
+    def test_replay_speed_data_lake(self, connection: AsyncMock, time: MagicMock):
+        time.perf_counter.return_value = 0.0
+        output_stream = create_data_stream("test", attributes={"density": RuntimeType.FLOAT.value})
+        test_function = TestReplayFunction(FunctionDefinition().add_output_data_stream(output_stream))
+
+        headers = ["time", "density"]
+        rows = [["2022-12-02T16:53:19.000Z", 9.1], ["2022-12-02T16:53:21.000Z", 9.2]]
+        client = MagicMock()
+        client.dataLakeMeasureApi.get.return_value = QueryResult(
+            total=len(rows),
+            headers=headers,
+            spQueryStatus="OK",
+            allDataSeries=[DataSeries(total=len(rows), headers=headers, rows=rows)],
+        )
+        config = BackfillConfig(measure_name="test", start_date=datetime(2022, 12, 1), timestamp_field="time")
+
+        ReplayRunner(Registration().register(test_function), client=client, speed=2.0).run({STREAM_1: config})
+
+        # the events are paced by the timestamp field of the data lake source
+        self.assertListEqual([1.0], [c.args[0] for c in time.sleep.call_args_list])
+
+    def test_invalid_speed(self):
+        with self.assertRaises(ValueError):
+            ReplayRunner(Registration(), speed=0)
@@ -74,7 +74,7 @@ class TestRiverFunction(TestCase):
     @patch("streampipes.functions.broker.NatsConsumer._create_subscription", autospec=True)
     @patch("streampipes.functions.streampipes_function.time", autospec=True)
     @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
-    @patch("streampipes.functions.broker.NatsPublisher.publish_event", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
     @patch("streampipes.client.client.Session", autospec=True)
     @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
     def test_river_function_unsupervised(
@@ -94,10 +94,10 @@ class TestRiverFunction(TestCase):
 
         output_events = []
 
-        def save_event(self, event: Dict[str, Any]):
-            output_events.append(event)
+        def save_events(self, events: List[Dict[str, Any]]):
+            output_events.extend(events)
 
-        pulish_event.side_effect = save_event
+        pulish_event.side_effect = save_events
         get_message.return_value = TestMessageIterator(self.test_stream_data)
         time.side_effect = lambda: 0
 
@@ -143,7 +143,7 @@ class TestRiverFunction(TestCase):
     @patch("streampipes.functions.broker.NatsConsumer._create_subscription", autospec=True)
     @patch("streampipes.functions.streampipes_function.time", autospec=True)
     @patch("streampipes.functions.broker.NatsConsumer.get_message", autospec=True)
-    @patch("streampipes.functions.broker.NatsPublisher.publish_event", autospec=True)
+    @patch("streampipes.functions.broker.NatsPublisher.publish_events", autospec=True)
     @patch("streampipes.client.client.Session", autospec=True)
     @patch("streampipes.client.client.StreamPipesClient._get_server_version", autospec=True)
     def test_river_function_supervised(
@@ -163,10 +163,10 @@ class TestRiverFunction(TestCase):
 
         output_events = []
 
-        def save_event(self, event: Dict[str, Any]):
-            output_events.append(event)
+        def save_events(self, events: List[Dict[str, Any]]):
+            output_events.extend(events)
 
-        pulish_event.side_effect = save_event
+        pulish_event.side_effect = save_events
         get_message.return_value = TestMessageIterator(self.test_stream_data)
         time.side_effect = lambda: 0
 
@@ -0,0 +1,112 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from streampipes.functions.utils.stream_join import IntervalJoin
+
+
+def flow(timestamp: int, sensor: str = "s1", value: float = 1.0):
+    return {"timestamp": timestamp, "sensorId": sensor, "flowRate": value}
+
+
+def temperature(timestamp: int, sensor: str = "s1", value: float = 20.0):
+    return {"timestamp": timestamp, "sensorId": sensor, "temperature": value}
+
+
+class TestIntervalJoin(TestCase):
+    def setUp(self) -> None:
+        self.join = IntervalJoin("flow", "temp", key_by="sensorId", within=500)
+
+    def test_join_within_interval(self):
+        self.assertListEqual([], self.join.process(flow(1000), "flow"))
+        self.assertListEqual([], self.join.process(temperature(1000, sensor="s2"), "temp"))
+
+        joined = self.join.process(temperature(1400), "temp")
+        self.assertListEqual(
+            [{"timestamp": 1400, "sensorId": "s1", "flowRate": 1.0, "temperature": 20.0}],
+            joined,
+        )
+        self.assertListEqual([], self.join.process(temperature(1501), "temp"))
+
+    def test_join_function_gets_left_event_first(self):
+        join = IntervalJoin("flow", "temp", key_by=lambda e: e["sensorId"], within=0, join_function=lambda l, r: (l, r))
+        join.process(temperature(1000), "temp")
+
+        self.assertListEqual([(flow(1000), temperature(1000))], join.process(flow(1000), "flow"))
+
+    def test_multiple_partners(self):
+        for timestamp in (600, 900, 1200, 1600):
+            self.join.process(flow(timestamp, value=timestamp), "flow")
+        joined = self.join.process(temperature(1100), "temp")
+        self.assertListEqual([600, 900, 1200, 1600], [event["flowRate"] for event in joined])
+
+        # the watermark of the join is now 1200, so that the first event is evicted
+        joined = self.join.process(temperature(1200), "temp")
+        self.assertListEqual([900, 1200, 1600], [event["flowRate"] for event in joined])
+
+    def test_eviction_by_watermark(self):
+        for index, sensor in enumerate(["s1", "s2", "s3"]):
+            self.join.process(flow(1000 + index, sensor=sensor), "flow")
+        self.assertEqual(3, self.join.num_buffered_events)
+
+        # the flow stream lags behind, so that its events are kept
+        self.join.process(temperature(2000, sensor="s4"), "temp")
+        self.assertEqual(4, self.join.num_buffered_events)
+
+        self.join.process(flow(2000, sensor="s5"), "flow")
+        self.assertEqual(2, self.join.num_buffered_events)
+        self.assertListEqual(["s4"], list(self.join._buffers["temp"]))
+        self.assertListEqual(["s5"], list(self.join._buffers["flow"]))
+
+    def test_late_events_are_dropped(self):
+        join = IntervalJoin("flow", "temp", key_by="sensorId", within=500, max_out_of_orderness=100)
+        join.process(flow(1000), "flow")
+        join.process(temperature(1000), "temp")
+
+        self.assertEqual(1, len(join.process(temperature(920), "temp")))
+        self.assertListEqual([], join.process(temperature(880), "temp"))
+        self.assertEqual(1, join.dropped_events)
+
+    @patch("streampipes.functions.utils.stream_join.time", autospec=True)
+    def test_idle_stream(self, time: MagicMock):
+        time.monotonic.return_value = 0.0
+        join = IntervalJoin("flow", "temp", key_by="sensorId", within=500, idle_timeout=10_000)
+        join.process(temperature(1000), "temp")
+
+        # the temperature stream holds back the watermark until it is idle
+        time.monotonic.return_value = 5.0
+        for timestamp in range(1000, 5000, 1000):
+            join.process(flow(timestamp), "flow")
+        self.assertEqual(5, join.num_buffered_events)
+        time.monotonic.return_value = 11.0
+        join.process(flow(5000), "flow")
+        self.assertEqual(5000, join.watermark)
+        self.assertEqual(1, join.num_buffered_events)
+
+        # once active again, late events of the idle stream are dropped
+        self.assertListEqual([], join.process(temperature(2000), "temp"))
+        self.assertEqual(1, join.dropped_events)
+        self.assertEqual(1, len(join.process(temperature(5100), "temp")))
+
+    def test_invalid_stream(self):
+        with self.assertRaises(ValueError):
+            self.join.process(flow(1000), "other")
+        with self.assertRaises(ValueError):
+            IntervalJoin("flow", "flow", key_by="sensorId", within=500)
+        with self.assertRaises(ValueError):
+            IntervalJoin("flow", "temp", key_by="sensorId", within=500, idle_timeout=0)
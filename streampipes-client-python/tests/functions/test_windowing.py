@@ -0,0 +1,187 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from typing import Any, Dict, List
+from unittest import TestCase
+
+from streampipes.functions.utils.windowing import (
+    Aggregator,
+    SessionWindows,
+    SlidingWindows,
+    TumblingWindows,
+    Window,
+    WindowOperator,
+    WindowResult,
+)
+from streampipes.functions.windowed_function import WindowedStreamPipesFunction
+
+
+class Count(Aggregator[int]):
+    def create(self) -> int:
+        return 0
+
+    def add(self, accumulator: int, event: Dict[str, Any]) -> int:
+        return accumulator + 1
+
+    def merge(self, accumulator: int, other: int) -> int:
+        return accumulator + other
+
+    def result(self, accumulator: int) -> int:
+        return accumulator
+
+
+def events(*timestamps: int, **fields) -> List[Dict[str, Any]]:
+    return [{"timestamp": timestamp, **fields} for timestamp in timestamps]
+
+
+class TestWindowAssigners(TestCase):
+    def test_tumbling(self):
+        self.assertListEqual([Window(10, 20)], TumblingWindows(10).assign(15))
+        self.assertListEqual([Window(10, 20)], TumblingWindows(10).assign(10))
+        self.assertListEqual([Window(5, 15)], TumblingWindows(10, offset=5).assign(14))
+
+    def test_sliding(self):
+        self.assertListEqual([Window(10, 20), Window(5, 15)], SlidingWindows(10, 5).assign(12))
+        self.assertListEqual([Window(10, 20), Window(5, 15)], SlidingWindows(10, 5).assign(10))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            TumblingWindows(0)
+        with self.assertRaises(ValueError):
+            SessionWindows(-1)
+
+
+class TestWindowOperator(TestCase):
+    def process(self, operator: WindowOperator, data: List[Dict[str, Any]]) -> List[WindowResult]:
+        return [result for event in data for result in operator.process(event)]
+
+    def test_tumbling_windows(self):
+        operator = WindowOperator(TumblingWindows(10))
+        results = self.process(operator, events(1, 5, 12, 25))
+
+        self.assertEqual(2, len(results))
+        self.assertEqual(Window(0, 10), results[0].window)
+        self.assertListEqual(events(1, 5), results[0].value)
+        self.assertListEqual(events(12), results[1].value)
+        self.assertEqual(1, operator.num_open_windows)
+
+        flushed = operator.flush()
+        self.assertListEqual(events(25), flushed[0].value)
+        self.assertEqual(0, operator.num_open_windows)
+
+    def test_sliding_windows(self):
+        operator = WindowOperator(SlidingWindows(10, 5), aggregator=Count())
+        results = self.process(operator, events(1, 7, 12, 30))
+
+        self.assertListEqual(
+            [(Window(-5, 5), 1), (Window(0, 10), 2), (Window(5, 15), 2), (Window(10, 20), 1)],
+            [(result.window, result.value) for result in results],
+        )
+
+    def test_keyed_windows(self):
+        operator = WindowOperator(TumblingWindows(10), aggregator=Count(), key_by="sensor")
+        data = events(1, 2, sensor="a") + events(3, sensor="b") + events(11, sensor="a")
+        results = self.process(operator, data)
+
+        self.assertDictEqual({"a": 2, "b": 1}, {result.key: result.value for result in results})
+        # the state of keys without open windows is dropped
+        self.assertListEqual(["a"], list(operator._state))
+
+    def test_out_of_orderness(self):
+        operator = WindowOperator(TumblingWindows(10), aggregator=Count(), max_out_of_orderness=5)
+        results = self.process(operator, events(1, 12, 8, 14))
+
+        self.assertListEqual([], results)
+        results = operator.process({"timestamp": 15})
+        self.assertEqual(2, results[0].value)
+
+    def test_allowed_lateness(self):
+        operator = WindowOperator(TumblingWindows(10), aggregator=Count(), allowed_lateness=5)
+        results = self.process(operator, events(1, 12, 8))
+
+        self.assertListEqual([False, True], [result.late for result in results])
+        self.assertListEqual([1, 2], [result.value for result in results])
+
+        self.assertListEqual([], self.process(operator, events(16, 9)))
+        self.assertEqual(1, operator.dropped_events)
+
+    def test_late_events_are_dropped(self):
+        operator = WindowOperator(TumblingWindows(10), aggregator=Count())
+        self.process(operator, events(1, 12, 8))
+
+        self.assertEqual(1, operator.dropped_events)
+        self.assertEqual(1, operator.num_open_windows)
+
+    def test_session_windows(self):
+        operator = WindowOperator(SessionWindows(5), key_by=lambda event: event["sensor"])
+        data = events(1, 4, sensor="a") + events(5, sensor="b") + events(8, 20, sensor="a")
+        results = self.process(operator, data)
+
+        self.assertListEqual(
+            [("b", Window(5, 10), events(5, sensor="b")), ("a", Window(1, 13), events(1, 4, 8, sensor="a"))],
+            [(result.key, result.window, result.value) for result in results],
+        )
+
+    def test_session_windows_merge(self):
+        operator = WindowOperator(SessionWindows(5), aggregator=Count(), max_out_of_orderness=10)
+        self.process(operator, events(1, 9, 5))
+
+        self.assertEqual(1, operator.num_open_windows)
+        results = operator.flush()
+        self.assertEqual(Window(1, 14), results[0].window)
+        self.assertEqual(3, results[0].value)
+
+    def test_session_windows_gap(self):
+        operator = WindowOperator(SessionWindows(5), aggregator=Count(), max_out_of_orderness=10)
+        self.process(operator, events(1, 6))
+
+        # events exactly `gap` apart belong to different sessions
+        results = operator.flush()
+        self.assertListEqual(
+            [Window(1, 6), Window(6, 11)], sorted((result.window for result in results), key=lambda w: w.start)
+        )
+
+
+class WindowCounter(WindowedStreamPipesFunction):
+    def __init__(self):
+        super().__init__(TumblingWindows(10), aggregator=Count())
+        self.results: List[WindowResult] = []
+        self.stopped = False
+
+    def requiredStreamIds(self) -> List[str]:
+        return ["stream"]
+
+    def onServiceStarted(self, context) -> None:
+        pass
+
+    def onWindow(self, result: WindowResult, streamId: str) -> None:
+        self.results.append(result)
+
+    def onServiceStopped(self) -> None:
+        self.stopped = True
+
+
+class TestWindowedStreamPipesFunction(TestCase):
+    def test_windowed_function(self):
+        function = WindowCounter()
+        for event in events(1, 2, 15):
+            function.onEvent(event, "stream")
+
+        self.assertListEqual([2], [result.value for result in function.results])
+
+        function.stop()
+        self.assertListEqual([2, 1], [result.value for result in function.results])
+        self.assertTrue(function.stopped)